@@ -0,0 +1,85 @@
+"""
+Benchmark the CPU cost per message of each wire codec.
+
+Each codec is used for round trips of a large ``see`` response between a
+``Board`` and the ``MockWireBoard`` from the test suite. The CPU time of the
+whole process is measured, so covers encoding and decoding at both ends.
+
+Run with ``python3 -m benchmarks.bench_codecs``.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_framing import make_marker
+from robot.board import Board
+from robot.wire import JSON, MSGPACK, JsonCodec, available_codecs, orjson
+from tests.mock_wire import MockWireBoard
+
+MARKER_COUNTS = (10, 200)
+ROUND_TRIPS = 200
+
+
+def measure(socket_path, codec_name, use_stdlib_json=False):
+    """Measure the CPU and wall time per round trip for a codec."""
+
+    class BenchBoard(Board):
+        CODEC_PREFERENCE = (codec_name,)
+
+    board = BenchBoard(socket_path)
+    if use_stdlib_json:
+        # The stdlib and orjson codecs share a wire format, so can be swapped
+        board.codec = JsonCodec()
+
+    board._send_and_receive({})
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(ROUND_TRIPS):
+        board._send_and_receive({})
+    cpu = (time.process_time() - cpu_start) / ROUND_TRIPS
+    wall = (time.perf_counter() - wall_start) / ROUND_TRIPS
+
+    board.close()
+    return cpu, wall
+
+
+def main():
+    """Run the benchmark and print the results."""
+    codecs = [('json (stdlib)', JSON, True)]
+    if orjson is not None:
+        codecs.append(('json (orjson)', JSON, False))
+    if MSGPACK in available_codecs():
+        codecs.append(('msgpack', MSGPACK, False))
+
+    print("{:>8} {:>14} {:>10} {:>10}".format(  # noqa: T001
+        "markers",
+        "codec",
+        "cpu (ms)",
+        "wall (ms)",
+    ))
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        for marker_count in MARKER_COUNTS:
+            socket_path = Path(root_dir) / 'bench{}'.format(marker_count)
+            mock = MockWireBoard(
+                socket_path,
+                codecs=[JSON, MSGPACK],
+                status={'markers': [make_marker(x) for x in range(marker_count)]},
+            )
+
+            for label, codec_name, use_stdlib_json in codecs:
+                cpu, wall = measure(socket_path, codec_name, use_stdlib_json)
+                print("{:>8} {:>14} {:>10.3f} {:>10.3f}".format(  # noqa: T001
+                    marker_count,
+                    label,
+                    cpu * 1000,
+                    wall * 1000,
+                ))
+
+            mock.stop()
+
+
+if __name__ == '__main__':
+    main()
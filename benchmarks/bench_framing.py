@@ -0,0 +1,113 @@
+"""
+Benchmark splitting a large ``see`` response into lines.
+
+This compares the ``LineBuffer`` used by ``Board._receive`` against the naive
+approach of concatenating ``bytes`` and splitting on the first newline, for a
+camera response containing several hundred markers which arrives in chunks
+of the size read from the socket. Only the framing is timed; JSON decoding
+costs the same either way.
+
+Run with ``python3 -m benchmarks.bench_framing``.
+"""
+
+import json
+import math
+import timeit
+
+from robot.board import LineBuffer
+
+CHUNK_SIZES = (4096, 65536)
+MARKER_COUNTS = (100, 500, 2000)
+REPEATS = 5
+
+
+def make_marker(marker_id):
+    """Build a marker in the form sent by ``robotd``."""
+    angle = marker_id * 0.01
+    distance = 1 + marker_id * 0.01
+    return {
+        'id': marker_id % 64,
+        'certainty': 0,
+        'size': [0.25, 0.25],
+        'pixel_corners': [[100.5, 200.5], [150.5, 200.5], [150.5, 250.5], [100.5, 250.5]],
+        'pixel_centre': [125.5, 225.5],
+        'cartesian': [distance * math.sin(angle), 0.1, distance * math.cos(angle)],
+        'spherical': [0.1, angle, distance],
+        'legacy_polar': [0.1, angle, distance],
+    }
+
+
+def make_response(marker_count):
+    """Build a ``see`` response as it arrives on the wire."""
+    data = {'markers': [make_marker(x) for x in range(marker_count)]}
+    return (json.dumps(data) + '\n').encode('utf-8')
+
+
+def chunk(data, size):
+    """Split data into chunks as they would be returned from ``recv``."""
+    return [data[x:x + size] for x in range(0, len(data), size)]
+
+
+def naive_receive(chunks):
+    """The concatenate-and-split framing which ``LineBuffer`` replaced."""
+    data = b''
+    chunks = iter(chunks)
+    while b'\n' not in data:
+        data += next(chunks)
+
+    line = data.split(b'\n', 1)[0]
+    data = data[len(line) + 1:]
+    return line.decode('utf-8')
+
+
+def line_buffer_receive(chunks):
+    """The framing used by ``Board._receive``."""
+    buffer = LineBuffer()
+    chunks = iter(chunks)
+    line = buffer.next_line()
+    while line is None:
+        buffer.feed(next(chunks))
+        line = buffer.next_line()
+    return line
+
+
+def main():
+    """Run the benchmark and print the results."""
+    print("{:>8} {:>8} {:>10} {:>12} {:>12} {:>8}".format(  # noqa: T001
+        "markers",
+        "chunk",
+        "bytes",
+        "naive (ms)",
+        "buffer (ms)",
+        "speedup",
+    ))
+
+    for marker_count in MARKER_COUNTS:
+        response = make_response(marker_count)
+        for chunk_size in CHUNK_SIZES:
+            chunks = chunk(response, chunk_size)
+            assert naive_receive(chunks) == line_buffer_receive(chunks)
+
+            naive = min(timeit.repeat(
+                lambda: naive_receive(chunks),
+                number=20,
+                repeat=REPEATS,
+            )) / 20
+            buffered = min(timeit.repeat(
+                lambda: line_buffer_receive(chunks),
+                number=20,
+                repeat=REPEATS,
+            )) / 20
+
+            print("{:>8} {:>8} {:>10} {:>12.3f} {:>12.3f} {:>7.2f}x".format(  # noqa: T001
+                marker_count,
+                chunk_size,
+                len(response),
+                naive * 1000,
+                buffered * 1000,
+                naive / buffered,
+            ))
+
+
+if __name__ == '__main__':
+    main()
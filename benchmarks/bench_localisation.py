@@ -0,0 +1,124 @@
+"""
+Benchmark locating the robot from the markers it sees.
+
+Synthetic frames are built for robots at random poses around a made up arena,
+each seeing the arena markers within the camera's field of view with some
+noise added to their positions, along with a few tokens. The arena is square,
+with markers spaced evenly along its walls, as no layout is provided for the
+current game. Each frame is located, to
+time ``locate`` and to show how accurate it is.
+
+Run with ``python3 -m benchmarks.bench_localisation``.
+"""
+
+import math
+import random
+import timeit
+
+from robot.game_specific import TOKEN
+from robot.localisation import locate
+from robot.markers import Marker
+
+ARENA_SIZE_METRES = 8
+MARKERS_PER_WALL = 7
+FRAME_COUNT = 200
+# Half the horizontal field of view of the camera
+HALF_FIELD_OF_VIEW = math.radians(30)
+NOISE_METRES = (0, 0.02, 0.05)
+TOKENS_PER_FRAME = 3
+REPEATS = 5
+
+
+def make_positions():
+    """Place markers evenly along each wall of the arena."""
+    edge = ARENA_SIZE_METRES / 2
+    spacing = ARENA_SIZE_METRES / (MARKERS_PER_WALL + 1)
+    positions = {}
+    for index in range(MARKERS_PER_WALL):
+        along = spacing * (index + 1) - edge
+        positions[index] = (along, edge)
+        positions[index + MARKERS_PER_WALL] = (edge, -along)
+        positions[index + MARKERS_PER_WALL * 2] = (-along, -edge)
+        positions[index + MARKERS_PER_WALL * 3] = (-edge, along)
+    return positions
+
+
+POSITIONS = make_positions()
+
+
+def make_frame(rng, noise):
+    """Build the markers seen by a robot at a random pose."""
+    edge = ARENA_SIZE_METRES / 2 - 0.5
+    x = rng.uniform(-edge, edge)
+    y = rng.uniform(-edge, edge)
+    heading = rng.uniform(-math.pi, math.pi)
+
+    markers = []
+    for marker_id, (marker_x, marker_y) in POSITIONS.items():
+        dx = marker_x - x
+        dy = marker_y - y
+        forwards = dx * math.cos(heading) + dy * math.sin(heading)
+        left = dy * math.cos(heading) - dx * math.sin(heading)
+        if forwards <= 0 or abs(math.atan2(left, forwards)) > HALF_FIELD_OF_VIEW:
+            continue
+        markers.append(Marker({
+            'id': marker_id,
+            'cartesian': [
+                -left + rng.gauss(0, noise),
+                0.3,
+                forwards + rng.gauss(0, noise),
+            ],
+        }))
+
+    for marker_id in rng.sample(sorted(TOKEN), TOKENS_PER_FRAME):
+        markers.append(Marker({
+            'id': marker_id,
+            'cartesian': [rng.uniform(-1, 1), 0.3, rng.uniform(0.5, 3)],
+        }))
+
+    return (x, y, heading), markers
+
+
+def main():
+    """Run the benchmark and print the results."""
+    print("{:>8} {:>10} {:>12} {:>14} {:>14}".format(  # noqa: T001
+        "noise",
+        "markers",
+        "locate (us)",
+        "position (cm)",
+        "heading (deg)",
+    ))
+
+    rng = random.Random(2018)
+    for noise in NOISE_METRES:
+        frames = [make_frame(rng, noise) for _ in range(FRAME_COUNT)]
+        frames = [x for x in frames if locate(x[1], POSITIONS) is not None]
+
+        seconds = min(timeit.repeat(
+            lambda: [locate(markers, POSITIONS) for _, markers in frames],
+            number=1,
+            repeat=REPEATS,
+        ))
+
+        position_errors = []
+        heading_errors = []
+        for (x, y, heading), markers in frames:
+            pose = locate(markers, POSITIONS)
+            position_errors.append(math.hypot(pose.x - x, pose.y - y))
+            heading_error = (pose.heading_radians - heading + math.pi) % (2 * math.pi)
+            heading_errors.append(abs(heading_error - math.pi))
+
+        print(  # noqa: T001
+            "{:>8.2f} {:>10.1f} {:>12.1f} {:>14.2f} {:>14.2f}".format(
+                noise,
+                sum(len(x[1]) for x in frames) / len(frames),
+                seconds / len(frames) * 1e6,
+                sum(position_errors) / len(frames) * 100,
+                math.degrees(sum(heading_errors) / len(frames)),
+            ),
+        )
+    print("(errors are the mean over frames with at least two markers)")  # noqa: T001
+
+
+if __name__ == '__main__':
+    main()
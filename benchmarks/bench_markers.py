@@ -0,0 +1,116 @@
+"""
+Benchmark turning a ``see`` response into sorted ``Marker``s and reading them.
+
+This compares ``Camera._see_to_results`` and the ``Marker`` class against the
+previous approach, which sorted on ``Marker.distance_metres`` and rebuilt the
+co-ordinates of a marker every time one of its properties was read. Each
+frame is converted, then the properties a typical robot uses are read from
+every marker several times, as happens when code loops over the markers
+seen looking for one to drive towards.
+
+Run with ``python3 -m benchmarks.bench_markers``.
+"""
+
+import timeit
+
+from benchmarks.bench_framing import make_marker
+from robot.camera import Camera
+from robot.markers import CartCoord, SphericalCoord
+
+MARKER_COUNTS = (10, 100, 500)
+PROPERTY_READS = 5
+REPEATS = 5
+
+
+class UncachedMarker:
+    """The ``Marker`` which converted its data on every read."""
+
+    def __init__(self, data):
+        self._raw_data = data
+
+    @property
+    def id(self):
+        """ID of the marker seen."""
+        return self._raw_data['id']
+
+    @property
+    def distance_metres(self):
+        """Distance of the marker from the camera in metres."""
+        return self.spherical.distance_metres
+
+    @property
+    def cartesian(self):
+        """The position of the marker in Cartesian co-ordinates."""
+        return CartCoord(*self._raw_data['cartesian'])
+
+    @property
+    def spherical(self):
+        """The position of the marker in Spherical co-ordinates."""
+        return SphericalCoord(*self._raw_data['spherical'])
+
+
+def uncached_see_to_results(data):
+    """The conversion which ``Camera._see_to_results`` replaced."""
+    return sorted(
+        (UncachedMarker(x) for x in data['markers']),
+        key=lambda x: x.distance_metres,
+    )
+
+
+def read_properties(markers):
+    """Read the properties of each marker as a robot might."""
+    for _ in range(PROPERTY_READS):
+        for marker in markers:
+            marker.id
+            marker.distance_metres
+            marker.spherical.rot_y_degrees
+            marker.cartesian.x
+
+
+def time_per_frame(func):
+    """Time a function in milliseconds, taking the best of several runs."""
+    return min(timeit.repeat(func, number=20, repeat=REPEATS)) / 20 * 1000
+
+
+def main():
+    """Run the benchmark and print the results."""
+    print("{:>8} {:>10} {:>10} {:>10} {:>10} {:>8}".format(  # noqa: T001
+        "markers",
+        "old sort",
+        "new sort",
+        "old reads",
+        "new reads",
+        "speedup",
+    ))
+
+    for marker_count in MARKER_COUNTS:
+        data = {'markers': [make_marker(x) for x in range(marker_count)]}
+
+        old_markers = uncached_see_to_results(data)
+        new_markers = Camera._see_to_results(data)
+        assert [x.id for x in old_markers] == [x.id for x in new_markers]
+
+        old_sort = time_per_frame(lambda: uncached_see_to_results(data))
+        new_sort = time_per_frame(lambda: Camera._see_to_results(data))
+        old_reads = time_per_frame(
+            lambda: read_properties(uncached_see_to_results(data)),
+        )
+        new_reads = time_per_frame(
+            lambda: read_properties(Camera._see_to_results(data)),
+        )
+
+        print(  # noqa: T001
+            "{:>8} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>7.2f}x".format(
+                marker_count,
+                old_sort,
+                new_sort,
+                old_reads,
+                new_reads,
+                old_reads / new_reads,
+            ),
+        )
+    print("(times are milliseconds per frame)")  # noqa: T001
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark the API against a recording of a ``robotd`` session.
+
+Every message in the recording is replayed by a ``ReplayServer`` as fast as
+possible, so the time per round trip is the cost of the API itself rather
+than of ``robotd`` or the hardware. Give the path of a recording made with
+``Board.start_recording`` to replay it, otherwise a recording of large
+``see`` sized statuses from the ``MockWireBoard`` of the test suite is used.
+
+Run with ``python3 -m benchmarks.bench_replay [recording]``.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_framing import make_marker
+from robot.board import Board
+from robot.recording import FrameKind, ReplayServer, read_recording
+from tests.mock_wire import MockWireBoard
+
+MARKER_COUNT = 200
+ROUND_TRIPS = 200
+
+
+def make_recording(root_dir, path):
+    """Record round trips of large statuses."""
+    mock = MockWireBoard(
+        root_dir / 'recorded',
+        status={'markers': [make_marker(x) for x in range(MARKER_COUNT)]},
+    )
+    board = Board(mock.socket_path)
+    board.start_recording(path)
+    for _ in range(ROUND_TRIPS):
+        board._send_and_receive({})
+    board.stop_recording()
+    board.close()
+    mock.stop()
+
+
+def main():
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as root_dir:
+        root_dir = Path(root_dir)
+
+        if len(sys.argv) > 1:
+            recording = Path(sys.argv[1])
+        else:
+            recording = root_dir / 'session.rec'
+            make_recording(root_dir, recording)
+
+        frames = list(read_recording(recording))
+        connects = sum(1 for x in frames if x.kind == FrameKind.CONNECT)
+        if connects != 1:
+            sys.exit("Only recordings of a single connection can be replayed")
+
+        round_trips = sum(1 for x in frames if x.kind == FrameKind.SENT)
+        received = sum(len(x.data) for x in frames if x.kind == FrameKind.RECEIVED)
+
+        with ReplayServer(recording, root_dir / 'replay') as server:
+            board = Board(server.socket_path)
+            # The greeting may have negotiated a codec, so one round trip of
+            # the recording has been used already.
+            round_trips -= board.messages_sent
+
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            for _ in range(round_trips):
+                board._send_and_receive({})
+            cpu = (time.process_time() - cpu_start) / round_trips
+            wall = (time.perf_counter() - wall_start) / round_trips
+            board.close()
+
+        print("{} round trips, {} bytes received".format(  # noqa: T001
+            round_trips,
+            received,
+        ))
+        print("cpu per round trip (ms): {:.3f}".format(cpu * 1000))  # noqa: T001
+        print("wall per round trip (ms): {:.3f}".format(wall * 1000))  # noqa: T001
+
+
+if __name__ == '__main__':
+    main()
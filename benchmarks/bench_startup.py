@@ -0,0 +1,78 @@
+"""
+Benchmark how long it takes for a robot's code to be ready to run.
+
+Each run starts a new interpreter, as happens when a robot boots, which
+imports ``robot`` and creates a ``Robot`` against a stand-in power board from
+the test suite. The times are measured from inside the interpreter, from
+before ``import robot`` to when the ``Robot`` has been created, and also
+from outside it, including the interpreter's own startup.
+
+Run with ``python3 -m benchmarks.bench_startup``.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tests.mock_wire import MockWireBoard
+
+RUNS = 10
+
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import robot
+imported = time.perf_counter()
+r = robot.Robot(robotd_path=sys.argv[1], wait_for_start_button=False)
+ready = time.perf_counter()
+r.close()
+print(json.dumps({'import': imported - start, 'ready': ready - start}))
+'''
+
+
+def run_once(robotd_path):
+    """Start a robot in a new interpreter, returning the times taken."""
+    start = time.perf_counter()
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHILD, str(robotd_path)],
+        env=dict(os.environ, PYTHONPATH=os.getcwd()),
+        stderr=subprocess.DEVNULL,
+    )
+    times = json.loads(output.decode())
+    times['total'] = time.perf_counter() - start
+    return times
+
+
+def main():
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as root:
+        root_dir = Path(root)
+        (root_dir / 'power').mkdir()
+        power_board = MockWireBoard(root_dir / 'power' / 'POWER')
+
+        try:
+            runs = [run_once(root_dir) for _ in range(RUNS)]
+        finally:
+            power_board.stop()
+
+    print("{:>22} {:>10} {:>12}".format("", "min (ms)", "median (ms)"))  # noqa: T001
+    for key, description in (
+        ('import', "import robot"),
+        ('ready', "import to ready"),
+        ('total', "process start to ready"),
+    ):
+        times = [x[key] * 1000 for x in runs]
+        print("{:>22} {:>10.1f} {:>12.1f}".format(  # noqa: T001
+            description,
+            min(times),
+            statistics.median(times),
+        ))
+
+
+if __name__ == '__main__':
+    main()
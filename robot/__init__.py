@@ -1,46 +1,159 @@
-"""Userspace API for a robot running ``robotd``."""
+"""
+Userspace API for a robot running ``robotd``.
+
+Everything listed in ``__all__`` is imported from its submodule the first time
+it is used, rather than when this package is imported, so that code which
+only needs a few parts of the API starts as quickly as possible. Submodules
+are likewise imported when first used as attributes, as in ``robot.camera``.
+"""
+
+import importlib
+import sys
+import types
+
+# True only for type checkers, like ``typing.TYPE_CHECKING`` but without
+# importing ``typing``
+TYPE_CHECKING = False
 
 __VERSION__ = "2018.4.1"
 
-from robot.game import GameMode
-from robot.game_specific import (
-    COLUMN,
-    COLUMN_E,
-    COLUMN_E_FACING_E,
-    COLUMN_E_FACING_N,
-    COLUMN_E_FACING_S,
-    COLUMN_E_FACING_W,
-    COLUMN_FACING_E,
-    COLUMN_FACING_N,
-    COLUMN_FACING_S,
-    COLUMN_FACING_W,
-    COLUMN_N,
-    COLUMN_N_FACING_E,
-    COLUMN_N_FACING_N,
-    COLUMN_N_FACING_S,
-    COLUMN_N_FACING_W,
-    COLUMN_S,
-    COLUMN_S_FACING_E,
-    COLUMN_S_FACING_N,
-    COLUMN_S_FACING_S,
-    COLUMN_S_FACING_W,
-    COLUMN_W,
-    COLUMN_W_FACING_E,
-    COLUMN_W_FACING_N,
-    COLUMN_W_FACING_S,
-    COLUMN_W_FACING_W,
-    MARKER_SIZES,
-    TOKEN,
-    TOKEN_ZONE_0,
-    TOKEN_ZONE_1,
-    TOKEN_ZONE_2,
-    TOKEN_ZONE_3,
-    WALL,
-)
-from robot.motor import BRAKE, COAST
-from robot.power import PowerOutput
-from robot.robot import Robot
-from robot.servo import PinMode, PinValue
+# The names exported from this package, by the submodule which defines them
+_LAZY_IMPORTS = {
+    'robot.game': ('GameMode',),
+    'robot.game_specific': (
+        'COLUMN',
+        'COLUMN_E',
+        'COLUMN_E_FACING_E',
+        'COLUMN_E_FACING_N',
+        'COLUMN_E_FACING_S',
+        'COLUMN_E_FACING_W',
+        'COLUMN_FACING_E',
+        'COLUMN_FACING_N',
+        'COLUMN_FACING_S',
+        'COLUMN_FACING_W',
+        'COLUMN_N',
+        'COLUMN_N_FACING_E',
+        'COLUMN_N_FACING_N',
+        'COLUMN_N_FACING_S',
+        'COLUMN_N_FACING_W',
+        'COLUMN_S',
+        'COLUMN_S_FACING_E',
+        'COLUMN_S_FACING_N',
+        'COLUMN_S_FACING_S',
+        'COLUMN_S_FACING_W',
+        'COLUMN_W',
+        'COLUMN_W_FACING_E',
+        'COLUMN_W_FACING_N',
+        'COLUMN_W_FACING_S',
+        'COLUMN_W_FACING_W',
+        'MARKER_SIZES',
+        'TOKEN',
+        'TOKEN_ZONE_0',
+        'TOKEN_ZONE_1',
+        'TOKEN_ZONE_2',
+        'TOKEN_ZONE_3',
+        'WALL',
+    ),
+    'robot.motor': (
+        'BRAKE',
+        'COAST',
+    ),
+    'robot.power': ('PowerOutput',),
+    'robot.robot': ('Robot',),
+    'robot.servo': (
+        'PinMode',
+        'PinValue',
+    ),
+}
+
+_LAZY_ATTRIBUTES = {
+    name: module_name
+    for module_name, names in _LAZY_IMPORTS.items()
+    for name in names
+}
+
+
+class _LazyModule(types.ModuleType):
+    """This package, importing its attributes when they are first used."""
+
+    def __getattr__(self, name):
+        module_name = _LAZY_ATTRIBUTES.get(name)
+        if module_name is None:
+            return self._import_submodule(name)
+
+        value = getattr(importlib.import_module(module_name), name)
+        # Later uses find the attribute without coming back here
+        setattr(self, name, value)
+        return value
+
+    def _import_submodule(self, name):
+        # Submodules, such as ``robot.camera``, used to be imported along with
+        # this package, so code may use them without importing them itself.
+        error = AttributeError("module {!r} has no attribute {!r}".format(
+            self.__name__,
+            name,
+        ))
+        if name.startswith('__'):
+            raise error
+
+        submodule_name = '{}.{}'.format(self.__name__, name)
+        try:
+            # This also sets the submodule as an attribute of this package
+            return importlib.import_module(submodule_name)
+        except ImportError as e:
+            # Only a missing submodule means there's no such attribute; a
+            # submodule which fails to import should say why.
+            if e.name != submodule_name:
+                raise
+            raise error from None
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_LAZY_ATTRIBUTES))
+
+
+sys.modules[__name__].__class__ = _LazyModule
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Let type checkers see the names which are imported lazily
+    from robot.game import GameMode
+    from robot.game_specific import (
+        COLUMN,
+        COLUMN_E,
+        COLUMN_E_FACING_E,
+        COLUMN_E_FACING_N,
+        COLUMN_E_FACING_S,
+        COLUMN_E_FACING_W,
+        COLUMN_FACING_E,
+        COLUMN_FACING_N,
+        COLUMN_FACING_S,
+        COLUMN_FACING_W,
+        COLUMN_N,
+        COLUMN_N_FACING_E,
+        COLUMN_N_FACING_N,
+        COLUMN_N_FACING_S,
+        COLUMN_N_FACING_W,
+        COLUMN_S,
+        COLUMN_S_FACING_E,
+        COLUMN_S_FACING_N,
+        COLUMN_S_FACING_S,
+        COLUMN_S_FACING_W,
+        COLUMN_W,
+        COLUMN_W_FACING_E,
+        COLUMN_W_FACING_N,
+        COLUMN_W_FACING_S,
+        COLUMN_W_FACING_W,
+        MARKER_SIZES,
+        TOKEN,
+        TOKEN_ZONE_0,
+        TOKEN_ZONE_1,
+        TOKEN_ZONE_2,
+        TOKEN_ZONE_3,
+        WALL,
+    )
+    from robot.motor import BRAKE, COAST
+    from robot.power import PowerOutput
+    from robot.robot import Robot
+    from robot.servo import PinMode, PinValue
 
 __all__ = (
     'GameMode',
@@ -0,0 +1,797 @@
+"""
+An ``asyncio`` flavour of the Robot API.
+
+Every board method here is a coroutine, which allows a single event loop to
+drive several boards at once, for example processing camera frames while
+also updating the motors, rather than each operation blocking the others.
+
+:Example:
+>>> async def main():
+...     robot = await AsyncRobot.setup()
+...     camera = await robot.camera()
+...     motor_board = await robot.motor_board()
+...     markers, _ = await asyncio.gather(
+...         camera.see(),
+...         motor_board.set_m0(0.5),
+...     )
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import time
+from pathlib import Path
+from typing import (  # noqa: F401
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from robot import __VERSION__
+from robot.board import Board, BoardList
+from robot.camera import Camera, ResultList, check_order
+from robot.game import GameMode, Zone, kill_after_delay
+from robot.game_specific import GAME_DURATION_SECONDS
+from robot.motor import MotorBoard
+from robot.power import PowerBoard, PowerOutput
+from robot.reconnect import ReconnectPolicy
+from robot.robot import Robot, configure_logging
+from robot.servo import (
+    ArduinoError,
+    CommandError,
+    InvalidResponse,
+    PinMode,
+    PinValue,
+)
+
+_PathLike = Union[str, Path]
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncBoard:
+    """Base class for ``asyncio`` connections to ``robotd`` board sockets."""
+
+    SEND_TIMEOUT_SECS = Board.SEND_TIMEOUT_SECS
+    RECONNECT_POLICY = Board.RECONNECT_POLICY
+    STATUS_MAX_AGE_SECS = Board.STATUS_MAX_AGE_SECS
+    STATUS_POLL_INTERVAL_SECS = Board.STATUS_POLL_INTERVAL_SECS
+
+    # Camera responses can be much larger than the default line limit used by
+    # ``asyncio`` streams.
+    STREAM_LIMIT_BYTES = 2 ** 22
+
+    def __init__(
+        self,
+        socket_path: _PathLike,
+        *,
+        reconnect_policy: Optional[ReconnectPolicy] = None
+    ) -> None:
+        self.socket_path = Path(socket_path)
+        # Only the backoffs, deadline and which errors to reconnect after are
+        # used; there is no circuit breaker or background reconnection here.
+        self.reconnect_policy = reconnect_policy or self.RECONNECT_POLICY
+        self._reader = None  # type: Optional[asyncio.StreamReader]
+        self._writer = None  # type: Optional[asyncio.StreamWriter]
+        self._lock = asyncio.Lock()
+
+        self.status_max_age = self.STATUS_MAX_AGE_SECS
+        self._last_status = None  # type: Optional[Dict[str, Any]]
+        self._last_status_time = 0.0
+
+    @classmethod
+    async def connect(cls, socket_path: _PathLike, *args: Any, **kwargs: Any) -> Any:
+        """
+        Create a board and connect it to its socket.
+
+        :param socket_path: Path for the unix socket
+        :return: The connected board.
+        """
+        board = cls(socket_path, *args, **kwargs)
+        await board._connect()
+        return board
+
+    @property
+    def serial(self):
+        """Serial number for the board."""
+        return self.socket_path.stem
+
+    def _greeting_response(self, data):
+        """
+        Handle the response to the greeting command.
+
+        NOTE: This is called on reconnect in addition to first connection
+        """
+        pass
+
+    async def _connect(self):
+        """
+        Connect or reconnect to the socket.
+        """
+        self.close()
+
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(
+                    str(self.socket_path),
+                    limit=self.STREAM_LIMIT_BYTES,
+                ),
+                self.SEND_TIMEOUT_SECS,
+            )
+        except ConnectionRefusedError:
+            LOGGER.exception("Error connecting to: '%s'", self.socket_path)
+            raise
+
+        greeting = await self._receive(should_retry=False)
+        self._greeting_response(greeting)
+
+    def _should_reconnect(self, error: Exception) -> bool:
+        # Before Python 3.11 ``asyncio`` timeouts aren't ``OSError``s, but
+        # mean the same as ``socket.timeout``
+        if isinstance(error, asyncio.TimeoutError):
+            return True
+        if not isinstance(error, OSError):
+            return False
+        return self.reconnect_policy.should_reconnect(error)
+
+    async def _with_retry(self, handler):
+        """Call a coroutine function using the socket, reconnecting like ``Board``."""
+        policy = self.reconnect_policy
+
+        try:
+            return await handler()
+        except (OSError, asyncio.TimeoutError) as e:
+            if not self._should_reconnect(e):
+                raise
+            original_exception = e
+
+        start_time = time.monotonic()
+        for delay in policy.delays():
+            if policy.deadline is not None:
+                if time.monotonic() - start_time + delay > policy.deadline:
+                    break
+
+            await asyncio.sleep(delay)
+
+            try:
+                await self._connect()
+                return await handler()
+            except FileNotFoundError:
+                continue
+            except (OSError, asyncio.TimeoutError) as e:
+                if not self._should_reconnect(e):
+                    raise
+
+        raise original_exception
+
+    async def _send(self, message, should_retry=True):
+        """
+        Send a message to robotd.
+
+        :param message: message to send
+        """
+        data = (json.dumps(message) + '\n').encode('utf-8')
+
+        async def send():
+            if self._writer is None:
+                raise BrokenPipeError()
+            self._writer.write(data)
+            await self._writer.drain()
+
+        if should_retry:
+            await self._with_retry(send)
+        else:
+            await send()
+
+    async def _receive(self, should_retry=True, timeout=None):
+        """
+        Receive a message from robotd.
+        """
+        if timeout is None:
+            timeout = self.SEND_TIMEOUT_SECS
+
+        async def receive():
+            if self._reader is None:
+                raise BrokenPipeError()
+            line = await asyncio.wait_for(self._reader.readline(), timeout)
+            if not line.endswith(b'\n'):
+                raise BrokenPipeError()
+            return json.loads(line.decode('utf-8'))
+
+        if should_retry:
+            message = await self._with_retry(receive)
+        else:
+            message = await receive()
+
+        self._record_status(message)
+        return message
+
+    def _record_status(self, message):
+        """
+        Remember a message from robotd if it is a status.
+        """
+        if isinstance(message, dict) and 'response' not in message:
+            self._last_status = message
+            self._last_status_time = time.monotonic()
+
+    async def _get_board_status(self):
+        """
+        Get the status of the board.
+
+        See ``Board._get_board_status`` for details.
+        """
+        age = time.monotonic() - self._last_status_time
+        if self._last_status is not None and age <= self.status_max_age:
+            return self._last_status
+        return await self._send_and_receive({})
+
+    async def _send_and_receive(self, message, should_retry=True):
+        """
+        Send a message to robotd and wait for a response.
+
+        Concurrent calls on the same board are serialised so that each caller
+        receives the response to its own message.
+        """
+        async with self._lock:
+            await self._send(message, should_retry)
+            return await self._receive(should_retry)
+
+    def close(self):
+        """
+        Close the connection to the underlying robotd board.
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+    def __str__(self):
+        return "{} - {}".format(type(self).__name__, self.serial)
+
+
+class AsyncMotorBoard(AsyncBoard):
+    """A motor board with two motor outputs."""
+
+    async def _get_status(self, motor_id: str):
+        return MotorBoard._string_to_power(
+            (await self._get_board_status())[motor_id],
+        )
+
+    async def _update_motor(self, motor_id: str, voltage: float):
+        v_string = MotorBoard._power_to_string(voltage)
+        await self._send_and_receive({motor_id: v_string})
+
+    async def get_m0(self) -> float:
+        """
+        :return: The value of motor output 0.
+        """
+        return await self._get_status('m0')
+
+    async def set_m0(self, power: float) -> None:
+        """Set the value of motor output 0."""
+        await self._update_motor('m0', power)
+
+    async def get_m1(self) -> float:
+        """
+        :return: The value of motor output 1.
+        """
+        return await self._get_status('m1')
+
+    async def set_m1(self, power: float) -> None:
+        """Set the value of motor output 1."""
+        await self._update_motor('m1', power)
+
+
+class AsyncServoBoard(AsyncBoard):
+    """
+    A servo board, providing access to servos and GPIO pins.
+
+    This is an arduino with a servo shield attached.
+    """
+
+    SERVO_IDS = range(0, 16)  # servos with a port 0-15
+    GPIO_PINS = range(2, 14)  # gpio pins 2-13
+
+    async def direct_command(self, command_name: str, *args) -> List[str]:
+        """
+        Issue a command directly to the arduino.
+
+        See ``ServoBoard.direct_command`` for details.
+        """
+        command = (command_name,) + args
+        async with self._lock:
+            await self._send({'command': command})
+            response = (await self._receive())['response']
+            # consume the broadcast status
+            await self._receive()
+
+        if response['status'] == 'ok':
+            return response['data']
+
+        for cls in (CommandError, InvalidResponse):
+            if cls.__name__ == response['type']:
+                raise cls(response['description'])
+
+        raise ArduinoError(response['description'])
+
+    async def set_servo_position(self, servo: int, position: float) -> None:
+        """Set the position of a servo output, between -1 and 1."""
+        if servo not in self.SERVO_IDS:
+            raise ValueError("Invalid servo id {!r}".format(servo))
+        if position > 1 or position < -1:
+            raise ValueError("servo position must be between -1 and 1")
+        await self._send_and_receive({'servos': {servo: position}})
+
+    async def get_servo_position(self, servo: int) -> float:
+        """The configured position of a servo output."""
+        data = await self._get_board_status()
+        return float(data['servos'][str(servo)])
+
+    async def set_pin_mode(self, pin: int, mode: PinMode) -> None:
+        """Set the ``PinMode`` of a GPIO pin."""
+        if not isinstance(mode, PinMode):
+            raise ValueError("Mode should be a valid 'PinMode', got {!r}".format(mode))
+        await self._send_and_receive({'pins': {pin: mode.value}})
+
+    async def get_pin_mode(self, pin: int) -> PinMode:
+        """The ``PinMode`` a GPIO pin is currently in."""
+        data = await self._get_board_status()
+        return PinMode(data['pins'][str(pin)])
+
+    async def read_pin(self, pin: int) -> PinValue:
+        """Read the current ``PinValue`` of a GPIO pin."""
+        valid_read_modes = (PinMode.INPUT, PinMode.INPUT_PULLUP)
+        if await self.get_pin_mode(pin) not in valid_read_modes:
+            raise Exception(
+                "Pin mode needs to be in a valid read ``PinMode`` to be read. "
+                "Valid modes are: {}.".format(
+                    ", ".join(str(x) for x in valid_read_modes),
+                ),
+            )
+        data = await self._send_and_receive({'read-pins': [pin]})
+        return PinValue(data['pin-values'][str(pin)])
+
+    async def read_analogue(self) -> Dict[str, float]:
+        """Read analogue values from the connected board."""
+        command = {'read-analogue': True}
+        return (await self._send_and_receive(command))['analogue-values']
+
+    async def read_ultrasound(self, trigger_pin, echo_pin) -> float:
+        """
+        Read an ultrasound value from an ultrasound sensor.
+
+        :param trigger_pin: The pin number on the servo board that the sensor's
+                            trigger pin is connected to.
+        :param echo_pin: The pin number on the servo board that the sensor's
+                         echo pin is connected to.
+        """
+        command = {'read-ultrasound': [trigger_pin, echo_pin]}
+        return float((await self._send_and_receive(command))['ultrasound'])
+
+
+class AsyncPowerBoard(AsyncBoard):
+    """A power board, controlling the power distribution for the robot."""
+
+    BUZZ_NOTES = PowerBoard.BUZZ_NOTES
+    START_LED_BLINK_SECS = PowerBoard.START_LED_BLINK_SECS
+
+    def __init__(
+        self,
+        *args,
+        on_start_signal: Optional[Callable[[], Awaitable[None]]] = None,
+        **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._on_start_signal = on_start_signal
+
+    async def power_on(self) -> None:
+        """
+        Turn on power to all power board outputs.
+        """
+        await self._send_and_receive({'power': True})
+
+    async def power_off(self) -> None:
+        """
+        Turn off power to all power board outputs.
+        """
+        await self._send_and_receive({'power': False})
+
+    async def _set_output(self, output: PowerOutput, value: bool) -> None:
+        if not isinstance(value, bool):
+            raise TypeError("Value must be a boolean (True/False)")
+        await self._send_and_receive({
+            'power-output': output.value,
+            'power-level': value,
+        })
+
+    async def power_on_output(self, output: PowerOutput) -> None:
+        """
+        Turn on power to a specific power board output.
+        """
+        await self._set_output(output, True)
+
+    async def power_off_output(self, output: PowerOutput) -> None:
+        """
+        Turn off power to a specific power board output.
+        """
+        await self._set_output(output, False)
+
+    async def set_start_led(self, value: bool) -> None:
+        """Set the state of the start LED."""
+        await self._send_and_receive({'start-led': value})
+
+    async def start_button_pressed(self) -> bool:
+        """
+        Read the status of the start button.
+        """
+        status = await self._get_board_status()
+        return status['start-button']
+
+    async def wait_start(self) -> None:
+        """
+        Wait until the start button is pressed.
+
+        Unlike ``PowerBoard.wait_start`` this yields to the event loop between
+        checks of the button, so other tasks keep running while waiting.
+        """
+        LOGGER.info('Waiting for start button.')
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        led_value = True
+        while not await self.start_button_pressed():
+            if loop.time() - start_time >= self.START_LED_BLINK_SECS:
+                led_value = not led_value
+                start_time = loop.time()
+                await self.set_start_led(led_value)
+            await asyncio.sleep(self.STATUS_POLL_INTERVAL_SECS)
+        await self.set_start_led(False)
+
+        if self._on_start_signal is not None:
+            await self._on_start_signal()
+
+        LOGGER.info("Starting user code.")
+
+    async def buzz(self, duration, *, note=None, frequency=None) -> None:
+        """Enqueue a note to be played by the buzzer on the power board."""
+        if note is None and frequency is None:
+            raise ValueError("Either note or frequency must be provided")
+        if note is not None and frequency is not None:
+            raise ValueError("Only provide note or frequency")
+        if note is not None:
+            frequency = self.BUZZ_NOTES[note.lower()]
+        if frequency is None:
+            raise ValueError("Invalid frequency")
+        await self._send_and_receive({'buzz': {
+            'frequency': frequency,
+            'duration': int(duration * 1000),
+        }})
+
+
+class AsyncCamera(AsyncBoard):
+    """
+    A camera providing a view of the outside world expressed as ``Marker``s.
+    """
+
+    SEE_TIMEOUT_SECS = 10
+
+    async def see(
+        self,
+        limit: Optional[int] = None,
+        sort: Union[str, bool] = 'distance',
+    ) -> ResultList:
+        """
+        Capture and process a new snapshot of the world the camera can see.
+
+        Other tasks on the event loop continue to run while the image is
+        captured and processed.
+
+        :param limit: The maximum number of markers to return, see
+                      ``Camera.see``.
+        :param sort: How to order the markers, see ``Camera.see``.
+        :return: A list of ``Marker`` objects which were identified.
+        """
+        check_order(limit, sort)
+        async with self._lock:
+            await self._send({'see': True})
+            data = await self._receive(timeout=self.SEE_TIMEOUT_SECS)
+        return Camera._see_to_results(data, limit, sort, self.serial)
+
+    def stream(self) -> 'AsyncCameraStream':
+        """
+        Continuously capture and process snapshots of the world.
+
+        While the markers from one image are being used, the next image is
+        already being captured and processed.
+
+        :Example:
+        >>> async for markers in camera.stream():
+        ...     if markers:
+        ...         await drive_towards(markers[0])
+
+        :return: An asynchronous iterator of ``ResultList``s, one for each
+                 image.
+        """
+        return AsyncCameraStream(self)
+
+
+class AsyncCameraStream:
+    """
+    An asynchronous iterator of what a camera sees, see ``AsyncCamera.stream``.
+
+    Call ``aclose`` when finished with the stream to wait for the image which
+    is being processed in advance.
+    """
+
+    def __init__(self, camera: AsyncCamera) -> None:
+        self._camera = camera
+        self._next = None  # type: Optional[asyncio.Future[ResultList]]
+
+    def __aiter__(self) -> 'AsyncCameraStream':
+        return self
+
+    async def __anext__(self) -> ResultList:
+        next_results = self._next
+        if next_results is None:
+            next_results = asyncio.ensure_future(self._camera.see())
+        # Forgotten before waiting, so that if capturing this image failed the
+        # next iteration asks for a new one rather than failing again
+        self._next = None
+        results = await next_results
+        self._next = asyncio.ensure_future(self._camera.see())
+        return results
+
+    async def aclose(self) -> None:
+        """Stop capturing images."""
+        if self._next is not None:
+            next_results = self._next
+            self._next = None
+            try:
+                await next_results
+            except Exception:
+                # Nobody is waiting for this image
+                pass
+
+
+class AsyncGameState(AsyncBoard):
+    """A description of the initial game state the robot is operating under."""
+
+    async def zone(self) -> Zone:
+        """
+        The zone in which the robot starts the match.
+
+        :return: zone ID the robot started in (0-3)
+        """
+        return (await self._get_board_status())['zone']
+
+    async def mode(self) -> GameMode:
+        """
+        :return: The ``GameMode`` that the robot is currently in.
+        """
+        return GameMode((await self._get_board_status())['mode'])
+
+
+TAsyncBoard = TypeVar('TAsyncBoard', bound=AsyncBoard)
+
+
+class AsyncRobot:
+    """
+    Core class of the ``asyncio`` Robot API.
+
+    Use ``AsyncRobot.setup`` to create and start up a robot.
+    """
+
+    ROBOTD_ADDRESS = Robot.ROBOTD_ADDRESS
+
+    def __init__(self, robotd_path: _PathLike = ROBOTD_ADDRESS) -> None:
+        self.robotd_path = Path(robotd_path)
+        self.known_power_boards = []  # type: List[AsyncPowerBoard]
+        self.known_motor_boards = []  # type: List[AsyncMotorBoard]
+        self.known_servo_boards = []  # type: List[AsyncServoBoard]
+        self.known_cameras = []  # type: List[AsyncCamera]
+        self.known_gamestates = []  # type: List[AsyncGameState]
+
+    @classmethod
+    async def setup(
+        cls,
+        robotd_path: _PathLike = ROBOTD_ADDRESS,
+        wait_for_start_button: bool = True,
+    ) -> 'AsyncRobot':
+        """
+        Create a robot and start it up.
+
+        This turns on power to the robot and optionally waits for the start
+        button to be pressed.
+        """
+        configure_logging()
+
+        LOGGER.info("Robot (v{}) Initialising...".format(__VERSION__))
+        robot = cls(robotd_path)
+        power_board = await robot.power_board()
+        await power_board.power_on()
+
+        if wait_for_start_button:
+            await power_board.wait_start()
+
+        return robot
+
+    async def _update_boards(
+        self,
+        known_boards: List[TAsyncBoard],
+        board_type: Callable[[_PathLike], Awaitable[TAsyncBoard]],
+        directory_name: _PathLike,
+    ) -> 'BoardList[Any]':
+        """
+        Update the number of boards against the known boards.
+
+        New boards are connected to concurrently.
+        """
+        known_paths = {x.socket_path for x in known_boards}  # type: Set[Path]
+        boards_dir = self.robotd_path / directory_name  # type: Path
+        new_paths = sorted(set(boards_dir.glob('*')) - known_paths)
+
+        for board_path in new_paths:
+            LOGGER.info("New board found: '%s'", board_path)
+
+        results = await asyncio.gather(
+            *(board_type(x) for x in new_paths),
+            return_exceptions=True,
+        )
+
+        connected = []  # type: List[TAsyncBoard]
+        errors = []  # type: List[BaseException]
+        for board_path, result in zip(new_paths, results):
+            if isinstance(result, (OSError, asyncio.TimeoutError)):
+                LOGGER.warning(
+                    "Could not connect to the board: '%s'",
+                    board_path,
+                    exc_info=result,
+                )
+            elif isinstance(result, BaseException):
+                errors.append(result)
+            else:
+                connected.append(result)
+
+        if errors:
+            # The boards which did connect would otherwise be left open
+            for board in connected:
+                board.close()
+            raise errors[0]
+
+        known_boards.extend(connected)
+        return BoardList(known_boards)
+
+    async def _on_start_signal(self):
+        game_state = await self._game()
+        mode = await game_state.mode()
+        LOGGER.info(
+            "Received start signal in %s mode, zone %d",
+            mode.value,
+            await game_state.zone(),
+        )
+
+        if mode == GameMode.COMPETITION:
+            kill_after_delay(GAME_DURATION_SECONDS)
+
+    async def power_boards(self) -> 'BoardList[Any]':
+        """
+        :return: A ``BoardList`` of available ``AsyncPowerBoard``s.
+        """
+        return await self._update_boards(
+            self.known_power_boards,
+            functools.partial(
+                AsyncPowerBoard.connect,
+                on_start_signal=self._on_start_signal,
+            ),
+            'power',
+        )
+
+    async def motor_boards(self) -> 'BoardList[Any]':
+        """
+        :return: A ``BoardList`` of available ``AsyncMotorBoard``s.
+        """
+        return await self._update_boards(
+            self.known_motor_boards,
+            AsyncMotorBoard.connect,
+            'motor',
+        )
+
+    async def servo_boards(self) -> 'BoardList[Any]':
+        """
+        :return: A ``BoardList`` of available ``AsyncServoBoard``s.
+        """
+        return await self._update_boards(
+            self.known_servo_boards,
+            AsyncServoBoard.connect,
+            'servo_assembly',
+        )
+
+    async def cameras(self) -> 'BoardList[Any]':
+        """
+        :return: A ``BoardList`` of available ``AsyncCamera``s.
+        """
+        return await self._update_boards(
+            self.known_cameras,
+            AsyncCamera.connect,
+            'camera',
+        )
+
+    async def _games(self) -> 'BoardList[Any]':
+        return await self._update_boards(
+            self.known_gamestates,
+            AsyncGameState.connect,
+            'game',
+        )
+
+    async def power_board(self) -> AsyncPowerBoard:
+        """
+        :return: The first ``AsyncPowerBoard``, if attached.
+
+        Raises an ``AttributeError`` if there are no power boards attached.
+        """
+        return Robot._single_index("power boards", await self.power_boards())
+
+    async def motor_board(self) -> AsyncMotorBoard:
+        """
+        :return: The first ``AsyncMotorBoard``, if attached.
+
+        Raises an ``AttributeError`` if there are no motor boards attached.
+        """
+        return Robot._single_index("motor boards", await self.motor_boards())
+
+    async def servo_board(self) -> AsyncServoBoard:
+        """
+        :return: The first ``AsyncServoBoard``, if attached.
+
+        Raises an ``AttributeError`` if there are no servo boards attached.
+        """
+        return Robot._single_index("servo boards", await self.servo_boards())
+
+    async def camera(self) -> AsyncCamera:
+        """
+        :return: The first ``AsyncCamera``, if attached.
+
+        Raises an ``AttributeError`` if there are no cameras attached.
+        """
+        return Robot._single_index("cameras", await self.cameras())
+
+    async def _game(self) -> AsyncGameState:
+        return Robot._single_index("game states", await self._games())
+
+    async def zone(self) -> Zone:
+        """
+        The zone the robot is in.
+
+        :return: ID of the zone the robot started in (0-3)
+        """
+        return await (await self._game()).zone()
+
+    async def mode(self) -> GameMode:
+        """
+        :return: one of ``GameMode.COMPETITION`` or ``GameMode.DEVELOPMENT``.
+        """
+        return await (await self._game()).mode()
+
+    def close(self):
+        """
+        Cleanup robot instance.
+        """
+        for board_group in (
+            self.known_power_boards,
+            self.known_motor_boards,
+            self.known_servo_boards,
+            self.known_cameras,
+            self.known_gamestates,
+        ):
+            for board in board_group:
+                board.close()
+
+            # Clear the group so that any further access doesn't accidentally
+            # reanimate the boards (which isn't supported).
+            del board_group[:]
@@ -1,23 +1,127 @@
-import json
+import collections
+import contextlib
 import logging
+import queue
+import select
 import socket
+import threading
 import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Iterable, Mapping, TypeVar, Union
+from typing import (  # noqa: F401
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from robot.instrumentation import CommandEvent, Instrumentation, command_name
+from robot.reconnect import CircuitState, ReconnectPolicy, ReconnectStats
+from robot.recording import FrameKind, Recorder
+from robot.wire import (
+    JSON,
+    MSGPACK,
+    Codec,
+    LineBuffer,
+    available_codecs,
+    choose_codec,
+    json_codec,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+# A decoded message received from ``robotd``
+Response = Dict[str, Any]
+
 
 class Board:
     """Base class for connections to ``robotd`` board sockets."""
 
     SEND_TIMEOUT_SECS = 6
-    RECV_BUFFER_BYTES = 2048
-
-    def __init__(self, socket_path: Union[Path, str]) -> None:
+    # Camera responses can run to hundreds of kilobytes, so read them in
+    # large chunks; smaller messages are returned as soon as they arrive.
+    RECV_BUFFER_BYTES = 65536
+
+    # Codecs to use for messages if ``robotd`` supports them, most preferred
+    # first. See ``robot.wire`` for details.
+    CODEC_PREFERENCE = (MSGPACK, JSON)
+
+    # Delays between attempts to reconnect after the connection is lost
+    RECONNECT_BACKOFFS_SECS = (0.1, 0.5, 1.0, 2.0, 3.0)
+    # How to reconnect, unless a policy is given for a particular board. See
+    # ``robot.reconnect`` for the options.
+    RECONNECT_POLICY = ReconnectPolicy(RECONNECT_BACKOFFS_SECS)
+
+    # Where to record how long commands take, unless given for a particular
+    # board. See ``robot.instrumentation``; ``None`` records nothing.
+    INSTRUMENTATION = None  # type: Optional[Instrumentation]
+
+    # How old the last status received from robotd may be and still be used
+    # to answer reads of the board's state. Can be changed per board via the
+    # ``status_max_age`` attribute; zero disables the cache.
+    STATUS_MAX_AGE_SECS = 0.05
+
+    # How often to check the status of a board in ``wait_for_status`` when
+    # it isn't streaming.
+    STATUS_POLL_INTERVAL_SECS = 0.05
+
+    def __init__(
+        self,
+        socket_path: Union[Path, str],
+        *,
+        reconnect_policy: Optional[ReconnectPolicy] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ) -> None:
         self.socket_path = Path(socket_path)
         self.socket = None
-        self.data = b''
+        self._buffer = LineBuffer()
+        self.codec = json_codec()
+        # Futures for messages which have been sent via ``submit`` but whose
+        # responses have not yet been read, in the order they were sent.
+        self._pending = collections.deque()  # type: collections.deque[Future[Response]]
+        # Messages written during a ``batch`` which haven't been sent yet, or
+        # ``None`` when not in a batch.
+        self._batch = None  # type: Optional[List[Dict[str, Any]]]
+
+        self.status_max_age = self.STATUS_MAX_AGE_SECS
+        self._last_status = None  # type: Optional[Response]
+        self._last_status_time = 0.0
+        self._status_changed = threading.Condition()
+        self._status_callbacks = []  # type: List[Callable[[Response], None]]
+
+        # State for reading messages in a background thread, see
+        # ``start_streaming``.
+        self._streaming = False
+        self._stream_thread = None  # type: Optional[threading.Thread]
+        self._stream_lock = threading.Lock()
+        self._replies = queue.Queue()  # type: queue.Queue[Any]
+        self._awaiting_replies = 0
+
+        # Totals of what has been sent to and received from robotd over the
+        # life of this board
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.instrumentation = instrumentation or self.INSTRUMENTATION
+        # Where to record everything sent and received, see
+        # ``start_recording``
+        self._recorder = None  # type: Optional[Recorder]
+
+        # Whether the board's socket has gone away, see ``lost``
+        self._lost = False
+
+        self.reconnect_policy = reconnect_policy or self.RECONNECT_POLICY
+        self.reconnect_stats = ReconnectStats()
+        self.circuit_state = CircuitState.CLOSED
+        self._circuit_opened_time = 0.0
+        self._reconnect_failures = 0
+        self._reconnect_thread = None  # type: Optional[threading.Thread]
 
         self._connect()
 
@@ -40,8 +144,15 @@ class Board:
 
         :param socket_path: Path for the unix socket
         """
+        # Any streaming thread for the previous connection stops once it sees
+        # the socket has changed; the greeting is read in this thread.
+        self._stream_thread = None
+
         self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self.socket.settimeout(self.SEND_TIMEOUT_SECS)
+        # Discard any partial message left over from a previous connection
+        self._buffer = LineBuffer()
+        self.codec = json_codec()
 
         try:
             self.socket.connect(str(self.socket_path))
@@ -49,9 +160,38 @@ class Board:
             LOGGER.exception("Error connecting to: '%s'", self.socket_path)
             raise
 
-        greeting = self._receive()
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.write(FrameKind.CONNECT)
+
+        # Reconnecting wouldn't make a board which is slow to greet us any
+        # faster, so give up after a single timeout.
+        greeting = self._receive(should_retry=False)
+        self._negotiate_codec(greeting)
         self._greeting_response(greeting)
 
+        if self._streaming:
+            self._start_stream_thread()
+
+    def _negotiate_codec(self, greeting):
+        """
+        Switch to the preferred codec out of those offered in the greeting.
+
+        ``robotd`` acknowledges the switch with a status message sent using
+        the new codec.
+        """
+        offered = greeting.get('codecs') if isinstance(greeting, dict) else None
+        if not offered:
+            return
+
+        name = choose_codec(self.CODEC_PREFERENCE, offered)
+        if name == self.codec.name:
+            return
+
+        self._send({'codec': name}, should_retry=False)
+        self.codec = available_codecs()[name]()
+        self._receive(should_retry=False)
+
     def _get_lc_error(self) -> str:
         """
         Describe a lost connection error.
@@ -63,40 +203,185 @@ class Board:
             path=self.socket_path,
         )
 
+    @property
+    def lost(self) -> bool:
+        """
+        Whether the board has been unplugged.
+
+        Using a lost board raises a ``ConnectionError`` straight away, until
+        ``robotd`` recreates its socket and the board is reconnected to.
+        """
+        return self._lost
+
+    def _mark_lost(self):
+        if not self._lost:
+            LOGGER.warning("Board '%s' has been lost", self.socket_path)
+        self._lost = True
+
+    def _recover(self):
+        """
+        Reconnect to a lost board, if its socket has come back.
+
+        :raises ConnectionError: If the board can't be reconnected to.
+        """
+        if not self.socket_path.exists():
+            raise ConnectionError(self._get_lc_error())
+
+        try:
+            self._connect()
+        except (ConnectionRefusedError, FileNotFoundError, socket.timeout) as e:
+            raise ConnectionError(self._get_lc_error()) from e
+
+        self._lost = False
+        LOGGER.info("Board '%s' has been reconnected", self.socket_path)
+
+    def _check_circuit(self):
+        """
+        Fail immediately if the board shouldn't be talked to at the moment.
+
+        :raises ConnectionError: If the circuit is open or the board is being
+                                 reconnected to in the background.
+        """
+        if self._reconnect_thread is not None:
+            self.reconnect_stats.rejected += 1
+            raise ConnectionError(self._get_lc_error())
+
+        if self.circuit_state == CircuitState.OPEN:
+            open_secs = time.monotonic() - self._circuit_opened_time
+            if open_secs < self.reconnect_policy.open_secs:
+                self.reconnect_stats.rejected += 1
+                raise ConnectionError(self._get_lc_error())
+            self.circuit_state = CircuitState.HALF_OPEN
+
+    def _reconnect_succeeded(self):
+        self.reconnect_stats.reconnects += 1
+        self._reconnect_failures = 0
+        self.circuit_state = CircuitState.CLOSED
+
+    def _reconnect_failed(self):
+        self._reconnect_failures += 1
+        threshold = self.reconnect_policy.failure_threshold
+        if threshold is None:
+            too_many_failures = False
+        else:
+            too_many_failures = self._reconnect_failures >= threshold
+
+        if too_many_failures or self.circuit_state == CircuitState.HALF_OPEN:
+            if self.circuit_state != CircuitState.OPEN:
+                LOGGER.warning(
+                    "Giving up on '%s' for %s seconds",
+                    self.socket_path,
+                    self.reconnect_policy.open_secs,
+                )
+            self.circuit_state = CircuitState.OPEN
+            self._circuit_opened_time = time.monotonic()
+
+    def _reconnect_delays(self) -> Iterator[float]:
+        """
+        Generate the delays before each attempt to reconnect.
+
+        Stops early once the policy's deadline would be passed, or if the
+        board's socket has gone away.
+        """
+        if self.circuit_state == CircuitState.HALF_OPEN:
+            delays = iter([0.0])  # type: Iterator[float]
+        else:
+            delays = self.reconnect_policy.delays()
+
+        deadline = self.reconnect_policy.deadline
+        start_time = time.monotonic()
+        for delay in delays:
+            # There's no point waiting for a board which has been unplugged
+            if not self.socket_path.exists():
+                self._mark_lost()
+                return
+
+            if deadline is not None:
+                if time.monotonic() - start_time + delay > deadline:
+                    return
+
+            time.sleep(delay)
+            self.reconnect_stats.attempts += 1
+            yield delay
+
+    def _reconnect_in_background(self):
+        start_time = time.monotonic()
+        try:
+            for _ in self._reconnect_delays():
+                try:
+                    self._connect()
+                except OSError as e:
+                    LOGGER.debug("Reconnecting to '%s' failed: %r", self.socket_path, e)
+                    continue
+
+                self._reconnect_succeeded()
+                LOGGER.info("Reconnected to '%s'", self.socket_path)
+                return
+
+            if not self._lost:
+                self._reconnect_failed()
+        finally:
+            self.reconnect_stats.seconds += time.monotonic() - start_time
+            self._reconnect_thread = None
+
     def _socket_with_single_retry(self, handler):
-        retryable_errors = (
-            socket.timeout,
-            BrokenPipeError,
-            OSError,
-            ConnectionResetError,
-        )
+        """
+        Call a function which uses the socket, reconnecting if it fails.
+
+        How reconnection happens is decided by the ``reconnect_policy``.
 
-        backoffs = [
-            0.1,
-            0.5,
-            1.0,
-            2.0,
-            3.0,
-        ]
+        :raises ConnectionError: If the board has been lost, or can't be
+                                 talked to at the moment.
+        """
+        policy = self.reconnect_policy
+
+        if self._lost:
+            self._recover()
+        self._check_circuit()
 
         try:
-            return handler()
-        except retryable_errors as e:
+            result = handler()
+        except OSError as e:
+            if not policy.should_reconnect(e):
+                raise
             original_exception = e
+        else:
+            if self.circuit_state == CircuitState.HALF_OPEN:
+                self._reconnect_succeeded()
+            return result
 
-        for backoff in backoffs:
-            time.sleep(backoff)
-
-            try:
-                self._connect()
-            except (ConnectionRefusedError, FileNotFoundError):
-                continue
+        self.reconnect_stats.failures += 1
 
-            try:
-                return handler()
-            except retryable_errors:
-                pass
+        if policy.background and self.socket_path.exists():
+            self._reconnect_thread = threading.Thread(
+                target=self._reconnect_in_background,
+                daemon=True,
+            )
+            self._reconnect_thread.start()
+            raise ConnectionError(self._get_lc_error()) from original_exception
 
+        start_time = time.monotonic()
+        try:
+            for _ in self._reconnect_delays():
+                try:
+                    self._connect()
+                    result = handler()
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    if not policy.should_reconnect(e):
+                        raise
+                    continue
+
+                self._reconnect_succeeded()
+                return result
+        finally:
+            self.reconnect_stats.seconds += time.monotonic() - start_time
+
+        if self._lost:
+            raise ConnectionError(self._get_lc_error()) from original_exception
+
+        self._reconnect_failed()
         raise original_exception
 
     def _send(self, message, should_retry=True):
@@ -107,10 +392,18 @@ class Board:
         :param message: message to send
         """
 
-        data = (json.dumps(message) + '\n').encode('utf-8')
-
         def sendall():
+            # Encode here, as a reconnect may have changed the codec
+            data = self.codec.encode(message)
+            if self._stream_thread is not None:
+                with self._stream_lock:
+                    self._awaiting_replies += 1
             self.socket.sendall(data)
+            self.messages_sent += 1
+            self.bytes_sent += len(data)
+            recorder = self._recorder
+            if recorder is not None:
+                recorder.write(FrameKind.SENT, data)
 
         if should_retry:
             return self._socket_with_single_retry(sendall)
@@ -121,38 +414,492 @@ class Board:
         data = self.socket.recv(size)
         if data == b'':
             raise BrokenPipeError()
+        self.bytes_received += len(data)
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.write(FrameKind.RECEIVED, data)
         return data
 
     def _receive(self, should_retry=True):
         """
         Receive a message from robotd.
         """
-        while b'\n' not in self.data:
+        if self._stream_thread is not None:
             if should_retry:
-                message = self._socket_with_single_retry(
-                    lambda: self._recv_from_socket(4096),
+                return self._socket_with_single_retry(self._next_reply)
+            return self._next_reply()
+
+        message = self.codec.decode(self._buffer)
+        while message is None:
+            if should_retry:
+                data = self._socket_with_single_retry(
+                    lambda: self._recv_from_socket(self.RECV_BUFFER_BYTES),
                 )
             else:
-                message = self._recv_from_socket(4096)
+                data = self._recv_from_socket(self.RECV_BUFFER_BYTES)
+
+            self._buffer.feed(data)
+            message = self.codec.decode(self._buffer)
+
+        self._record_status(message)
+        return message
+
+    def _record_status(self, message):
+        """
+        Remember a message from robotd if it is a status.
+
+        ``robotd`` sends its status after every command as well as on
+        connection; the only other messages are responses to commands which
+        ask for data.
+        """
+        if isinstance(message, dict) and 'response' not in message:
+            with self._status_changed:
+                self._last_status = message
+                self._last_status_time = time.monotonic()
+                self._status_changed.notify_all()
+
+            for callback in list(self._status_callbacks):
+                try:
+                    callback(message)
+                except Exception:
+                    LOGGER.exception("Error in status callback for %s", self)
+
+    def _get_board_status(self) -> Response:
+        """
+        Get the status of the board.
+
+        The most recent status received from ``robotd`` is used if it is no
+        older than ``status_max_age`` seconds, otherwise a new status is
+        requested. Reading several values from the board in quick succession
+        therefore only costs one round trip.
+
+        If the board can't be reached and the ``reconnect_policy`` allows it,
+        the last status received is used however old it is.
+        """
+        age = time.monotonic() - self._last_status_time
+        if self._last_status is not None and age <= self.status_max_age:
+            return self._last_status
+
+        try:
+            return self._send_and_receive({})
+        except (ConnectionError, socket.timeout):
+            if self.reconnect_policy.use_last_status and self._last_status is not None:
+                return self._last_status
+            raise
+
+    @property
+    def streaming(self) -> bool:
+        """Whether messages are being read by a background thread."""
+        return self._streaming
+
+    def start_streaming(self) -> None:
+        """
+        Read every message from ``robotd`` in a background thread.
 
-            self.data += message
+        As well as the responses to our own commands, ``robotd`` may send a
+        board's status at other times, for example when another client changes
+        it. While streaming these are all recorded as they arrive: the latest
+        status is available from ``latest_status``, callbacks registered via
+        ``add_status_callback`` are run, and ``wait_for_status`` wakes up
+        immediately rather than polling ``robotd``.
+
+        The streaming thread is restarted if the board reconnects.
+        """
+        if self._streaming:
+            return
 
-        line = self.data.split(b'\n', 1)[0]
-        self.data = self.data[len(line) + 1:]
+        # Any responses which are outstanding must be read before the thread
+        # takes over reading from the socket.
+        self._send_batch()
+        self.flush()
 
-        return json.loads(line.decode('utf-8'))
+        self._streaming = True
+        self._start_stream_thread()
+
+    def stop_streaming(self) -> None:
+        """
+        Stop reading messages in a background thread.
+        """
+        self._streaming = False
+        thread, self._stream_thread = self._stream_thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _start_stream_thread(self) -> None:
+        with self._stream_lock:
+            self._replies = queue.Queue()
+            self._awaiting_replies = 0
+
+        self._stream_thread = threading.Thread(
+            target=self._stream_messages,
+            args=(self.socket, self._buffer, self.codec, self._replies),
+            name="robot-stream-{}".format(self.serial),
+            daemon=True,
+        )
+        self._stream_thread.start()
+
+    def _stream_messages(
+        self,
+        sock: socket.socket,
+        buffer: LineBuffer,
+        codec: Codec,
+        replies: 'queue.Queue[Any]',
+    ) -> None:
+        """
+        Body of the streaming thread.
+
+        Messages are recorded as they arrive; if we're waiting for responses
+        to commands then they're also passed back via ``replies``.
+        """
+        while self._streaming and self.socket is sock:
+            try:
+                # Wake up periodically to check whether we should stop
+                readable, _, _ = select.select(
+                    [sock],
+                    [],
+                    [],
+                    self.STATUS_POLL_INTERVAL_SECS,
+                )
+                if not readable:
+                    continue
+
+                data = sock.recv(self.RECV_BUFFER_BYTES)
+                if data == b'':
+                    raise BrokenPipeError()
+                self.bytes_received += len(data)
+                recorder = self._recorder
+                if recorder is not None:
+                    recorder.write(FrameKind.RECEIVED, data)
+            except (OSError, ValueError) as e:
+                # Pass the error to whoever is waiting for a response, which
+                # will reconnect if appropriate.
+                LOGGER.debug("Streaming from %s stopped: %r", self.socket_path, e)
+                replies.put(e)
+                return
+
+            buffer.feed(data)
+            message = codec.decode(buffer)
+            while message is not None:
+                with self._stream_lock:
+                    is_reply = self._awaiting_replies > 0
+                    # Commands which return data are answered with a response
+                    # followed by the status.
+                    if is_reply and 'response' not in message:
+                        self._awaiting_replies -= 1
+
+                self._record_status(message)
+                if is_reply:
+                    replies.put(message)
+
+                message = codec.decode(buffer)
+
+    def _next_reply(self) -> Response:
+        """
+        Get the next response read by the streaming thread.
+        """
+        try:
+            message = self._replies.get(timeout=self.SEND_TIMEOUT_SECS)
+        except queue.Empty:
+            raise socket.timeout() from None
+
+        if isinstance(message, BaseException):
+            raise message
+        return message
+
+    @property
+    def latest_status(self) -> Optional[Response]:
+        """
+        The most recent status received from ``robotd``, if any.
+
+        This doesn't communicate with ``robotd``.
+        """
+        return self._last_status
+
+    def add_status_callback(self, callback: Callable[[Response], None]) -> None:
+        """
+        Register a function to be called with each status received.
+
+        When streaming, callbacks are run on the streaming thread, so should
+        return quickly.
+        """
+        self._status_callbacks.append(callback)
+
+    def remove_status_callback(self, callback: Callable[[Response], None]) -> None:
+        """
+        Unregister a function added by ``add_status_callback``.
+        """
+        self._status_callbacks.remove(callback)
+
+    def wait_for_status(
+        self,
+        predicate: Callable[[Response], bool],
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """
+        Wait until the status of the board satisfies a condition.
+
+        :Example:
+        >>> power_board.wait_for_status(lambda status: status['start-button'])
+
+        The status is requested from ``robotd`` every
+        ``STATUS_POLL_INTERVAL_SECS``. When streaming, this also wakes up as
+        soon as a matching status arrives and only requests the status if
+        none has arrived recently.
+
+        :param predicate: A function which is passed each status and returns
+                          whether it is the one we're waiting for.
+        :param timeout: The maximum number of seconds to wait, or ``None`` to
+                        wait forever.
+        :return: The status which satisfied the condition.
+        :raises TimeoutError: If the timeout expires first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining():
+            if deadline is None:
+                return None
+            return max(0.0, deadline - time.monotonic())
+
+        while True:
+            status = self._get_board_status()
+            if predicate(status):
+                return status
+            if remaining() == 0:
+                raise TimeoutError()
+
+            wait = self.STATUS_POLL_INTERVAL_SECS
+            if deadline is not None:
+                wait = min(wait, remaining())
+
+            if self._stream_thread is None:
+                time.sleep(wait)
+                continue
+
+            with self._status_changed:
+                # Only wait if nothing has arrived since we looked
+                if self._last_status is status:
+                    self._status_changed.wait(wait)
+
+    @contextlib.contextmanager
+    def _instrumented(self, message) -> Iterator[None]:
+        """
+        Record how long the commands in a ``with`` block take.
+
+        The block is recorded as a single ``CommandEvent`` for the given
+        message, if the board has ``instrumentation``.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            yield
+            return
+
+        timestamp = time.time()
+        start_time = time.perf_counter()
+        bytes_sent = self.bytes_sent
+        bytes_received = self.bytes_received
+        attempts = self.reconnect_stats.attempts
+        reconnects = self.reconnect_stats.reconnects
+        error = None
+
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            instrumentation.record(CommandEvent(
+                timestamp=timestamp,
+                board=type(self).__name__,
+                serial=self.serial,
+                command=command_name(message),
+                seconds=time.perf_counter() - start_time,
+                bytes_sent=self.bytes_sent - bytes_sent,
+                bytes_received=self.bytes_received - bytes_received,
+                retries=self.reconnect_stats.attempts - attempts,
+                reconnects=self.reconnect_stats.reconnects - reconnects,
+                error=error,
+            ))
 
     def _send_and_receive(self, message, should_retry=True):
         """
         Send a message to robotd and wait for a response.
         """
-        self._send(message, should_retry)
-        return self._receive(should_retry)
+        # Responses arrive in the order their messages were sent, so any
+        # batched writes must be sent and any outstanding pipelined responses
+        # must be read before ours.
+        self._send_batch()
+        self.flush()
+        with self._instrumented(message):
+            self._send(message, should_retry)
+            return self._receive(should_retry)
+
+    def submit(self, message) -> 'Future[Response]':
+        """
+        Send a message to robotd without waiting for its response.
+
+        Several messages can be submitted back to back, after which their
+        responses are read with a single call to ``flush``. This allows many
+        commands to share the cost of one round trip to ``robotd``.
+
+        :Example:
+        >>> left = motor_board.submit({'m0': 0.5})
+        >>> right = motor_board.submit({'m1': 0.5})
+        >>> motor_board.flush()
+        >>> left.result()['m0']
+        0.5
+
+        :param message: message to send
+        :return: A ``Future`` which will hold the response to the message once
+                 ``flush`` has been called.
+        """
+        self._send_batch()
+
+        # Reconnecting would lose the responses to any messages which are
+        # already in flight, so only retry if there aren't any.
+        self._send(message, should_retry=not self._pending)
+
+        future = Future()  # type: Future[Response]
+        future.set_running_or_notify_cancel()
+        self._pending.append(future)
+        return future
+
+    def flush(self) -> None:
+        """
+        Wait for the responses to all messages sent via ``submit``.
+
+        The responses are stored on the ``Future``s returned by ``submit``. If
+        the connection fails then the remaining ``Future``s are failed with the
+        same error, which is also raised from here. If a response just takes
+        longer than ``SEND_TIMEOUT_SECS`` then ``socket.timeout`` is raised
+        and the ``Future``s are left pending, so that ``flush`` can be called
+        again to keep waiting.
+        """
+        if not self._pending:
+            return
+
+        # Pipelined messages share a round trip, so are recorded together
+        with self._instrumented({'flush': len(self._pending)}):
+            while self._pending:
+                try:
+                    response = self._receive(should_retry=False)
+                except socket.timeout:
+                    # The response may still arrive
+                    raise
+                except Exception as e:
+                    while self._pending:
+                        self._pending.popleft().set_exception(e)
+                    raise
+                self._pending.popleft().set_result(response)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Combine the writes made within a ``with`` block into one message.
+
+        Writes to the board's outputs are held back until the end of the block
+        and then sent together, so that several outputs change at the same
+        time and only one round trip to ``robotd`` is needed.
+
+        :Example:
+        >>> with motor_board.batch():
+        ...     motor_board.m0 = 0.5
+        ...     motor_board.m1 = -0.5
+
+        Writes are kept in order: if an output is written more than once then
+        the writes are sent as separate messages. Anything else which talks to
+        ``robotd`` within the block, such as reading a sensor, first sends the
+        writes made so far. Reads of outputs don't reflect writes which are
+        still being held back.
+
+        Batches may be nested, in which case the writes are sent at the end of
+        the outermost block. If the block raises an exception then the writes
+        which haven't been sent are discarded.
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = []
+        try:
+            yield
+        except BaseException:
+            self._batch = None
+            raise
+
+        try:
+            self._send_batch()
+            self.flush()
+        finally:
+            self._batch = None
+
+    def _write(self, message: Dict[str, Any]) -> None:
+        """
+        Send a message which changes the board's outputs.
+
+        Within a ``batch`` the message is merged with the other writes in the
+        batch rather than being sent immediately.
+        """
+        if self._batch is None:
+            self._send_and_receive(message)
+        elif not self._batch or not _merge_message(self._batch[-1], message):
+            # Copy the message, so that later writes don't modify it
+            pending = {}  # type: Dict[str, Any]
+            _merge_message(pending, message)
+            self._batch.append(pending)
+
+    def _send_batch(self) -> None:
+        """
+        Pipeline any writes held back by a ``batch``.
+        """
+        if not self._batch:
+            return
+
+        messages, self._batch = self._batch, []
+        for message in messages:
+            self.submit(message)
+
+    def start_recording(self, file) -> None:
+        """
+        Record everything sent to and received from ``robotd``.
+
+        The board reconnects so that the recording starts with the greeting,
+        which lets ``robot.recording.ReplayServer`` serve the recording back
+        in place of ``robotd``.
+
+        :param file: The path to write the recording to, or a binary file
+                     object. Paths ending in ``.gz`` are compressed.
+        """
+        self.stop_recording()
+        self._send_batch()
+        self.flush()
+
+        # The streaming thread must stop reading from the old connection
+        # before it is closed, and starts again on the new one.
+        streaming = self._streaming
+        self.stop_streaming()
+
+        self._recorder = Recorder(file)
+        # Otherwise ``robotd`` keeps the old connection open, and keeps
+        # sending statuses to it.
+        self.socket.close()
+        self._connect()
+
+        if streaming:
+            self.start_streaming()
+
+    def stop_recording(self) -> None:
+        """Finish any recording started by ``start_recording``."""
+        recorder = self._recorder
+        if recorder is not None:
+            self._recorder = None
+            recorder.close()
 
     def close(self):
         """
         Close the the connection to the underlying robotd board.
         """
+        self.stop_streaming()
+        self.stop_recording()
         self.socket.detach()
 
     def __str__(self):
@@ -161,6 +908,39 @@ class Board:
     __del__ = close
 
 
+def _merge_message(target: Dict[str, Any], message: Mapping[str, Any]) -> bool:
+    """
+    Merge a message into another, unless they write to the same value.
+
+    Nested mappings, such as the positions of several servos, are merged
+    recursively.
+
+    :return: Whether the message was merged; ``target`` is left unchanged if
+             it wasn't.
+    """
+    if not _can_merge(target, message):
+        return False
+
+    for key, value in message.items():
+        if isinstance(value, Mapping):
+            _merge_message(target.setdefault(key, {}), value)
+        else:
+            target[key] = value
+    return True
+
+
+def _can_merge(target: Mapping[str, Any], message: Mapping[str, Any]) -> bool:
+    for key, value in message.items():
+        if key not in target:
+            continue
+        existing = target[key]
+        if not (isinstance(existing, Mapping) and isinstance(value, Mapping)):
+            return False
+        if not _can_merge(existing, value):
+            return False
+    return True
+
+
 TBoard = TypeVar('TBoard', bound=Board)
 
 
@@ -1,10 +1,56 @@
+import functools
+import heapq
+import logging
 import socket
+import threading
 import time
-from typing import List, overload
+from concurrent.futures import Future
+from typing import (  # noqa: F401
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
 
-from robot.board import Board
+from robot.board import Board, BoardList
+from robot.game_definition import game_definition
 from robot.markers import Marker
 
+LOGGER = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def marker_dtype() -> Any:
+    """
+    The ``numpy`` dtype of the rows of ``ResultList.as_array``.
+
+    ``numpy`` is only imported when this is first called, as importing it
+    takes longer than importing the rest of this package.
+
+    :raises ImportError: If ``numpy`` isn't installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy is needed to view markers as an array") from None
+
+    return numpy.dtype([
+        ('id', numpy.int64),
+        ('cartesian', numpy.float64, (3,)),
+        ('spherical', numpy.float64, (3,)),
+        ('pixel_centre', numpy.float64, (2,)),
+        ('pixel_corners', numpy.float64, (4, 2)),
+    ])
+
 
 class ResultList(List[Marker]):
     """
@@ -15,8 +61,24 @@ class ResultList(List[Marker]):
 
     This is to mitigate a common beginners issue where a list is indexed
     without checking that the list has any items.
+
+    The markers can be looked up by their ids, without looping over the whole
+    list, with ``by_id``, ``of`` and ``tokens``. If ``numpy`` is installed,
+    they can also be viewed as an array with ``as_array``.
     """
 
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self._array = None  # type: Any
+        # The positions in the list of the markers with each id
+        self._index = None  # type: Optional[Dict[int, List[int]]]
+
+    def _changed(self) -> None:
+        # Called before anything changes the list in place, as the cached
+        # index and array would no longer match it
+        self._array = None
+        self._index = None
+
     @overload
     def __getitem__(self, index: int) -> Marker:
         ...
@@ -34,42 +96,569 @@ class ResultList(List[Marker]):
             else:
                 raise
 
+    def _positions_by_id(self) -> Dict[int, List[int]]:
+        # Built when first needed, and then reused until the list changes
+        if self._index is None:
+            index = {}  # type: Dict[int, List[int]]
+            for position, marker in enumerate(self):
+                index.setdefault(marker.id, []).append(position)
+            self._index = index
+        return self._index
+
+    def _at(self, positions: Iterable[int]) -> 'ResultList':
+        return ResultList(self[x] for x in sorted(positions))
+
+    def by_id(self, marker_id: int) -> 'ResultList':
+        """
+        The markers with an id, in the same order as in this list.
+
+        :return: A ``ResultList``, which is empty if the marker wasn't seen.
+        """
+        return self._at(self._positions_by_id().get(marker_id, ()))
+
+    def _in_categories(self, indices: AbstractSet[int]) -> 'ResultList':
+        # Classify each id with the game definition's table, rather than by
+        # searching sets of ids
+        game = game_definition()
+        categories = game.categories
+        marker_count = game.marker_count
+        return self._at(
+            position
+            for marker_id, positions in self._positions_by_id().items()
+            if 0 <= marker_id < marker_count and categories[marker_id] in indices
+            for position in positions
+        )
+
+    def of(self, category: Union[str, AbstractSet[int]]) -> 'ResultList':
+        """
+        The markers in a category, in the same order as in this list.
+
+        :param category: The name of a category or group of markers in the
+                         game definition, for example ``'WALL'`` or
+                         ``'COLUMN_N'``, or a set of marker ids such as
+                         ``WALL`` from ``robot.game_specific``.
+        :return: A ``ResultList``, which is empty if no markers were seen.
+        :raises KeyError: If there is no category or group with the name.
+
+        :Example:
+        >>> markers = camera.see()
+        >>> nearest_wall = markers.of('WALL')[0]
+        """
+        if isinstance(category, str):
+            return self._in_categories(game_definition().category_indices(category))
+
+        return self._at(
+            position
+            for marker_id, positions in self._positions_by_id().items()
+            if marker_id in category
+            for position in positions
+        )
+
+    def tokens(self, zone: Optional[int] = None) -> 'ResultList':
+        """
+        The token markers, in the same order as in this list.
+
+        :param zone: The zone of the tokens wanted, or ``None`` for all tokens.
+        :return: A ``ResultList``, which is empty if no tokens were seen.
+        """
+        name = 'TOKEN' if zone is None else 'TOKEN_ZONE_{}'.format(zone)
+        try:
+            indices = game_definition().category_indices(name)
+        except KeyError:
+            # There's no such zone, so there can't be any of its tokens
+            return ResultList()
+        return self._in_categories(indices)
+
+    def as_array(self) -> Any:
+        """
+        The markers as a ``numpy`` structured array, in the same order.
+
+        Each row has the fields of ``marker_dtype()``: the ``id``, the
+        ``cartesian`` and ``spherical`` co-ordinates, the ``pixel_centre`` and
+        the four ``pixel_corners``. The array is built the first time it is
+        requested and then reused, until the list is changed. Changes made to
+        the array aren't reflected in the list.
+
+        :Example:
+        >>> markers = camera.see().as_array()
+        >>> near = markers[markers['spherical'][:, 2] < 1]
+        >>> near['id']
+        array([12, 46])
+
+        :raises ImportError: If ``numpy`` isn't installed.
+        """
+        if self._array is None:
+            dtype = marker_dtype()
+            import numpy
+            self._array = numpy.array(
+                [
+                    (
+                        x._raw_data['id'],
+                        x._raw_data['cartesian'],
+                        x._raw_data['spherical'],
+                        x._raw_data['pixel_centre'],
+                        x._raw_data['pixel_corners'],
+                    )
+                    for x in self
+                ],
+                dtype=dtype,
+            )
+        return self._array
+
+
+def _changing(name: str) -> Callable[..., Any]:
+    method = getattr(list, name)
+
+    @functools.wraps(method)
+    def change(self: ResultList, *args: Any, **kwargs: Any) -> Any:
+        self._changed()
+        return method(self, *args, **kwargs)
+
+    return change
+
+
+# Every ``list`` method which changes the list in place
+for _name in (
+    '__setitem__',
+    '__delitem__',
+    '__iadd__',
+    '__imul__',
+    'append',
+    'clear',
+    'extend',
+    'insert',
+    'pop',
+    'remove',
+    'reverse',
+    'sort',
+):
+    setattr(ResultList, _name, _changing(_name))
+del _name
+
+
+# How the markers seen can be ordered, as the keys to sort their raw data by
+SORT_KEYS = {
+    # Nearest first
+    'distance': lambda x: x['spherical'][2],
+    # Closest to straight ahead first, whether to the left or the right
+    'bearing': lambda x: abs(x['spherical'][1]),
+}
+
+
+def check_order(limit: Optional[int], sort: Union[str, bool]) -> None:
+    """
+    Check that markers can be limited and ordered, before any image is taken.
+
+    :raises ValueError: If ``limit`` isn't ``None`` or a non-negative integer,
+                        or ``sort`` isn't ``False`` or one of ``SORT_KEYS``.
+    """
+    if limit is not None:
+        # ``bool`` is a subclass of ``int``, but ``limit=True`` is a mistake
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+            raise ValueError(
+                "Cannot limit markers to {!r}, the limit must be a "
+                "non-negative integer".format(limit),
+            )
+    if sort is not False and sort not in SORT_KEYS:
+        raise ValueError("Cannot sort markers by {!r}".format(sort))
+
+
+def _order(
+    items: Iterable[Any],
+    limit: Optional[int],
+    sort: Union[str, bool],
+    data_of: Optional[Callable[[Any], Any]] = None,
+) -> List[Any]:
+    # Order either the raw data of markers, or anything from which
+    # ``data_of`` gets the raw data, picking just the first ``limit`` without
+    # sorting the rest.
+    if sort is False:
+        return list(items)[:limit]
+
+    raw_key = SORT_KEYS[sort]  # type: ignore
+
+    def key(item: Any) -> Any:
+        return raw_key(item if data_of is None else data_of(item))
+
+    if limit is None:
+        return sorted(items, key=key)
+    return heapq.nsmallest(limit, items, key=key)
+
+
+Capture = NamedTuple('Capture', (
+    ('markers', ResultList),
+    # When the image was requested, from ``time.monotonic``
+    ('timestamp', float),
+))
+
 
 class Camera(Board):
     """
     A camera providing a view of the outside world expressed as ``Marker``s.
     """
 
+    # How long to wait for an image to be captured and processed
+    SEE_TIMEOUT_SECS = 10
+
+    # How long to wait before capturing again after capturing fails
+    CAPTURE_RETRY_SECS = 1
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._latest = None  # type: Optional[Capture]
+        self._capture_thread = None  # type: Optional[threading.Thread]
+        self._capture_stopped = threading.Event()
+
     @staticmethod
-    def _see_to_results(data) -> ResultList:
+    def _see_to_results(
+        data,
+        limit: Optional[int] = None,
+        sort: Union[str, bool] = 'distance',
+        camera: Optional[str] = None,
+    ) -> ResultList:
         """
         Convert the data from ``robotd`` into a sorted of ``Marker``s.
 
         :param data: the data returned from ``robotd``.
+        :param limit: The maximum number of markers to return, or ``None`` for
+                      all of them.
+        :param sort: How to order the markers, one of ``SORT_KEYS``, or
+                     ``False`` to keep them in the order ``robotd`` sent them.
+        :param camera: The serial number of the camera which saw the markers.
         :return: A ``ResultList`` of ``Markers``, sorted by distance from the
-                camera.
+                camera by default.
         """
-        return ResultList(sorted(
-            (Marker(x) for x in data["markers"]),
-            key=lambda x: x.distance_metres,
-        ))
+        # Ordered on the raw data, so that no co-ordinates are built unless
+        # they're read, and so that only the markers returned are built
+        markers = _order(data["markers"], limit, sort)
+        return ResultList(Marker(x, camera) for x in markers)
 
-    def see(self) -> ResultList:
+    def see(
+        self,
+        limit: Optional[int] = None,
+        sort: Union[str, bool] = 'distance',
+    ) -> ResultList:
         """
         Capture and process a new snapshot of the world the camera can see.
 
         Images are captured and processed on-demand in a "blocking" fashion, so
         this method may take a noticeable amount of time to complete its work.
 
+        Code which only uses the first few markers can ask for just those,
+        which saves sorting and converting all of the others:
+
+        >>> nearest = camera.see(limit=1)
+
+        :param limit: The maximum number of markers to return, or ``None`` for
+                      all of them.
+        :param sort: How to order the markers: ``'distance'`` for the nearest
+                     first, ``'bearing'`` for those closest to straight ahead
+                     first, or ``False`` for no particular order.
         :return: A list of ``Marker`` objects which were identified.
         """
-        abort_after = time.time() + 10
+        check_order(limit, sort)
+
+        deadline = time.monotonic() + self.SEE_TIMEOUT_SECS
+
+        # Make sure any image requested by ``stream`` isn't taken as ours,
+        # waiting for it as patiently as for our own
+        if self._pending:
+            self._wait_for_data(self._pending[-1], deadline)
+
+        with self._instrumented({'see': True}):
+            self._send({'see': True})
+
+            while True:
+                try:
+                    data = self._receive(should_retry=True)
+                    break
+                except socket.timeout:
+                    if time.monotonic() > deadline:
+                        raise
 
-        self._send({'see': True})
+        return self._see_to_results(data, limit, sort, self.serial)
 
-        while True:
+    def _wait_for_data(
+        self,
+        future: 'Future[Any]',
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """
+        Wait for the response to a message sent with ``submit``.
+
+        :param deadline: When to give up, from ``time.monotonic``; defaults to
+                         ``SEE_TIMEOUT_SECS`` from now.
+        :raises socket.timeout: If the deadline passes first. The response can
+                                still be waited for again later.
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.SEE_TIMEOUT_SECS
+        while not future.done():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("Timed out waiting for '{}'".format(
+                    self.socket_path,
+                ))
+
+            # Each read waits no longer than is left before the deadline,
+            # rather than for the whole ``SEND_TIMEOUT_SECS``
+            sock = cast(socket.socket, self.socket)
+            sock.settimeout(min(remaining, self.SEND_TIMEOUT_SECS))
             try:
-                return self._see_to_results(self._receive(should_retry=True))
+                self.flush()
             except socket.timeout:
-                if time.time() > abort_after:
-                    raise
+                pass
+            finally:
+                sock.settimeout(self.SEND_TIMEOUT_SECS)
+        return future.result()
+
+    def _wait_for_results(self, future: 'Future[Any]') -> ResultList:
+        data = self._wait_for_data(future)
+        return self._see_to_results(data, camera=self.serial)
+
+    def stream(self) -> Iterator[ResultList]:
+        """
+        Continuously capture and process snapshots of the world.
+
+        While the markers from one image are being used, the next image is
+        already being captured and processed, so each iteration only waits if
+        the camera is slower than the code using it. The markers are
+        therefore from an image captured just after the previous markers were
+        returned.
+
+        :Example:
+        >>> for markers in camera.stream():
+        ...     if markers:
+        ...         drive_towards(markers[0])
+
+        :return: An iterator of ``ResultList``s, one for each image.
+        """
+        future = self.submit({'see': True})
+        try:
+            while True:
+                results = self._wait_for_results(future)
+                future = self.submit({'see': True})
+                yield results
+        finally:
+            # Collect the image requested in advance, so that its response
+            # isn't left to hold up the next command sent.
+            if not future.done():
+                try:
+                    self._wait_for_data(future)
+                except Exception:
+                    LOGGER.debug(
+                        "Discarding the next image from '%s' failed",
+                        self.socket_path,
+                        exc_info=True,
+                    )
+
+    @property
+    def capturing(self) -> bool:
+        """Whether images are being captured in the background."""
+        return self._capture_thread is not None
+
+    def start_capturing(self) -> None:
+        """
+        Continuously capture and process images in a background thread.
+
+        The markers from the most recent image are then available immediately
+        from ``latest``. The thread has its own connection to ``robotd``, so
+        this camera can still be used as normal.
+        """
+        if self._capture_thread is not None:
+            return
+
+        self._capture_stopped.clear()
+        self._capture_thread = threading.Thread(
+            target=self._capture,
+            daemon=True,
+        )
+        self._capture_thread.start()
+
+    def stop_capturing(self) -> None:
+        """
+        Stop capturing images in the background.
+
+        This waits for any image being processed to finish.
+        """
+        thread = self._capture_thread
+        if thread is None:
+            return
+
+        self._capture_stopped.set()
+        thread.join()
+        self._capture_thread = None
+
+    def _capture(self) -> None:
+        camera = None  # type: Optional[Camera]
+        try:
+            while not self._capture_stopped.is_set():
+                try:
+                    if camera is None:
+                        camera = type(self)(
+                            self.socket_path,
+                            reconnect_policy=self.reconnect_policy,
+                            instrumentation=self.instrumentation,
+                        )
+                    timestamp = time.monotonic()
+                    markers = camera.see()
+                except Exception:
+                    # Nothing would restart this thread if it stopped, so
+                    # whatever went wrong, log it and try again.
+                    LOGGER.warning(
+                        "Capturing from '%s' failed",
+                        self.socket_path,
+                        exc_info=True,
+                    )
+                    self._capture_stopped.wait(self.CAPTURE_RETRY_SECS)
+                    continue
+
+                # Replacing the whole capture means readers always see a
+                # consistent pair of markers and timestamp.
+                self._latest = Capture(markers, timestamp)
+        finally:
+            if camera is not None:
+                camera.close()
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[Capture]:
+        """
+        Get the markers from the most recently captured image.
+
+        This returns immediately, without communicating with ``robotd``.
+        Images are only captured after ``start_capturing`` has been called.
+
+        :Example:
+        >>> camera.start_capturing()
+        >>> while True:
+        ...     capture = camera.latest(max_age=0.5)
+        ...     if capture is not None and capture.markers:
+        ...         drive_towards(capture.markers[0])
+
+        :param max_age: The maximum age of the image in seconds, or ``None``
+                        to accept any image.
+        :return: A ``Capture`` of the markers and when the image was
+                 requested, or ``None`` if there isn't a recent enough image.
+        """
+        capture = self._latest
+        if capture is None:
+            return None
+        if max_age is not None and time.monotonic() - capture.timestamp > max_age:
+            return None
+        return capture
+
+    def close(self):
+        """
+        Close the the connection to the underlying robotd board.
+        """
+        self.stop_capturing()
+        super().close()
+
+
+class CameraGroup:
+    """
+    Several cameras which see the world together.
+
+    Every camera is asked for an image at once, so seeing with the whole group
+    takes about as long as the slowest camera, rather than the total of them
+    all.
+
+    :Example:
+    >>> group = CameraGroup(robot.cameras)
+    >>> for marker in group.see():
+    ...     print(marker.camera, marker)
+
+    :param cameras: The cameras in the group.
+    """
+
+    SEE_TIMEOUT_SECS = Camera.SEE_TIMEOUT_SECS
+
+    def __init__(self, cameras: Union[Iterable[Camera], 'BoardList[Camera]']) -> None:
+        # A ``BoardList`` is typed as a mapping from serials, but iterating it
+        # gives its boards
+        self.cameras = cast(List[Camera], list(cameras))
+
+    def see_each(self) -> Dict[str, ResultList]:
+        """
+        Capture and process a new snapshot from every camera.
+
+        A camera which fails, or doesn't see within ``SEE_TIMEOUT_SECS`` of
+        the group being asked, is logged and left out, so that the others'
+        markers are still returned. If every camera fails then the first
+        camera's error is raised.
+
+        :return: The markers seen by each camera, keyed by serial number and
+                 sorted by distance.
+        """
+        deadline = time.monotonic() + self.SEE_TIMEOUT_SECS
+
+        futures = []  # type: List[Tuple[Camera, Future[Any]]]
+        errors = []  # type: List[Exception]
+        for camera in self.cameras:
+            try:
+                futures.append((camera, camera.submit({'see': True})))
+            except OSError as e:
+                self._camera_failed(camera, e)
+                errors.append(e)
+
+        # Every camera is now working on its image, so waiting for each in
+        # turn only waits for the slowest.
+        results = {}  # type: Dict[str, ResultList]
+        for camera, future in futures:
+            try:
+                data = camera._wait_for_data(future, deadline)
+            except (OSError, ValueError) as e:
+                self._camera_failed(camera, e)
+                errors.append(e)
+                continue
+            results[camera.serial] = camera._see_to_results(
+                data,
+                camera=camera.serial,
+            )
+
+        if errors and not results:
+            raise errors[0]
+        return results
+
+    @staticmethod
+    def _camera_failed(camera: Camera, error: Exception) -> None:
+        LOGGER.warning(
+            "Seeing with '%s' failed, leaving it out",
+            camera.socket_path,
+            exc_info=error,
+        )
+
+    def see(
+        self,
+        limit: Optional[int] = None,
+        sort: Union[str, bool] = 'distance',
+    ) -> ResultList:
+        """
+        Capture and process a new snapshot from every camera, and merge them.
+
+        A marker seen by several cameras is only included once, as seen by
+        the camera it is nearest to. Each marker's ``camera`` is the serial
+        number of the camera which saw it, and its position is relative to
+        that camera. Cameras which fail are left out, see ``see_each``.
+
+        :param limit: The maximum number of markers to return, or ``None`` for
+                      all of them.
+        :param sort: How to order the markers, see ``Camera.see``. Note that
+                     the distances and bearings being compared may be from
+                     different cameras.
+        :return: A ``ResultList`` of the markers seen.
+        """
+        check_order(limit, sort)
+
+        nearest = {}  # type: Dict[int, Marker]
+        for markers in self.see_each().values():
+            for marker in markers:
+                seen = nearest.get(marker.id)
+                if seen is None or marker.distance_metres < seen.distance_metres:
+                    nearest[marker.id] = marker
+
+        return ResultList(_order(
+            nearest.values(),
+            limit,
+            sort,
+            lambda x: x._raw_data,
+        ))
@@ -46,12 +46,12 @@ class GameState(Board):
 
         :return: zone ID the robot started in (0-3)
         """
-        return self._send_and_receive({})['zone']
+        return self._get_board_status()['zone']
 
     @property
     def mode(self) -> GameMode:
         """
         :return: The ``GameMode`` that the robot is currently in.
         """
-        value = self._send_and_receive({})['mode']
+        value = self._get_board_status()['mode']
         return GameMode(value)
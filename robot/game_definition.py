@@ -0,0 +1,224 @@
+"""
+Definitions of the markers used in a game, loaded from JSON files.
+
+Each season's markers are described by a file in ``robot/games``, rather than
+in code. A definition lists the categories of markers, each being a range of
+ids with a size, along with named groups of categories. A category can also
+list, for each of its markers in turn, the face of a column it is on and its
+``[x, y]`` position in the arena.
+
+Loading a definition compiles it into tables indexed by marker id, so finding
+the category, size or face of a marker is a single lookup:
+
+>>> game = game_definition()
+>>> game.category(3)
+'WALL'
+>>> game.size(45)
+(0.1, 0.1)
+"""
+
+import functools
+import json
+from array import array
+from pathlib import Path, PurePath
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+DEFAULT_GAME_PATH = Path(__file__).parent / 'games' / 'sb2018.json'
+
+# Used in the tables for markers without a category or face
+_NONE = -1
+
+# The (x, y) position of a marker in the arena, in metres
+Position = Tuple[float, float]
+
+
+class GameDefinition:
+    """
+    The markers used in a game, compiled into lookup tables.
+
+    The tables are indexed by marker id, and are public so that code which
+    classifies many markers can index them directly:
+
+    - ``categories`` holds the index in ``category_names`` of each marker's
+      category, or ``-1``,
+    - ``sizes`` holds the ``(width, height)`` of each marker in metres,
+    - ``faces`` holds the index in ``face_names`` of the column face each
+      marker is on, or ``-1``,
+    - ``positions`` holds the ``(x, y)`` position of each marker in the arena
+      in metres, or ``None``.
+
+    :param data: The decoded JSON of the definition.
+    :raises ValueError: If a marker is in more than one category, a category
+                        doesn't list a face or position for each of its
+                        markers, or a group names a category which doesn't
+                        exist.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.name = data['name']  # type: str
+        self.game_duration_seconds = data['game_duration_seconds']  # type: int
+        self.default_marker_size = tuple(data['default_marker_size'])
+
+        categories = data['categories']
+        self.category_names = tuple(x['name'] for x in categories)
+        self.marker_count = max(x['first_id'] + x['count'] for x in categories)
+
+        face_names = []  # type: List[str]
+        for category in categories:
+            for face in category.get('faces', ()):
+                if face not in face_names:
+                    face_names.append(face)
+        self.face_names = tuple(face_names)
+
+        self.categories = array('h', [_NONE] * self.marker_count)
+        self.faces = array('h', [_NONE] * self.marker_count)
+        self.sizes = [self.default_marker_size] * self.marker_count
+        self.positions = [None] * self.marker_count  # type: List[Optional[Position]]
+
+        for index, category in enumerate(categories):
+            self._compile_category(index, category)
+
+        # The indices in ``category_names`` of each category and group
+        self._indices = {}  # type: Dict[str, FrozenSet[int]]
+        self._ids = {}  # type: Dict[str, FrozenSet[int]]
+        for index, name in enumerate(self.category_names):
+            self._indices[name] = frozenset((index,))
+            self._ids[name] = frozenset(
+                x for x in range(self.marker_count)
+                if self.categories[x] == index
+            )
+        for name, members in data.get('groups', {}).items():
+            unknown = set(members) - set(self.category_names)
+            if unknown:
+                raise ValueError("Group {} has unknown categories: {}".format(
+                    name,
+                    ", ".join(sorted(unknown)),
+                ))
+            self._indices[name] = frozenset().union(
+                *(self._indices[x] for x in members),
+            )
+            self._ids[name] = frozenset().union(*(self._ids[x] for x in members))
+
+    def _compile_category(self, index: int, category: Dict[str, Any]) -> None:
+        first_id = category['first_id']
+        ids = range(first_id, first_id + category['count'])
+
+        faces = category.get('faces')
+        positions = category.get('positions')
+        for key, values in (('faces', faces), ('positions', positions)):
+            if values is not None and len(values) != len(ids):
+                raise ValueError("Category {} has {} markers but {} {}".format(
+                    category['name'],
+                    len(ids),
+                    len(values),
+                    key,
+                ))
+
+        size = tuple(category.get('size', self.default_marker_size))
+        for marker_id in ids:
+            if self.categories[marker_id] != _NONE:
+                raise ValueError("Marker {} is in more than one category".format(
+                    marker_id,
+                ))
+            self.categories[marker_id] = index
+            self.sizes[marker_id] = size
+            if faces is not None:
+                face = faces[marker_id - first_id]
+                self.faces[marker_id] = self.face_names.index(face)
+            if positions is not None:
+                x, y = positions[marker_id - first_id]
+                self.positions[marker_id] = (x, y)
+
+    def category(self, marker_id: int) -> Optional[str]:
+        """The name of the category of a marker, or ``None`` if it has none."""
+        if 0 <= marker_id < self.marker_count:
+            index = self.categories[marker_id]
+            if index != _NONE:
+                return self.category_names[index]
+        return None
+
+    def size(self, marker_id: int) -> Tuple[float, float]:
+        """The ``(width, height)`` of a marker in metres."""
+        if 0 <= marker_id < self.marker_count:
+            return self.sizes[marker_id]
+        return self.default_marker_size
+
+    def face(self, marker_id: int) -> Optional[str]:
+        """The face of its column a marker is on, or ``None`` if it isn't."""
+        if 0 <= marker_id < self.marker_count:
+            index = self.faces[marker_id]
+            if index != _NONE:
+                return self.face_names[index]
+        return None
+
+    def position(self, marker_id: int) -> Optional[Position]:
+        """The ``(x, y)`` position of a marker in the arena, if it is fixed."""
+        if 0 <= marker_id < self.marker_count:
+            return self.positions[marker_id]
+        return None
+
+    def marker_positions(self) -> Dict[int, Position]:
+        """The position of every marker fixed to the arena, keyed by id."""
+        return {
+            marker_id: position
+            for marker_id, position in enumerate(self.positions)
+            if position is not None
+        }
+
+    def category_indices(self, name: str) -> FrozenSet[int]:
+        """
+        The indices in ``category_names`` of a category, or a group's members.
+
+        Markers are in the category or group if their entry in ``categories``
+        is one of these.
+
+        :raises KeyError: If there is no such category or group.
+        """
+        return self._indices[name]
+
+    def ids(self, name: str) -> FrozenSet[int]:
+        """
+        The ids of the markers in a category or group.
+
+        :raises KeyError: If there is no such category or group.
+        """
+        return self._ids[name]
+
+    def facing(self, face: str) -> FrozenSet[int]:
+        """The ids of the markers on a face of a column."""
+        if face not in self.face_names:
+            return frozenset()
+        index = self.face_names.index(face)
+        return frozenset(
+            x for x in range(self.marker_count)
+            if self.faces[x] == index
+        )
+
+
+def load_game(path: Union[str, PurePath]) -> GameDefinition:
+    """
+    Load a game definition from a JSON file.
+
+    :raises ValueError: If the file isn't valid JSON, or its categories
+                        conflict.
+    """
+    with open(str(path)) as file:
+        return GameDefinition(json.load(file))
+
+
+@functools.lru_cache(maxsize=None)
+def game_definition(path: Union[str, PurePath] = DEFAULT_GAME_PATH) -> GameDefinition:
+    """
+    Get the definition of a game, loading it the first time it is needed.
+
+    :param path: The JSON file to load; defaults to the current game.
+    """
+    return load_game(path)
@@ -2,21 +2,28 @@
 #   NOTICE: IF YOU CHANGE THIS FILE PLEASE CHANGE ITS COUNTERPART IN SB_VISION
 # ******************************************************************************
 # Try to put all game specific code in here
+#
+# The markers of the current game are defined in robot/games; the constants
+# here are derived from that definition.
 
-WALL = set(range(0, 28))  # 0 - 27
+from robot.game_definition import game_definition
+
+_GAME = game_definition()
+
+WALL = set(_GAME.ids('WALL'))  # 0 - 27
 
 # Currently for Smallpeice 2018
-GAME_DURATION_SECONDS = 120
+GAME_DURATION_SECONDS = _GAME.game_duration_seconds
 
 # Currently for SB2018
-COLUMN_N = set(range(28, 32))
-COLUMN_E = set(range(32, 36))
-COLUMN_S = set(range(36, 40))
-COLUMN_W = set(range(40, 44))
-COLUMN_FACING_N = set(range(28, 44, 4))
-COLUMN_FACING_E = set(range(29, 44, 4))
-COLUMN_FACING_S = set(range(30, 44, 4))
-COLUMN_FACING_W = set(range(31, 44, 4))
+COLUMN_N = set(_GAME.ids('COLUMN_N'))
+COLUMN_E = set(_GAME.ids('COLUMN_E'))
+COLUMN_S = set(_GAME.ids('COLUMN_S'))
+COLUMN_W = set(_GAME.ids('COLUMN_W'))
+COLUMN_FACING_N = set(_GAME.facing('N'))
+COLUMN_FACING_E = set(_GAME.facing('E'))
+COLUMN_FACING_S = set(_GAME.facing('S'))
+COLUMN_FACING_W = set(_GAME.facing('W'))
 
 # Individual Column faces.
 COLUMN_N_FACING_N = (COLUMN_N & COLUMN_FACING_N).pop()
@@ -39,20 +46,26 @@ COLUMN_W_FACING_S = (COLUMN_W & COLUMN_FACING_S).pop()
 COLUMN_W_FACING_E = (COLUMN_W & COLUMN_FACING_E).pop()
 COLUMN_W_FACING_W = (COLUMN_W & COLUMN_FACING_W).pop()
 
-COLUMN = (COLUMN_N | COLUMN_E | COLUMN_S | COLUMN_W)
+COLUMN = set(_GAME.ids('COLUMN'))
+
+TOKEN = set(_GAME.ids('TOKEN'))
 
-TOKEN = set(range(44, 64))
+TOKEN_ZONE_0 = set(_GAME.ids('TOKEN_ZONE_0'))
+TOKEN_ZONE_1 = set(_GAME.ids('TOKEN_ZONE_1'))
+TOKEN_ZONE_2 = set(_GAME.ids('TOKEN_ZONE_2'))
+TOKEN_ZONE_3 = set(_GAME.ids('TOKEN_ZONE_3'))
 
-TOKEN_ZONE_0 = set(range(44, 49))
-TOKEN_ZONE_1 = set(range(49, 54))
-TOKEN_ZONE_2 = set(range(54, 59))
-TOKEN_ZONE_3 = set(range(59, 64))
+# The position of each marker fixed to the arena, as an (x, y) tuple, for
+# robot.localisation.locate. Empty until the definition gives the positions.
+MARKER_POSITIONS = _GAME.marker_positions()
 
 # The following constants are used to define the marker sizes
 
-MARKER_SIZES = {}
-MARKER_SIZES.update({m: (0.25, 0.25) for m in (WALL | COLUMN)})
-MARKER_SIZES.update({m: (0.1, 0.1) for m in TOKEN})
+MARKER_SIZES = {
+    m: _GAME.size(m)
+    for m in range(_GAME.marker_count)
+    if _GAME.category(m) is not None
+}
 
 # Size the vision system will assume a marker is if it's not in MARKER_SIZES
-MARKER_SIZE_DEFAULT = (0.25, 0.25)
+MARKER_SIZE_DEFAULT = _GAME.default_marker_size
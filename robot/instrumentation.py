@@ -0,0 +1,300 @@
+"""
+Recording of how long commands to ``robotd`` take.
+
+Instrumentation is off by default. To turn it on for every board, set
+``Board.INSTRUMENTATION``; for a single board, set its ``instrumentation``
+attribute:
+
+>>> from robot.board import Board
+>>> from robot.instrumentation import Instrumentation, RingBufferSink
+>>> recent = RingBufferSink(1000)
+>>> Board.INSTRUMENTATION = Instrumentation(sinks=[recent])
+
+Each command sent to a board is then described by a ``CommandEvent``, which
+is added to latency histograms per board and command and passed to each of
+the sinks. A sink is any callable which accepts a ``CommandEvent``;
+``RingBufferSink`` and ``JsonLinesSink`` are provided.
+"""
+
+import bisect
+import collections
+import json
+import logging
+import threading
+from pathlib import PurePath
+from typing import (  # noqa: F401
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+CommandEvent = NamedTuple('CommandEvent', (
+    # Wall clock time at which the command was sent, from ``time.time``
+    ('timestamp', float),
+    # The type of board, for example ``'MotorBoard'``
+    ('board', str),
+    ('serial', str),
+    # What the command did, see ``command_name``
+    ('command', str),
+    ('seconds', float),
+    ('bytes_sent', int),
+    ('bytes_received', int),
+    # Attempts to reconnect while running the command
+    ('retries', int),
+    # Successful reconnections while running the command
+    ('reconnects', int),
+    # The name of the exception raised by the command, if any
+    ('error', Optional[str]),
+))
+
+Sink = Callable[[CommandEvent], None]
+
+
+def command_name(message: Any) -> str:
+    """
+    Describe a message sent to ``robotd`` for grouping in instrumentation.
+
+    :Example:
+    >>> command_name({'m0': 0.5, 'm1': 0.5})
+    'm0,m1'
+    >>> command_name({})
+    'status'
+    >>> command_name({'command': ('my-command', 4)})
+    'command:my-command'
+    """
+    if not message:
+        return 'status'
+
+    direct_command = message.get('command')
+    if isinstance(direct_command, (list, tuple)) and direct_command:
+        return 'command:{}'.format(direct_command[0])
+
+    return ','.join(sorted(message))
+
+
+class LatencyHistogram:
+    """
+    A histogram of command latencies with exponentially sized buckets.
+
+    The buckets double in size from 100 microseconds, so percentiles are
+    accurate to within a factor of two while only a few dozen counts are
+    stored however many latencies are added.
+    """
+
+    # Upper bounds of each bucket; a final bucket holds anything larger
+    BOUNDS = tuple(0.0001 * 2 ** x for x in range(20))
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.min_seconds = float('inf')
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Record a latency."""
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.min_seconds = min(self.min_seconds, seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add the latencies recorded in another histogram to this one."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.min_seconds = min(self.min_seconds, other.min_seconds)
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+
+    @property
+    def mean_seconds(self) -> float:
+        """The mean latency, or zero if there are none."""
+        if not self.count:
+            return 0.0
+        return self.total_seconds / self.count
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate a percentile of the latencies.
+
+        :param percent: The percentile to find, between 0 and 100.
+        :return: The upper bound of the bucket the percentile falls in, capped
+                 at the largest latency seen, or zero if there are none.
+        """
+        if not self.count:
+            return 0.0
+
+        target = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.BOUNDS, self.counts):
+            seen += count
+            if seen >= target and seen:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+    def __repr__(self):
+        return (
+            "LatencyHistogram(count={}, mean={:.6f}, p50={:.6f}, p99={:.6f}, "
+            "max={:.6f})"
+        ).format(
+            self.count,
+            self.mean_seconds,
+            self.percentile(50),
+            self.percentile(99),
+            self.max_seconds,
+        )
+
+
+class CommandStats:
+    """Everything recorded about one command to one board."""
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.reconnects = 0
+        self.errors = 0
+
+    def add(self, event: CommandEvent) -> None:
+        """Record an event."""
+        self.latency.add(event.seconds)
+        self.bytes_sent += event.bytes_sent
+        self.bytes_received += event.bytes_received
+        self.retries += event.retries
+        self.reconnects += event.reconnects
+        if event.error is not None:
+            self.errors += 1
+
+
+class Instrumentation:
+    """
+    Collects ``CommandEvent``s from boards and passes them on to sinks.
+
+    One instance can be shared by any number of boards, from any number of
+    threads.
+
+    :param sinks: Callables to pass each event to. Exceptions raised by sinks
+                  are logged and otherwise ignored.
+    """
+
+    def __init__(self, sinks: Iterable[Sink] = ()) -> None:
+        self.sinks = list(sinks)
+        self._lock = threading.Lock()
+        self._stats = {}  # type: Dict[Tuple[str, str, str], CommandStats]
+
+    def record(self, event: CommandEvent) -> None:
+        """Record an event and pass it to the sinks."""
+        key = (event.board, event.serial, event.command)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = CommandStats()
+            stats.add(event)
+
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception:
+                LOGGER.exception("Instrumentation sink %r failed", sink)
+
+    def stats(self) -> Dict[Tuple[str, str, str], CommandStats]:
+        """
+        Get what has been recorded so far.
+
+        :return: A mapping from ``(board, serial, command)`` to the
+                 ``CommandStats`` for that command.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def histogram(
+        self,
+        board: Optional[str] = None,
+        serial: Optional[str] = None,
+        command: Optional[str] = None,
+    ) -> LatencyHistogram:
+        """
+        Get the latencies of the commands matching all of the given filters.
+
+        :Example:
+        >>> instrumentation.histogram(board='Camera').percentile(95)
+        0.4096
+        """
+        histogram = LatencyHistogram()
+        for key, stats in self.stats().items():
+            if all(
+                wanted is None or wanted == value
+                for wanted, value in zip((board, serial, command), key)
+            ):
+                histogram.merge(stats.latency)
+        return histogram
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._stats.clear()
+
+
+class RingBufferSink:
+    """
+    A sink which keeps the most recent events in memory.
+
+    :param size: The number of events to keep.
+    """
+
+    def __init__(self, size: int = 1000) -> None:
+        self._events = collections.deque(
+            maxlen=size,
+        )  # type: collections.deque[CommandEvent]
+
+    def __call__(self, event: CommandEvent) -> None:
+        """Keep an event, dropping the oldest if there are too many."""
+        self._events.append(event)
+
+    def events(self) -> List[CommandEvent]:
+        """Get the events kept, oldest first."""
+        return list(self._events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class JsonLinesSink:
+    """
+    A sink which writes each event to a file as a line of JSON.
+
+    :param file: The path of a file to append to, or a file object.
+    """
+
+    def __init__(self, file: Any) -> None:
+        if isinstance(file, (str, PurePath)):
+            self._file = open(str(file), 'a')  # type: IO[str]
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event: CommandEvent) -> None:
+        """Write an event to the file."""
+        line = json.dumps(event._asdict()) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the file, if it was opened by this sink."""
+        if self._owns_file:
+            self._file.close()
@@ -0,0 +1,116 @@
+"""
+Locating the robot in the arena from the markers it can see.
+
+Given the position of each marker fixed to the arena, and where those markers
+appear to be from the robot, ``locate`` finds the position and heading of the
+robot which best explains what it sees:
+
+>>> positions = {0: (-2.5, 4.0), 1: (-1.5, 4.0), ...}
+>>> pose = locate(camera.see(), positions)
+>>> if pose is not None:
+...     print(pose.x, pose.y, pose.heading_degrees)
+
+The pose is that of the camera: its position in metres from the centre of the
+arena, with x towards the east wall and y towards the north wall, and the
+direction it faces anticlockwise from east.
+
+The positions must be those of the arena being used. A game definition can
+give them, in which case they are in ``robot.game_specific.MARKER_POSITIONS``;
+the current game's doesn't, as its arena layout hasn't been checked against
+the rules.
+"""
+
+import math
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple  # noqa: F401
+
+from robot.markers import Degrees, Marker, Metres, Radians
+
+_Pose = NamedTuple('Pose', (  # type: ignore
+    ('x', Metres),
+    ('y', Metres),
+    ('heading_radians', Radians),
+    # The root mean square distance between where the markers were seen and
+    # where they should have been, from this pose; a measure of how good it is
+    ('error_metres', Metres),
+    # The number of markers the pose was found from
+    ('markers', int),
+))
+
+
+class Pose(_Pose):
+    """Where the robot is in the arena, and which way it is facing."""
+
+    @property
+    def heading_degrees(self) -> Degrees:
+        """The heading anticlockwise from east, in degrees."""
+        return Degrees(math.degrees(self.heading_radians))
+
+
+def locate(
+    markers: Iterable[Marker],
+    positions: Dict[int, Tuple[float, float]],
+) -> Optional[Pose]:
+    """
+    Find the pose of the robot from the markers it sees.
+
+    The pose is the least squares fit of the markers' positions relative to
+    the robot onto their positions in the arena, which has a closed form
+    solution, so this is quick enough to call for every image.
+
+    :param markers: The markers seen, for example from ``Camera.see``. Markers
+                    which aren't fixed to the arena are ignored.
+    :param positions: The ``(x, y)`` position of each marker fixed to the
+                      arena.
+    :return: The ``Pose`` of the robot, or ``None`` if fewer than two markers
+             fixed to the arena were seen.
+    """
+    # Pairs of where each marker was seen, as (forwards, left) of the robot,
+    # and where it is in the arena
+    seen = []
+    for marker in markers:
+        position = positions.get(marker.id)
+        if position is not None:
+            # The camera's x axis is to its right, and z axis is forwards
+            right, _, forwards = marker.cartesian
+            seen.append((forwards, -right, position[0], position[1]))
+
+    count = len(seen)
+    if count < 2:
+        return None
+
+    # Centroids of both sets of points
+    mean_forwards = sum(x[0] for x in seen) / count
+    mean_left = sum(x[1] for x in seen) / count
+    mean_x = sum(x[2] for x in seen) / count
+    mean_y = sum(x[3] for x in seen) / count
+
+    # The rotation which best lines up the points about their centroids
+    dot = 0.0
+    cross = 0.0
+    for forwards, left, x, y in seen:
+        seen_forwards = forwards - mean_forwards
+        seen_left = left - mean_left
+        arena_x = x - mean_x
+        arena_y = y - mean_y
+        dot += seen_forwards * arena_x + seen_left * arena_y
+        cross += seen_forwards * arena_y - seen_left * arena_x
+    heading = math.atan2(cross, dot)
+
+    # The translation which then lines up the centroids
+    cos = math.cos(heading)
+    sin = math.sin(heading)
+    robot_x = mean_x - (mean_forwards * cos - mean_left * sin)
+    robot_y = mean_y - (mean_forwards * sin + mean_left * cos)
+
+    squared_error = 0.0
+    for forwards, left, x, y in seen:
+        squared_error += (robot_x + forwards * cos - left * sin - x) ** 2
+        squared_error += (robot_y + forwards * sin + left * cos - y) ** 2
+
+    return Pose(
+        Metres(robot_x),
+        Metres(robot_y),
+        Radians(heading),
+        Metres(math.sqrt(squared_error / count)),
+        count,
+    )
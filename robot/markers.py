@@ -1,6 +1,6 @@
 import math
 import warnings
-from typing import List, NamedTuple, NewType, Tuple
+from typing import List, NamedTuple, NewType, Optional, Tuple  # noqa: F401
 
 Metres = NewType('Metres', float)
 Degrees = NewType('Degrees', float)
@@ -87,16 +87,42 @@ class PolarCoord:
 
 
 class Marker:
-    """A marker captured from a webcam image."""
+    """
+    A marker captured from a webcam image.
+
+    Each field of the data from ``robotd`` is only converted the first time
+    it is read, and the result kept for later reads.
+    """
 
-    def __init__(self, data):
+    __slots__ = (
+        '_raw_data',
+        '_camera',
+        '_pixel_corners',
+        '_pixel_centre',
+        '_polar',
+        '_cartesian',
+        '_spherical',
+    )
+
+    def __init__(self, data, camera: Optional[str] = None) -> None:
         self._raw_data = data
+        self._camera = camera
+        self._pixel_corners = None  # type: Optional[List[PixelCoordinates]]
+        self._pixel_centre = None  # type: Optional[PixelCoordinates]
+        self._polar = None  # type: Optional[PolarCoord]
+        self._cartesian = None  # type: Optional[CartCoord]
+        self._spherical = None  # type: Optional[SphericalCoord]
 
     @property
     def id(self) -> int:
         """ID of the marker seen."""
         return self._raw_data['id']
 
+    @property
+    def camera(self) -> Optional[str]:
+        """Serial number of the camera which saw the marker, if known."""
+        return self._camera
+
     # Disabled because it's always 0.0
     # TODO fix the certainty being 0
     # @property
@@ -107,18 +133,29 @@ class Marker:
     def pixel_corners(self) -> List[PixelCoordinates]:
         """Pixel co-ordinates of the of the corners of the marker."""
         # TODO define what the order of these corners are
-        return [PixelCoordinates((x[0], x[1])) for x in self._raw_data['pixel_corners']]
+        if self._pixel_corners is None:
+            self._pixel_corners = [
+                PixelCoordinates((x[0], x[1]))
+                for x in self._raw_data['pixel_corners']
+            ]
+        # Copied so that changes made by the caller don't affect later reads
+        return list(self._pixel_corners)
 
     @property
     def pixel_centre(self) -> PixelCoordinates:
         """Pixel co-ordinates of the centre of the marker."""
-        pixel_center = self._raw_data['pixel_centre']
-        return PixelCoordinates((pixel_center[0], pixel_center[1]))
+        if self._pixel_centre is None:
+            pixel_center = self._raw_data['pixel_centre']
+            self._pixel_centre = PixelCoordinates((pixel_center[0], pixel_center[1]))
+        return self._pixel_centre
 
     @property
     def distance_metres(self) -> Metres:
         """Distance of the marker from the camera in metres."""
-        return self.spherical.distance_metres
+        if self._spherical is None:
+            # Avoid building the whole co-ordinate just for its distance
+            return self._raw_data['spherical'][2]
+        return self._spherical.distance_metres
 
     @property
     def polar(self) -> PolarCoord:
@@ -134,8 +171,10 @@ class Marker:
             "'spherical' property instead.",
             DeprecationWarning,
         )
-        polar = self._raw_data['legacy_polar']
-        return PolarCoord((polar[0], polar[1]), polar[2])
+        if self._polar is None:
+            polar = self._raw_data['legacy_polar']
+            self._polar = PolarCoord((polar[0], polar[1]), polar[2])
+        return self._polar
 
     @property
     def cartesian(self) -> CartCoord:
@@ -144,7 +183,9 @@ class Marker:
 
         The camera's position is the origin of the co-ordinate space.
         """
-        return CartCoord(*self._raw_data['cartesian'])
+        if self._cartesian is None:
+            self._cartesian = CartCoord(*self._raw_data['cartesian'])
+        return self._cartesian
 
     @property
     def spherical(self) -> SphericalCoord:
@@ -155,7 +196,9 @@ class Marker:
         x and y axes and a distance from the camera. Note: this co-ordinate
         space is different to the usual representation of a spherical space.
         """
-        return SphericalCoord(*self._raw_data['spherical'])
+        if self._spherical is None:
+            self._spherical = SphericalCoord(*self._raw_data['spherical'])
+        return self._spherical
 
     def __str__(self):
         bearing = self.spherical.rot_y_degrees
@@ -73,7 +73,7 @@ class MotorBoard(Board):
 
     def _get_status(self, motor_id: str):
         return self._string_to_power(
-            self._send_and_receive({})[motor_id],
+            self._get_board_status()[motor_id],
         )
 
     def _update_motor(self, motor_id: str, voltage: float):
@@ -84,4 +84,4 @@ class MotorBoard(Board):
         :param voltage: Voltage to set the motor to
         """
         v_string = self._power_to_string(voltage)
-        self._send_and_receive({motor_id: v_string})
+        self._write({motor_id: v_string})
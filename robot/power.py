@@ -1,12 +1,18 @@
 import enum
 import logging
 import time
-from typing import Callable
+from typing import Callable, NamedTuple, Optional
 
 from robot.board import Board
 
 LOGGER = logging.getLogger(__name__)
 
+WaitStartStats = NamedTuple('WaitStartStats', (
+    ('wall_seconds', float),
+    ('cpu_seconds', float),
+    ('messages_sent', int),
+))
+
 
 # Keep this in sync with `robotd`
 class PowerOutput(enum.Enum):
@@ -34,6 +40,9 @@ class PowerBoard(Board):
         'uc': 523,
     }
 
+    # How often the start LED is toggled while waiting for the start button
+    START_LED_BLINK_SECS = 0.1
+
     def __init__(
         self,
         *args,
@@ -42,6 +51,7 @@ class PowerBoard(Board):
     ) -> None:
         super().__init__(*args, **kwargs)
         self._on_start_signal = on_start_signal
+        self.last_wait_start_stats = None  # type: Optional[WaitStartStats]
 
     def power_on(self):
         """
@@ -88,27 +98,72 @@ class PowerBoard(Board):
         """
         Read the status of the start button.
         """
-        status = self._send_and_receive({})
+        status = self._get_board_status()
         return status["start-button"]
 
-    def wait_start(self) -> None:
+    def wait_start(self, timeout: Optional[float] = None) -> None:
         """
         Block until the start button is pressed.
+
+        The start LED blinks while waiting. Rather than continuously asking
+        ``robotd`` for the state of the button, this waits for ``robotd`` to
+        tell us about changes and otherwise only checks the button every
+        ``STATUS_POLL_INTERVAL_SECS``. How much work the wait took is recorded
+        in ``last_wait_start_stats``.
+
+        :param timeout: The maximum number of seconds to wait, or ``None`` to
+                        wait forever.
+        :raises TimeoutError: If the button isn't pressed within the timeout.
         """
         LOGGER.info('Waiting for start button.')
-        start_time = time.time()
-        led_value = True
-        while not self.start_button_pressed:
-            if time.time() - start_time >= 0.1:
-                led_value = not led_value
-                start_time = time.time()
-                self.set_start_led(led_value)
-        self.set_start_led(False)
+
+        wall_start = time.monotonic()
+        cpu_start = time.process_time()
+        messages_start = self.messages_sent
+
+        deadline = None if timeout is None else wall_start + timeout
+
+        was_streaming = self.streaming
+        self.start_streaming()
+        try:
+            self._wait_for_start_button(deadline)
+        finally:
+            self.set_start_led(False)
+            if not was_streaming:
+                self.stop_streaming()
+
+            self.last_wait_start_stats = WaitStartStats(
+                wall_seconds=time.monotonic() - wall_start,
+                cpu_seconds=time.process_time() - cpu_start,
+                messages_sent=self.messages_sent - messages_start,
+            )
 
         self._on_start_signal()
 
         LOGGER.info("Starting user code.")
 
+    def _wait_for_start_button(self, deadline: Optional[float]) -> None:
+        led_value = True
+        while True:
+            wait = self.START_LED_BLINK_SECS
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+
+            try:
+                self.wait_for_status(
+                    lambda status: status['start-button'],
+                    timeout=wait,
+                )
+                return
+            except TimeoutError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        "Start button was not pressed within the timeout",
+                    ) from None
+
+            led_value = not led_value
+            self.set_start_led(led_value)
+
     def buzz(self, duration, *, note=None, frequency=None) -> None:
         """Enqueue a note to be played by the buzzer on the power board."""
         if note is None and frequency is None:
@@ -0,0 +1,150 @@
+"""
+Policies for reconnecting to ``robotd`` after a board's connection fails.
+
+When a message can't be sent to or received from a board, the board
+reconnects to its socket and tries again. A ``ReconnectPolicy`` decides how
+long to keep trying for, whether the caller waits while it does so, and when
+to stop trying altogether for a while (a "circuit breaker"). Each board counts
+what its reconnections have cost in a ``ReconnectStats``.
+"""
+
+import enum
+import errno
+import random
+import socket
+from typing import Iterator, Optional, Sequence
+
+
+class CircuitState(enum.Enum):
+    """Whether a board is currently allowed to talk to ``robotd``."""
+
+    # Messages are sent as normal
+    CLOSED = 'closed'
+    # Reconnecting has failed too often; messages fail immediately
+    OPEN = 'open'
+    # The circuit has been open for long enough that a single reconnection
+    # may be tried
+    HALF_OPEN = 'half-open'
+
+
+class ReconnectPolicy:
+    """
+    How a ``Board`` reconnects after its connection to ``robotd`` fails.
+
+    A policy holds no state of its own, so one policy can be shared between
+    many boards.
+
+    :param backoffs: The number of seconds to wait before each attempt to
+                     reconnect.
+    :param deadline: The maximum number of seconds to spend reconnecting after
+                     a failure, or ``None`` for no limit beyond the backoffs.
+    :param jitter: The fraction by which each backoff is randomly lengthened
+                   or shortened, so that boards which fail together don't all
+                   reconnect at the same moment.
+    :param failure_threshold: The number of failed reconnections in a row after
+                              which the circuit opens, or ``None`` to always
+                              keep trying.
+    :param open_secs: How long the circuit stays open before a single
+                      reconnection is tried.
+    :param background: Whether to reconnect in a background thread. Callers
+                       then get a ``ConnectionError`` immediately, rather than
+                       waiting for the reconnection.
+    :param use_last_status: Whether reading the status of a board which can't
+                            be reached gives the last status received from it,
+                            rather than raising an error.
+    """
+
+    # Errors other than timeouts and ``ConnectionError``s which mean that the
+    # socket needs to be reconnected.
+    RECONNECT_ERRNOS = frozenset((
+        errno.EBADF,
+        errno.ENOTCONN,
+        errno.ESHUTDOWN,
+    ))
+
+    def __init__(
+        self,
+        backoffs: Sequence[float] = (0.1, 0.5, 1.0, 2.0, 3.0),
+        *,
+        deadline: Optional[float] = None,
+        jitter: float = 0,
+        failure_threshold: Optional[int] = None,
+        open_secs: float = 5,
+        background: bool = False,
+        use_last_status: bool = False
+    ) -> None:
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+
+        self.backoffs = tuple(backoffs)
+        self.deadline = deadline
+        self.jitter = jitter
+        self.failure_threshold = failure_threshold
+        self.open_secs = open_secs
+        self.background = background
+        self.use_last_status = use_last_status
+
+    def should_reconnect(self, error: OSError) -> bool:
+        """
+        Decide whether an error from a socket means it should be reconnected.
+
+        Other errors are passed to the caller unchanged.
+        """
+        if isinstance(error, (socket.timeout, ConnectionError)):
+            return True
+        return error.errno in self.RECONNECT_ERRNOS
+
+    def delays(self) -> Iterator[float]:
+        """
+        Generate the number of seconds to wait before each reconnection.
+
+        Jitter is applied to each of the backoffs.
+        """
+        for backoff in self.backoffs:
+            if self.jitter:
+                backoff *= 1 + random.uniform(-self.jitter, self.jitter)
+            yield backoff
+
+    def __repr__(self):
+        return (
+            "ReconnectPolicy(backoffs={!r}, deadline={!r}, jitter={!r}, "
+            "failure_threshold={!r}, open_secs={!r}, background={!r}, "
+            "use_last_status={!r})"
+        ).format(
+            self.backoffs,
+            self.deadline,
+            self.jitter,
+            self.failure_threshold,
+            self.open_secs,
+            self.background,
+            self.use_last_status,
+        )
+
+
+class ReconnectStats:
+    """Counts of what reconnecting to a board has cost."""
+
+    def __init__(self) -> None:
+        # Messages which failed and led to reconnecting
+        self.failures = 0
+        # Attempts to reconnect
+        self.attempts = 0
+        # Attempts to reconnect which succeeded
+        self.reconnects = 0
+        # Messages failed immediately, as the circuit was open or a background
+        # reconnection was under way
+        self.rejected = 0
+        # Total seconds spent reconnecting, including waiting between attempts
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (
+            "ReconnectStats(failures={}, attempts={}, reconnects={}, "
+            "rejected={}, seconds={:.3f})"
+        ).format(
+            self.failures,
+            self.attempts,
+            self.reconnects,
+            self.rejected,
+            self.seconds,
+        )
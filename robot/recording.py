@@ -0,0 +1,289 @@
+"""
+Recording and replaying of the messages exchanged with ``robotd``.
+
+A board can record everything it sends to and receives from ``robotd``:
+
+>>> board.start_recording('motor.rec.gz')
+>>> board.m0 = 0.5
+>>> board.stop_recording()
+
+The recording can then be served by a ``ReplayServer`` in place of
+``robotd``, for example to benchmark the API against a real competition run
+without any hardware:
+
+>>> with ReplayServer('motor.rec.gz', '/tmp/robotd/motor/ABC'):
+...     board = MotorBoard('/tmp/robotd/motor/ABC')
+
+A recording is a sequence of frames, each with a timestamp taken from
+``time.monotonic`` relative to the start of the recording. The data of each
+frame is exactly what was written to or read from the socket. Recordings
+whose names end in ``.gz`` are compressed.
+"""
+
+import enum
+import gzip
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from pathlib import Path, PurePath
+from typing import (  # noqa: F401
+    IO,
+    Any,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from robot.wire import LineBuffer, available_codecs, json_codec
+
+LOGGER = logging.getLogger(__name__)
+
+MAGIC = b'ROBOTREC1\n'
+
+# The kind of frame, the timestamp and the length of the data which follows
+_FRAME_HEADER = struct.Struct('>BdI')
+
+
+class FrameKind(enum.Enum):
+    """What happened in a frame of a recording."""
+
+    # A new connection was made; has no data
+    CONNECT = 0
+    # Data was sent to ``robotd``
+    SENT = 1
+    # Data was received from ``robotd``
+    RECEIVED = 2
+
+
+Frame = NamedTuple('Frame', (
+    ('kind', FrameKind),
+    ('timestamp', float),
+    ('data', bytes),
+))
+
+_PathLike = Union[str, PurePath]
+
+
+def _open(path: _PathLike, mode: str) -> IO[bytes]:
+    if str(path).endswith('.gz'):
+        return gzip.open(str(path), mode)  # type: ignore
+    return open(str(path), mode)
+
+
+class Recorder:
+    """
+    Writes frames to a recording.
+
+    Frames may be written from several threads.
+
+    :param file: The path to write the recording to, or a binary file object.
+    """
+
+    def __init__(self, file: Union[_PathLike, IO[bytes]]) -> None:
+        if isinstance(file, (str, PurePath)):
+            self._file = _open(file, 'wb')
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+
+        self._lock = threading.Lock()
+        self._start_time = time.monotonic()
+        self._file.write(MAGIC)
+
+    def write(self, kind: FrameKind, data: bytes = b'') -> None:
+        """Add a frame to the recording."""
+        header = _FRAME_HEADER.pack(
+            kind.value,
+            time.monotonic() - self._start_time,
+            len(data),
+        )
+        with self._lock:
+            self._file.write(header)
+            self._file.write(data)
+
+    def close(self) -> None:
+        """Finish the recording."""
+        with self._lock:
+            if self._owns_file:
+                self._file.close()
+            else:
+                self._file.flush()
+
+
+def read_recording(file: Union[_PathLike, IO[bytes]]) -> Iterator[Frame]:
+    """
+    Read the frames of a recording.
+
+    :param file: The path of the recording, or a binary file object.
+    :raises ValueError: If the file isn't a recording.
+    """
+    if isinstance(file, (str, PurePath)):
+        with _open(file, 'rb') as opened:
+            yield from read_recording(opened)
+        return
+
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a robotd recording")
+
+    while True:
+        header = file.read(_FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < _FRAME_HEADER.size:
+            raise ValueError("Recording is truncated")
+
+        kind, timestamp, length = _FRAME_HEADER.unpack(header)
+        data = file.read(length)
+        if len(data) < length:
+            raise ValueError("Recording is truncated")
+
+        yield Frame(FrameKind(kind), timestamp, data)
+
+
+# What was received after connecting, and then what was received after each
+# message sent, along with the times of each relative to that event.
+_Step = List[Tuple[float, bytes]]
+_Session = Tuple[_Step, List[_Step]]
+
+
+def _split_sessions(frames: Iterator[Frame]) -> List[_Session]:
+    sessions = []  # type: List[_Session]
+    step = []  # type: _Step
+    step_time = 0.0
+
+    for frame in frames:
+        if frame.kind == FrameKind.CONNECT:
+            step = []
+            sessions.append((step, []))
+            step_time = frame.timestamp
+        elif not sessions:
+            # Frames from before the first connection can't be replayed
+            continue
+        elif frame.kind == FrameKind.SENT:
+            step = []
+            sessions[-1][1].append(step)
+            step_time = frame.timestamp
+        else:
+            step.append((frame.timestamp - step_time, frame.data))
+
+    return sessions
+
+
+class ReplayServer:
+    """
+    Serves a recording over a unix socket in place of ``robotd``.
+
+    Each connection to the server replays the next connection in the
+    recording: it is sent what ``robotd`` sent when that connection was made,
+    and then whatever ``robotd`` sent after each message, whatever the
+    messages now sent are. Once a connection has used up its part of the
+    recording it is closed.
+
+    :param recording: The path of the recording, or a binary file object.
+    :param socket_path: Where to create the socket.
+    :param speed: How quickly to replay relative to the recording. ``1`` keeps
+                  the delays ``robotd`` took to respond; ``None`` responds
+                  immediately.
+    """
+
+    RECV_BUFFER_BYTES = 65536
+
+    def __init__(
+        self,
+        recording: Union[_PathLike, IO[bytes]],
+        socket_path: _PathLike,
+        speed: Optional[float] = None,
+    ) -> None:
+        self.socket_path = Path(socket_path)
+        self.speed = speed
+        self._sessions = _split_sessions(read_recording(recording))
+        self._sessions_lock = threading.Lock()
+        self._connections = []  # type: List[socket.socket]
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(self.socket_path))
+        self._server.listen(5)
+
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+
+            with self._sessions_lock:
+                session = self._sessions.pop(0) if self._sessions else None
+
+            if session is None:
+                LOGGER.warning("Recording has no more connections to replay")
+                connection.close()
+                continue
+
+            self._connections.append(connection)
+            threading.Thread(
+                target=self._replay,
+                args=(connection, session),
+                daemon=True,
+            ).start()
+
+    def _send_step(self, connection: socket.socket, step: _Step) -> None:
+        start_time = time.monotonic()
+        for delay, data in step:
+            if self.speed is not None:
+                wait = start_time + delay / self.speed - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            connection.sendall(data)
+
+    def _replay(self, connection: socket.socket, session: _Session) -> None:
+        greeting, steps = session
+        # Messages are decoded only to know when each one has arrived
+        codec = json_codec()
+        buffer = LineBuffer()
+
+        try:
+            self._send_step(connection, greeting)
+
+            for step in steps:
+                message = codec.decode(buffer)
+                while message is None:
+                    data = connection.recv(self.RECV_BUFFER_BYTES)
+                    if not data:
+                        return
+                    buffer.feed(data)
+                    message = codec.decode(buffer)
+
+                if isinstance(message, dict) and list(message.keys()) == ['codec']:
+                    codec = available_codecs()[message['codec']]()
+
+                self._send_step(connection, step)
+        except OSError:
+            return
+        finally:
+            connection.close()
+
+    def stop(self) -> None:
+        """Stop serving and remove the socket."""
+        self._server.close()
+        for connection in self._connections:
+            connection.close()
+        try:
+            os.unlink(str(self.socket_path))
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'ReplayServer':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
@@ -0,0 +1,336 @@
+"""
+Tracking of which board sockets ``robotd`` has created.
+
+``robotd`` creates a socket for each board at
+``<robotd_path>/<board_type>/<serial>``. Rather than listing these directories
+every time the boards are accessed, ``BoardRegistry`` watches them for changes
+and only reports a board type as changed after something in its directory has
+been added or removed.
+
+On Linux the directories are watched with inotify; elsewhere, or if inotify is
+unavailable, their modification times are polled from a background thread.
+"""
+
+import ctypes
+import logging
+import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set, Union  # noqa: F401
+
+LOGGER = logging.getLogger(__name__)
+
+# Constants from <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+
+# Changes to the entries of a directory, and to the directory itself
+_ENTRY_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+_SELF_EVENTS = IN_DELETE_SELF | IN_MOVE_SELF
+_WATCH_MASK = _ENTRY_EVENTS | _SELF_EVENTS | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _InotifyWatcher:
+    """
+    Reports changes to the board directories using inotify.
+
+    If the root directory is removed, every board type is reported as changed
+    and the root is checked for every ``interval`` seconds until it has been
+    created again, at which point it is watched again.
+    """
+
+    def __init__(self, root: Path, on_change, on_reset, interval: float) -> None:
+        self._libc = self._load_libc()
+
+        self.root = root
+        self._on_change = on_change
+        self._on_reset = on_reset
+        self._interval = interval
+        self._watches = {}  # type: Dict[int, str]
+
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._wake_read, self._wake_write = os.pipe()
+
+        try:
+            self._watch_root()
+        except OSError:
+            self._close_fds()
+            raise
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _load_libc() -> ctypes.CDLL:
+        # The C library is almost always already loaded into the interpreter,
+        # which is much quicker to check than searching for it.
+        libc = ctypes.CDLL(None, use_errno=True)
+        if hasattr(libc, 'inotify_init1'):
+            return libc
+
+        from ctypes.util import find_library
+        libc_name = find_library('c')
+        if libc_name is None:
+            raise OSError("Cannot find the C library")
+
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+        return libc
+
+    def _add_watch(self, path: Path, name: str) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd,
+            os.fsencode(str(path)),
+            _WATCH_MASK,
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        self._watches[wd] = name
+
+    def _watch_root(self) -> None:
+        self._add_watch(self.root, '')
+        for child in self.root.iterdir():
+            if child.is_dir():
+                self._add_watch(child, child.name)
+
+    def _remove_watches(self) -> None:
+        for wd in self._watches:
+            # Fails harmlessly if the directory has already gone
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._watches.clear()
+
+    def _lose_root(self) -> None:
+        LOGGER.debug("'%s' was removed, waiting for it to return", self.root)
+        self._remove_watches()
+        self._on_reset()
+
+    def _rewatch_root(self) -> None:
+        try:
+            self._watch_root()
+        except OSError:
+            # Not back yet, or removed again part way through
+            self._remove_watches()
+            return
+
+        # Boards may have been added before the watches were in place
+        LOGGER.debug("'%s' was created again, watching it", self.root)
+        self._on_reset()
+
+    def _run(self) -> None:
+        while True:
+            # Without any watches there are no events to wait for, so instead
+            # wake up periodically to look for the root.
+            timeout = None if self._watches else self._interval
+            readable, _, _ = select.select(
+                [self._fd, self._wake_read],
+                [],
+                [],
+                timeout,
+            )
+            if self._wake_read in readable:
+                return
+
+            if self._fd in readable:
+                try:
+                    data = os.read(self._fd, 65536)
+                except OSError:
+                    return
+
+                self._handle_events(data)
+
+            if not self._watches:
+                self._rewatch_root()
+
+    def _handle_events(self, data: bytes) -> None:
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b'\0'))
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events have been lost, so we no longer know what's changed
+                self._on_reset()
+                continue
+
+            directory_name = self._watches.get(wd)
+            if directory_name is None:
+                continue
+
+            if directory_name == '' and mask & (_SELF_EVENTS | IN_IGNORED):
+                # The root was removed or moved away, taking the boards with it
+                self._lose_root()
+                continue
+
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+                continue
+
+            if directory_name == '':
+                # Something was added to or removed from the root; start
+                # watching any new board directory.
+                child = self.root / name
+                if mask & (IN_CREATE | IN_MOVED_TO) and child.is_dir():
+                    try:
+                        self._add_watch(child, name)
+                    except OSError:
+                        LOGGER.warning("Cannot watch '%s'", child, exc_info=True)
+                self._on_change(name)
+            else:
+                self._on_change(directory_name)
+
+    def _close_fds(self) -> None:
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            os.close(fd)
+
+    def close(self) -> None:
+        os.write(self._wake_write, b'\0')
+        self._thread.join()
+        self._close_fds()
+
+
+class _PollingWatcher:
+    """Reports changes to the board directories by polling their mtimes."""
+
+    def __init__(self, root: Path, on_change, interval: float) -> None:
+        self.root = root
+        self._on_change = on_change
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._mtimes = self._scan()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _scan(self) -> Dict[str, int]:
+        mtimes = {}  # type: Dict[str, int]
+        try:
+            mtimes[''] = self.root.stat().st_mtime_ns
+            for child in self.root.iterdir():
+                if child.is_dir():
+                    mtimes[child.name] = child.stat().st_mtime_ns
+        except OSError:
+            pass
+        return mtimes
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            mtimes = self._scan()
+            for name in set(mtimes) | set(self._mtimes):
+                if mtimes.get(name) != self._mtimes.get(name):
+                    self._on_change(name)
+            self._mtimes = mtimes
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+class BoardRegistry:
+    """
+    Watches the ``robotd`` directory for boards being added or removed.
+
+    Every board type starts out as changed. Asking whether a board type has
+    changed with ``take_changed`` doesn't touch the filesystem, so it is cheap
+    enough to call on every access to the boards.
+
+    :Example:
+    >>> registry = BoardRegistry(Path('/var/robotd'))
+    >>> if registry.take_changed('motor'):
+    ...     paths = registry.board_paths('motor')
+    """
+
+    POLL_INTERVAL_SECS = 0.1
+
+    def __init__(self, root: Path, use_inotify: bool = True) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        # Board types which haven't changed since they were last listed
+        self._unchanged = set()  # type: Set[str]
+
+        self._watcher = self._create_watcher(
+            use_inotify,
+        )  # type: Optional[Union[_InotifyWatcher, _PollingWatcher]]
+
+    def _create_watcher(self, use_inotify: bool):
+        if use_inotify:
+            try:
+                return _InotifyWatcher(
+                    self.root,
+                    self._mark_changed,
+                    self.refresh,
+                    self.POLL_INTERVAL_SECS,
+                )
+            except OSError:
+                LOGGER.debug(
+                    "Cannot watch '%s' with inotify, polling instead",
+                    self.root,
+                    exc_info=True,
+                )
+
+        return _PollingWatcher(
+            self.root,
+            self._mark_changed,
+            self.POLL_INTERVAL_SECS,
+        )
+
+    def _mark_changed(self, directory_name: str) -> None:
+        with self._lock:
+            self._unchanged.discard(directory_name)
+
+    def refresh(self, directory_name: Optional[str] = None) -> None:
+        """
+        Treat a board type, or all board types, as changed.
+
+        :param directory_name: The board type to refresh, or ``None`` for all.
+        """
+        with self._lock:
+            if directory_name is None:
+                self._unchanged.clear()
+            else:
+                self._unchanged.discard(directory_name)
+
+    def take_changed(self, directory_name: str) -> bool:
+        """
+        Check whether a board type has changed since this was last called.
+
+        :return: ``True`` if boards of this type may have been added or
+                 removed, in which case the type is now considered unchanged.
+        """
+        with self._lock:
+            if directory_name in self._unchanged:
+                return False
+            self._unchanged.add(directory_name)
+            return True
+
+    def board_paths(self, directory_name: str) -> Set[Path]:
+        """
+        List the sockets of the boards of a type.
+
+        :return: The paths of the board sockets.
+        """
+        return set((self.root / directory_name).glob('*'))
+
+    def close(self) -> None:
+        """Stop watching for changes."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
@@ -1,15 +1,27 @@
 import functools
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, List, Set, Union  # noqa: F401
+from typing import (  # noqa: F401
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from robot import __VERSION__
 from robot.board import BoardList, TBoard
-from robot.camera import Camera
+from robot.camera import Camera, CameraGroup, ResultList
 from robot.game import GameMode, GameState, Zone, kill_after_delay
 from robot.game_specific import GAME_DURATION_SECONDS
 from robot.motor import MotorBoard
 from robot.power import PowerBoard
+from robot.registry import BoardRegistry
 from robot.servo import ServoBoard
 
 _PathLike = Union[str, Path]
@@ -36,7 +48,10 @@ class Robot:
 
     Internally it:
     - Speaks to robotd over unix socket
-    - Always grabs from sockets, avoids caching
+    - Caches each board's status for up to its ``status_max_age`` seconds,
+      so reading several of its values takes one round trip
+    - Caches the lists of boards, only looking for boards being added or
+      removed after the robotd directory changes
     """
 
     ROBOTD_ADDRESS = "/var/robotd"
@@ -53,6 +68,15 @@ class Robot:
         self.known_cameras = []  # type: List[Camera]
         self.known_gamestates = []  # type: List[GameState]
 
+        # Total seconds spent connecting to new boards, by board directory
+        self.connect_times = {}  # type: Dict[str, float]
+
+        self._registry = BoardRegistry(self.robotd_path)
+        self._board_lists = {}  # type: Dict[str, BoardList[Any]]
+        # Boards whose sockets have gone away, kept so that the same board
+        # objects are used again if the boards come back.
+        self._lost_boards = {}  # type: Dict[Path, Any]
+
         configure_logging()
 
         LOGGER.info("Robot (v{}) Initialising...".format(__VERSION__))
@@ -76,6 +100,12 @@ class Robot:
         """
         Update the number of boards against the known boards.
 
+        The board directory is only looked at if the registry has seen it
+        change since it was last looked at; otherwise the previous
+        ``BoardList`` is returned. Boards whose sockets have gone away are
+        marked as lost and removed; if they come back, the same board objects
+        are reconnected.
+
         :param known_boards: The list of all currently known boards; this list
                              will be updated with any newly found boards.
         :param board_type: The type of board to create.
@@ -83,24 +113,94 @@ class Robot:
         :return: A ``BoardList[TBoard]`` of all the known boards (both
                  previously known and newly found).
         """
+        key = str(directory_name)
+        if not self._registry.take_changed(key) and key in self._board_lists:
+            return self._board_lists[key]
+
+        board_paths = self._registry.board_paths(key)
+
+        # Boards whose sockets have gone away have been unplugged
+        for board in list(known_boards):
+            if board.socket_path not in board_paths:
+                board._mark_lost()
+                known_boards.remove(board)
+                self._lost_boards[board.socket_path] = board
+
         known_paths = {x.socket_path for x in known_boards}  # type: Set[Path]
-        boards_dir = self.robotd_path / directory_name  # type: Path
-        new_paths = set(boards_dir.glob('*'))  # type: Set[Path]
-        # Add all boards that weren't previously there
-        for board_path in new_paths - known_paths:
+        new_paths = sorted(board_paths - known_paths)
+        if not new_paths:
+            board_list = BoardList(known_boards)
+            self._board_lists[key] = board_list
+            return board_list
+
+        for board_path in new_paths:
             LOGGER.info("New board found: '%s'", board_path)
 
+        def connect(board_path):
+            board = self._lost_boards.get(board_path)
+            if board is None:
+                return board_type(board_path)
+            if board.lost:
+                board._recover()
+            return board
+
+        # Connect to all the new boards at once, so that startup takes as long
+        # as the slowest board rather than the sum of them. Each connection
+        # gives up after the board's own socket timeout.
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=len(new_paths)) as executor:
+            futures = [executor.submit(connect, x) for x in new_paths]
+
+        connected = []  # type: List[Tuple[Path, TBoard]]
+        error = None  # type: Optional[Exception]
+        for board_path, future in zip(new_paths, futures):
             try:
-                new_board = board_type(board_path)
-                known_boards.append(new_board)
-            except (FileNotFoundError, ConnectionRefusedError):
+                connected.append((board_path, future.result()))
+            except OSError:
+                # Including timeouts, and boards which went away or whose
+                # sockets can't be used
                 LOGGER.warning(
                     "Could not connect to the board: '%s'",
                     board_path,
                     exc_info=True,
                 )
+                # Try again next time the boards are accessed
+                self._registry.refresh(key)
+            except Exception as e:
+                if error is None:
+                    error = e
+
+        if error is not None:
+            # The boards which did connect would otherwise be left open
+            for _, board in connected:
+                board.close()
+            self._registry.refresh(key)
+            raise error
+
+        for board_path, board in connected:
+            known_boards.append(board)
+            self._lost_boards.pop(board_path, None)
+
+        elapsed = time.monotonic() - start_time
+        self.connect_times[key] = self.connect_times.get(key, 0) + elapsed
+        LOGGER.info(
+            "Connected to new '%s' boards in %.3f seconds",
+            directory_name,
+            elapsed,
+        )
 
-        return BoardList(known_boards)
+        board_list = BoardList(known_boards)
+        self._board_lists[key] = board_list
+        return board_list
+
+    def refresh(self) -> None:
+        """
+        Look for boards which have been added on the next access to them.
+
+        Boards are normally noticed as soon as ``robotd`` creates their
+        sockets, so this should only be needed if that has somehow failed.
+        """
+        self._registry.refresh()
 
     @property
     def motor_boards(self) -> BoardList[MotorBoard]:
@@ -199,6 +299,25 @@ class Robot:
         """
         return self._single_index("cameras", self.cameras)
 
+    def see_all(
+        self,
+        limit: Optional[int] = None,
+        sort: Union[str, bool] = 'distance',
+    ) -> ResultList:
+        """
+        Capture and process a new snapshot from every camera at once.
+
+        See ``CameraGroup.see`` for how the markers are merged; each marker's
+        ``camera`` is the serial number of the camera which saw it. Cameras
+        which fail are logged and left out, unless they all fail.
+
+        :param limit: The maximum number of markers to return, or ``None`` for
+                      all of them.
+        :param sort: How to order the markers, see ``Camera.see``.
+        :return: A ``ResultList`` of the markers seen by any camera.
+        """
+        return CameraGroup(self.cameras).see(limit, sort)
+
     @property
     def _game(self) -> GameState:
         """
@@ -248,5 +367,12 @@ class Robot:
             # reanimate the boards (which isn't supported).
             del board_group[:]
 
+        for board in self._lost_boards.values():
+            board.close()
+        self._lost_boards.clear()
+
+        self._board_lists.clear()
+        self._registry.close()
+
     def __del__(self):
         self.close()
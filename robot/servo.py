@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, List, Mapping
 
 from robot.board import Board
 
@@ -20,6 +20,11 @@ class PinValue(Enum):
     LOW = 'L'
 
 
+def _validate_position(position):
+    if position > 1 or position < -1:
+        raise ValueError("servo position must be between -1 and 1")
+
+
 class Servo:
     """A servo output on a ``ServoBoard``."""
 
@@ -35,8 +40,7 @@ class Servo:
 
     @position.setter
     def position(self, position):
-        if position > 1 or position < -1:
-            raise ValueError("servo position must be between -1 and 1")
+        _validate_position(position)
         self._set_pos(position)
 
 
@@ -108,8 +112,8 @@ class ServoBoard(Board):
     This is an arduino with a servo shield attached.
     """
 
-    def __init__(self, socket_path):
-        super().__init__(socket_path)
+    def __init__(self, socket_path, **kwargs):
+        super().__init__(socket_path, **kwargs)
 
         servo_ids = range(0, 16)  # servos with a port 0-15
         gpio_pins = range(2, 14)  # gpio pins 2-13
@@ -169,10 +173,30 @@ class ServoBoard(Board):
         return self._servos
 
     def _set_servo_pos(self, servo: int, pos: float):
-        self._send_and_receive({'servos': {servo: pos}})
+        self._write({'servos': {servo: pos}})
+
+    def set_positions(self, positions: Mapping[int, float]) -> None:
+        """
+        Set the positions of several servos at once.
+
+        The positions are sent to the board in a single message, so all the
+        servos start moving at the same time.
+
+        :Example:
+        >>> servo_board.set_positions({0: 0.5, 3: -1})
+
+        :param positions: A mapping of servo ids to their new positions, each
+                          between -1 and 1.
+        """
+        for servo, position in positions.items():
+            if servo not in self._servos:
+                raise ValueError("Invalid servo id {!r}".format(servo))
+            _validate_position(position)
+
+        self._write({'servos': dict(positions)})
 
     def _get_servo_pos(self, servo: int) -> float:
-        data = self._send_and_receive({})
+        data = self._get_board_status()
         values = data['servos']
         return float(values[str(servo)])
 
@@ -191,14 +215,14 @@ class ServoBoard(Board):
         return PinValue(values[str(pin)])
 
     def _get_pin_mode(self, pin) -> PinMode:
-        data = self._send_and_receive({})
+        data = self._get_board_status()
         # example data value:
         # {'pins':{2:'pullup'}}
         values = data['pins']
         return PinMode(values[str(pin)])
 
     def _set_pin_mode(self, pin, value: PinMode):
-        self._send_and_receive({'pins': {pin: value.value}})
+        self._write({'pins': {pin: value.value}})
 
     def read_analogue(self) -> Dict[str, float]:
         """Read analogue values from the connected board."""
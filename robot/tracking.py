@@ -0,0 +1,200 @@
+"""
+Tracking of markers across the images taken by a camera.
+
+Each image a camera takes is processed on its own, so the positions of the
+markers in it are noisy and say nothing about how the markers are moving. A
+``Tracker`` follows each marker by its id from one image to the next, and
+smooths its position and velocity with an alpha-beta filter:
+
+>>> tracker = Tracker()
+>>> for markers in camera.stream():
+...     tracker.update(markers)
+...     track = tracker.get(TOKEN_ID)
+
+Between images the position of a marker can be predicted from its velocity,
+so a control loop can run faster than the camera:
+
+>>> while True:
+...     position = tracker.predict(TOKEN_ID)
+"""
+
+import copy
+import threading
+import time
+from typing import Dict, Iterable, List, Optional  # noqa: F401
+
+from robot.markers import CartCoord, Marker, Metres
+
+
+class Track:
+    """
+    What is known about a marker which has been seen.
+
+    Positions are in the Cartesian co-ordinates of the camera, and velocities
+    in metres per second along each of its axes.
+    """
+
+    def __init__(self, marker: Marker, timestamp: float) -> None:
+        self.id = marker.id
+        self.position = marker.cartesian
+        self.velocity = CartCoord(Metres(0), Metres(0), Metres(0))
+        # When the marker was last seen, from ``time.monotonic``
+        self.last_seen = timestamp
+        # The number of images the marker has been seen in
+        self.sightings = 1
+        self.marker = marker
+
+    def predict(self, timestamp: Optional[float] = None) -> CartCoord:
+        """
+        Predict where the marker is, assuming it keeps moving at its velocity.
+
+        :param timestamp: When to predict the position for, from
+                          ``time.monotonic``; defaults to now.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        elapsed = timestamp - self.last_seen
+        return CartCoord(*(
+            Metres(position + velocity * elapsed)
+            for position, velocity in zip(self.position, self.velocity)
+        ))
+
+    def __repr__(self):
+        return "Track(id={}, position={}, velocity={}, last_seen={:.3f})".format(
+            self.id,
+            self.position,
+            self.velocity,
+            self.last_seen,
+        )
+
+
+class Tracker:
+    """
+    Follows markers across images, smoothing their positions.
+
+    One tracker should be used per camera, as positions from different
+    cameras aren't comparable. ``update`` may be called from a different
+    thread to the other methods, for example with the markers from
+    ``Camera.latest``.
+
+    :param alpha: How much each new position is trusted over the predicted
+                  position, between 0 and 1.
+    :param beta: How much each new position changes the velocity, between 0
+                 and 1. Lower values give smoother but slower to react
+                 velocities.
+    :param forget_after: How many seconds after a marker was last seen to
+                         stop tracking it.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.5,
+        beta: float = 0.1,
+        forget_after: float = 2,
+    ) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be greater than 0 and at most 1")
+        if not 0 <= beta <= 1:
+            raise ValueError("beta must be between 0 and 1")
+
+        self.alpha = alpha
+        self.beta = beta
+        self.forget_after = forget_after
+        self._lock = threading.Lock()
+        self._tracks = {}  # type: Dict[int, Track]
+
+    def update(
+        self,
+        markers: Iterable[Marker],
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Add the markers seen in an image.
+
+        :param markers: The markers seen, for example from ``Camera.see``.
+        :param timestamp: When the image was taken, from ``time.monotonic``;
+                          defaults to now. ``Capture.timestamp`` is more
+                          accurate, when available.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        with self._lock:
+            for marker in markers:
+                track = self._tracks.get(marker.id)
+                if track is None:
+                    self._tracks[marker.id] = Track(marker, timestamp)
+                elif timestamp > track.last_seen:
+                    # Tracks are replaced rather than changed, so that one
+                    # returned from ``get`` is never half updated.
+                    self._tracks[marker.id] = self._filter(track, marker, timestamp)
+
+            self._forget(timestamp)
+
+    def _filter(self, track: Track, marker: Marker, timestamp: float) -> Track:
+        elapsed = timestamp - track.last_seen
+        predicted = track.predict(timestamp)
+        residuals = [
+            measured - expected
+            for measured, expected in zip(marker.cartesian, predicted)
+        ]
+
+        updated = copy.copy(track)
+        updated.position = CartCoord(*(
+            Metres(expected + self.alpha * residual)
+            for expected, residual in zip(predicted, residuals)
+        ))
+        updated.velocity = CartCoord(*(
+            Metres(velocity + self.beta * residual / elapsed)
+            for velocity, residual in zip(track.velocity, residuals)
+        ))
+        updated.last_seen = timestamp
+        updated.sightings += 1
+        updated.marker = marker
+        return updated
+
+    def _forget(self, timestamp: float) -> None:
+        forget_before = timestamp - self.forget_after
+        for marker_id, track in list(self._tracks.items()):
+            if track.last_seen < forget_before:
+                del self._tracks[marker_id]
+
+    def get(self, marker_id: int) -> Optional[Track]:
+        """
+        Get what is known about a marker.
+
+        :return: The ``Track`` of the marker, or ``None`` if it hasn't been
+                 seen recently.
+        """
+        with self._lock:
+            return self._tracks.get(marker_id)
+
+    def predict(
+        self,
+        marker_id: int,
+        timestamp: Optional[float] = None,
+    ) -> Optional[CartCoord]:
+        """
+        Predict where a marker is, see ``Track.predict``.
+
+        :return: The predicted position, or ``None`` if the marker hasn't been
+                 seen recently.
+        """
+        track = self.get(marker_id)
+        if track is None:
+            return None
+        return track.predict(timestamp)
+
+    def tracks(self) -> List[Track]:
+        """Get the markers being tracked, most recently seen first."""
+        with self._lock:
+            return sorted(
+                self._tracks.values(),
+                key=lambda x: x.last_seen,
+                reverse=True,
+            )
+
+    def reset(self) -> None:
+        """Forget every marker."""
+        with self._lock:
+            self._tracks.clear()
@@ -0,0 +1,281 @@
+"""
+Encodings for the messages exchanged with ``robotd``.
+
+``robotd`` speaks newline-delimited JSON, which is what every connection
+starts out using. If the greeting sent by ``robotd`` lists any other codecs
+which it supports (as a ``codecs`` list) then a connection may switch to one
+of those by sending ``{"codec": <name>}``; everything after that message, in
+both directions, uses the new codec.
+
+All codecs carry the JSON data model, so the decoded messages are the same
+whichever codec is in use.
+"""
+
+import json
+import struct
+from typing import Any, Callable, Dict, Iterable, Optional  # noqa: F401
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+
+
+class LineBuffer:
+    """
+    A buffer which splits a stream of bytes into frames.
+
+    Incoming data is appended to a single ``bytearray``, which is only ever
+    scanned once: searches for the end of a line resume from where the
+    previous search stopped rather than from the start of the buffer. This
+    keeps receiving large messages in many small chunks linear in the size
+    of the message.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        # Offset up to which the buffer is known not to contain a newline
+        self._scanned = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> None:
+        """Add received data to the end of the buffer."""
+        self._buffer += data
+
+    def next_line(self) -> Optional[str]:
+        """
+        Remove and decode the first complete line from the buffer.
+
+        :return: The text of the line, without its terminating newline, or
+                 ``None`` if the buffer doesn't contain a complete line yet.
+        """
+        end = self._buffer.find(b'\n', self._scanned)
+        if end == -1:
+            self._scanned = len(self._buffer)
+            return None
+
+        # Decode straight out of the buffer to avoid copying the line into an
+        # intermediate ``bytes`` object.
+        with memoryview(self._buffer) as view:
+            line = str(view[:end], 'utf-8')
+
+        # Removing data from the front of a ``bytearray`` doesn't move the
+        # remaining data, so this is cheap even for large buffers.
+        del self._buffer[:end + 1]
+        self._scanned = 0
+        return line
+
+    def peek(self, size: int) -> Optional[bytes]:
+        """
+        Return the first ``size`` bytes in the buffer without removing them.
+
+        :return: The data, or ``None`` if there is less than ``size`` bytes
+                 in the buffer.
+        """
+        if len(self._buffer) < size:
+            return None
+        with memoryview(self._buffer) as view:
+            return bytes(view[:size])
+
+    def read(self, size: int) -> Optional[bytes]:
+        """
+        Remove and return the first ``size`` bytes in the buffer.
+
+        :return: The data, or ``None`` if there is less than ``size`` bytes
+                 in the buffer.
+        """
+        data = self.peek(size)
+        if data is not None:
+            del self._buffer[:size]
+            self._scanned = max(0, self._scanned - size)
+        return data
+
+    def consume(
+        self,
+        size: int,
+        parse: Callable[[memoryview], Any],
+        start: int = 0,
+    ) -> Optional[Any]:
+        """
+        Parse and remove the first ``size`` bytes in the buffer.
+
+        ``parse`` is given a view of the bytes from ``start`` to ``size``,
+        rather than a copy of them, and mustn't keep it after returning.
+
+        :return: The result of ``parse``, or ``None`` if there is less than
+                 ``size`` bytes in the buffer.
+        """
+        if len(self._buffer) < size:
+            return None
+        # The view must be released before the buffer can be resized.
+        with memoryview(self._buffer) as view:
+            result = parse(view[start:size])
+        del self._buffer[:size]
+        self._scanned = max(0, self._scanned - size)
+        return result
+
+
+class Codec:
+    """Base class for an encoding of messages sent over a board socket."""
+
+    name = ''
+
+    def encode(self, message: Any) -> bytes:
+        """Encode a message into a frame ready to be sent."""
+        raise NotImplementedError
+
+    def decode(self, buffer: LineBuffer) -> Optional[Any]:
+        """
+        Decode the next message from received data.
+
+        :param buffer: The data received so far; the frame of the returned
+                       message is removed from it.
+        :return: The decoded message, or ``None`` if the buffer doesn't hold a
+                 complete frame yet.
+        """
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """Newline-delimited JSON, using the standard library."""
+
+    name = JSON
+
+    def encode(self, message: Any) -> bytes:
+        """Encode a message into a frame ready to be sent."""
+        return (json.dumps(message) + '\n').encode('utf-8')
+
+    def decode(self, buffer: LineBuffer) -> Optional[Any]:
+        """Decode the next message from received data."""
+        line = buffer.next_line()
+        if line is None:
+            return None
+        return json.loads(line)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Newline-delimited JSON, using ``orjson``.
+
+    This uses much less CPU time per message than ``JsonCodec``, but is
+    stricter about what it accepts: ``robotd`` encodes with ``json.dumps``,
+    which writes ``NaN`` and ``Infinity`` for values which aren't finite
+    (for example the readings of an ultrasound sensor which heard no echo),
+    and ``orjson`` rejects these. Lines which ``orjson`` can't decode are
+    decoded with the standard library instead.
+    """
+
+    def encode(self, message: Any) -> bytes:
+        """Encode a message into a frame ready to be sent."""
+        # Some commands are keyed by servo or pin number, which JSON turns
+        # into strings.
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS) + b'\n'
+
+    def decode(self, buffer: LineBuffer) -> Optional[Any]:
+        """Decode the next message from received data."""
+        line = buffer.next_line()
+        if line is None:
+            return None
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            return json.loads(line)
+
+
+def _stringify_keys(value: Any) -> Any:
+    """
+    Convert mapping keys to strings, as JSON would.
+
+    Commands use servo and pin numbers as keys of mappings nested within the
+    message, but never within lists, so lists aren't searched. This avoids
+    walking every marker in large camera responses.
+    """
+    if not isinstance(value, dict):
+        return value
+    return {
+        (k if isinstance(k, str) else json.dumps(k).strip('"')): _stringify_keys(v)
+        for k, v in value.items()
+    }
+
+
+class MsgpackCodec(Codec):
+    """
+    MessagePack, with each message prefixed by its length.
+
+    Binary frames may contain newlines, so each is preceded by its length as
+    a 4 byte big-endian unsigned integer instead of being newline terminated.
+    """
+
+    name = MSGPACK
+
+    HEADER = struct.Struct('>I')
+
+    def encode(self, message: Any) -> bytes:
+        """Encode a message into a frame ready to be sent."""
+        payload = msgpack.packb(_stringify_keys(message), use_bin_type=True)
+        return self.HEADER.pack(len(payload)) + payload
+
+    def decode(self, buffer: LineBuffer) -> Optional[Any]:
+        """Decode the next message from received data."""
+        header = buffer.peek(self.HEADER.size)
+        if header is None:
+            return None
+
+        size, = self.HEADER.unpack(header)
+        # Unpack straight out of the buffer, as frames such as the markers
+        # seen by a camera can be large.
+        return buffer.consume(
+            self.HEADER.size + size,
+            lambda x: msgpack.unpackb(x, raw=False),
+            start=self.HEADER.size,
+        )
+
+
+def json_codec() -> Codec:
+    """
+    The fastest available implementation of the JSON codec.
+
+    Every connection starts out using this.
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    return JsonCodec()
+
+
+def available_codecs() -> Dict[str, Callable[[], Codec]]:
+    """
+    The codecs which can be used, keyed by name.
+
+    Codecs which depend on packages which aren't installed are omitted.
+    """
+    codecs = {JSON: json_codec}  # type: Dict[str, Callable[[], Codec]]
+    if msgpack is not None:
+        codecs[MSGPACK] = MsgpackCodec
+    return codecs
+
+
+def choose_codec(preference: Iterable[str], offered: Iterable[str]) -> str:
+    """
+    Pick the codec to use for a connection.
+
+    :param preference: Names of the codecs to consider, most preferred first.
+    :param offered: Names of the codecs which the other end supports.
+    :return: The name of the most preferred codec which both ends support.
+    """
+    offered = set(offered)
+    available = available_codecs()
+    for name in preference:
+        if name in offered and name in available:
+            return name
+    return JSON
@@ -9,7 +9,15 @@ setup(
     author='SourceBots',
     license='MIT',
     install_requires=[],
+    extras_require={
+        # Faster encoding of messages to and from robotd, see robot.wire
+        'orjson': ['orjson'],
+        'msgpack': ['msgpack'],
+        # Viewing the markers seen as an array, see ResultList.as_array
+        'numpy': ['numpy'],
+    },
     dependency_links=[],
     tests_require=["robotd", "sb-vision"],
     packages=find_packages(exclude=['contrib', 'docs', 'tests']),
+    package_data={'robot': ['games/*.json']},
 )
@@ -0,0 +1,135 @@
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+
+from robot.wire import JSON, LineBuffer, available_codecs, json_codec
+
+
+class MockWireBoard:
+    """
+    A stand-in for a single ``robotd`` board socket which can switch codecs.
+
+    Unlike ``MockRobotD`` this runs in a thread within the test process and
+    doesn't need ``robotd`` installed. Its greeting offers the given codecs,
+    and like ``robotd`` it replies to every message with its status. Status
+    updates can also be pushed to every client with ``broadcast``, and a slow
+    board can be simulated by delaying the greeting or the replies.
+    """
+
+    def __init__(
+        self,
+        socket_path,
+        codecs=(JSON,),
+        status=None,
+        greeting_delay=0,
+        reply_delay=0,
+    ):
+        self.socket_path = str(socket_path)
+        self.codecs = list(codecs)
+        self.status = dict(status or {})
+        self.greeting_delay = greeting_delay
+        self.reply_delay = reply_delay
+        self.message_queue = queue.Queue()
+        self.codecs_used = []
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        self._server.listen(5)
+        self._connections = []
+        self._connection_codecs = {}
+        self._send_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+
+            self._connections.append(connection)
+            threading.Thread(
+                target=self._handle,
+                args=(connection,),
+                daemon=True,
+            ).start()
+
+    def _handle(self, connection):
+        codec = json_codec()
+        buffer = LineBuffer()
+
+        time.sleep(self.greeting_delay)
+        greeting = dict(self.status)
+        if self.codecs:
+            greeting['codecs'] = self.codecs
+        with self._send_lock:
+            try:
+                connection.sendall(codec.encode(greeting))
+            except OSError:
+                return
+            self._connection_codecs[connection] = codec
+
+        while True:
+            try:
+                data = connection.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+
+            buffer.feed(data)
+            message = codec.decode(buffer)
+            while message is not None:
+                time.sleep(self.reply_delay)
+                with self._send_lock:
+                    if list(message.keys()) == ['codec']:
+                        codec = available_codecs()[message['codec']]()
+                        self._connection_codecs[connection] = codec
+                        self.codecs_used.append(message['codec'])
+                    elif message:
+                        self.status.update(message)
+                        self.message_queue.put(message)
+
+                    try:
+                        connection.sendall(codec.encode(self.status))
+                    except OSError:
+                        return
+                message = codec.decode(buffer)
+
+    def broadcast(self, update):
+        """Update the status and send it to every connected client."""
+        with self._send_lock:
+            self.status.update(update)
+            for connection, codec in self._connection_codecs.items():
+                try:
+                    connection.sendall(codec.encode(self.status))
+                except OSError:
+                    pass
+
+    def stop(self):
+        self._server.close()
+        for connection in self._connections:
+            connection.close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+class MockWireFactoryMixin:
+    """
+    A mix-in for test case classes that provides a method to create instances
+    of MockWireBoard in a temporary directory which is cleaned up afterwards.
+    """
+
+    def create_mock_wire_board(self, name='MOCK', **kwargs):
+        root_dir = tempfile.TemporaryDirectory(prefix="robot-api-test-")
+        self.addCleanup(root_dir.cleanup)
+        board = MockWireBoard(os.path.join(root_dir.name, name), **kwargs)
+        self.addCleanup(board.stop)
+        return board
@@ -0,0 +1,253 @@
+import asyncio
+import errno
+import time
+import unittest
+from unittest import mock
+
+from robot import COAST, PinMode
+from robot.aio import AsyncBoard, AsyncPowerBoard, AsyncRobot
+from robot.game import GameMode
+from robot.reconnect import ReconnectPolicy
+from tests.mock_robotd import MockRobotDFactoryMixin
+from tests.test_camera import CAMERA_SEES_MARKER
+
+
+class AsyncRobotTest(MockRobotDFactoryMixin, unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+
+        mock = self.create_mock_robotd()
+        self.power_board = mock.new_powerboard()
+        time.sleep(0.2)
+        self.mock = mock
+        self.robot = self.run_async(AsyncRobot.setup(
+            robotd_path=mock.root_dir,
+            wait_for_start_button=False,
+        ))
+        self.addCleanup(self.robot.close)
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_power_on_at_setup(self):
+        msg = self.power_board.message_queue.get()
+        self.assertEqual(msg['power'], True)
+
+    def test_insert_motorboards(self):
+        self.mock.new_motorboard('ABC')
+        self.mock.new_motorboard('DEF')
+        time.sleep(0.4)
+
+        boards = self.run_async(self.robot.motor_boards())
+
+        self.assertTrue(0 in boards)
+        self.assertTrue(1 in boards)
+        self.assertTrue('ABC' in boards)
+        self.assertTrue('DEF' in boards)
+
+    def test_slow_board_is_skipped(self):
+        self.mock.new_motorboard('FAST')
+        self.mock.new_motorboard('SLOW')
+        time.sleep(0.4)
+        original_connect = AsyncBoard._connect
+
+        async def connect(board):
+            if board.serial == 'SLOW':
+                raise asyncio.TimeoutError()
+            await original_connect(board)
+
+        with mock.patch.object(AsyncBoard, '_connect', connect):
+            boards = self.run_async(self.robot.motor_boards())
+
+        self.assertEqual(['FAST'], [x.serial for x in boards])
+
+    def test_failed_connection_closes_other_boards(self):
+        self.mock.new_motorboard('GOOD')
+        self.mock.new_motorboard('BAD')
+        time.sleep(0.4)
+        original_connect = AsyncBoard._connect
+        connected = []
+
+        async def connect(board):
+            if board.serial == 'BAD':
+                raise RuntimeError("Unexpected failure")
+            await original_connect(board)
+            connected.append(board)
+
+        with mock.patch.object(AsyncBoard, '_connect', connect):
+            with self.assertRaises(RuntimeError):
+                self.run_async(self.robot.motor_boards())
+
+        self.assertEqual(['GOOD'], [x.serial for x in connected])
+        self.assertIsNone(connected[0]._writer)
+        self.assertEqual([], self.robot.known_motor_boards)
+
+    def test_set_motors(self):
+        board = self.mock.new_motorboard()
+        time.sleep(0.2)
+        motor_board = self.run_async(self.robot.motor_board())
+
+        self.run_async(motor_board.set_m0(0.5))
+        self.assertEqual(board.message_queue.get(), {'m0': 0.5})
+        self.assertEqual(self.run_async(motor_board.get_m0()), 0.5)
+
+        self.run_async(motor_board.set_m1(COAST))
+        self.assertEqual(board.message_queue.get(), {'m1': 'coast'})
+        self.assertEqual(self.run_async(motor_board.get_m1()), COAST)
+
+        with self.assertRaises(ValueError):
+            self.run_async(motor_board.set_m0(1.5))
+
+    def test_concurrent_commands(self):
+        board = self.mock.new_motorboard()
+        time.sleep(0.2)
+        motor_board = self.run_async(self.robot.motor_board())
+
+        self.run_async(asyncio.gather(
+            motor_board.set_m0(1),
+            motor_board.set_m1(-1),
+            motor_board.get_m0(),
+        ))
+
+        messages = [board.message_queue.get(), board.message_queue.get()]
+        self.assertIn({'m0': 1}, messages)
+        self.assertIn({'m1': -1}, messages)
+
+    def test_set_servos_and_pins(self):
+        board = self.mock.new_servoboard()
+        time.sleep(0.2)
+        servo_board = self.run_async(self.robot.servo_board())
+
+        self.run_async(servo_board.set_servo_position(3, -1))
+        self.assertEqual(board.message_queue.get(), {'servos': {'3': -1}})
+        self.assertEqual(self.run_async(servo_board.get_servo_position(3)), -1)
+
+        self.run_async(servo_board.set_pin_mode(4, PinMode.OUTPUT_HIGH))
+        self.assertEqual(board.message_queue.get(), {'pins': {'4': 'H'}})
+        self.assertEqual(
+            self.run_async(servo_board.get_pin_mode(4)),
+            PinMode.OUTPUT_HIGH,
+        )
+
+        with self.assertRaises(ValueError):
+            self.run_async(servo_board.set_servo_position(3, 2))
+
+    def test_game_state(self):
+        self.mock.new_gamestate()
+        time.sleep(0.2)
+        self.assertEqual(self.run_async(self.robot.zone()), 0)
+        self.assertEqual(self.run_async(self.robot.mode()), GameMode.DEVELOPMENT)
+
+    def test_wait_start(self):
+        calls = []
+
+        async def on_start_signal():
+            calls.append(True)
+
+        board = self.run_async(AsyncPowerBoard.connect(
+            self.board_path(self.power_board),
+            on_start_signal=on_start_signal,
+        ))
+        self.addCleanup(board.close)
+        self.power_board.clear_queue()
+
+        self.run_async(board.wait_start())
+
+        msg = self.power_board.message_queue.get()
+        self.assertFalse(
+            msg['start-led'],
+            "Start LED should be off after wait_start returns",
+        )
+        self.assertEqual([True], calls)
+
+    def test_camera_stream(self):
+        self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        camera = self.run_async(self.robot.camera())
+
+        async def see_three_times():
+            stream = camera.stream()
+            results = []
+            async for tokens in stream:
+                results.append([x.id for x in tokens])
+                if len(results) == 3:
+                    break
+            await stream.aclose()
+            return results
+
+        self.assertEqual([[9]] * 3, self.run_async(see_three_times()))
+        tokens = self.run_async(camera.see())
+        self.assertEqual([9], [x.id for x in tokens])
+        self.assertEqual(camera.serial, tokens[0].camera)
+
+    def test_camera_stream_after_failure(self):
+        self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        camera = self.run_async(self.robot.camera())
+        original_see = camera.see
+        failures = []
+
+        async def see():
+            if not failures:
+                failures.append(True)
+                raise ConnectionError("Camera failed")
+            return await original_see()
+
+        camera.see = see
+
+        async def see_after_failure():
+            stream = camera.stream()
+            with self.assertRaises(ConnectionError):
+                await stream.__anext__()
+            tokens = await stream.__anext__()
+            await stream.aclose()
+            return [x.id for x in tokens]
+
+        self.assertEqual([9], self.run_async(see_after_failure()))
+
+
+class AsyncBoardRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+
+        self.board = AsyncBoard(
+            '/nonexistent/ABC',
+            reconnect_policy=ReconnectPolicy((0, 0)),
+        )
+        self.connects = 0
+
+        async def connect():
+            self.connects += 1
+
+        self.board._connect = connect
+
+    def with_retry(self, errors):
+        errors = list(errors)
+
+        async def handler():
+            if errors:
+                raise errors.pop(0)
+            return 'done'
+
+        return self.loop.run_until_complete(self.board._with_retry(handler))
+
+    def test_reconnects_after_connection_errors(self):
+        self.assertEqual(
+            'done',
+            self.with_retry([ConnectionResetError(), asyncio.TimeoutError()]),
+        )
+        self.assertEqual(2, self.connects)
+
+    def test_gives_up_after_backoffs(self):
+        with self.assertRaises(BrokenPipeError):
+            self.with_retry([BrokenPipeError()] * 3)
+        self.assertEqual(2, self.connects)
+
+    def test_other_errors_not_retried(self):
+        with self.assertRaises(PermissionError):
+            self.with_retry([PermissionError(errno.EACCES, "Permission denied")])
+        self.assertEqual(0, self.connects)
@@ -0,0 +1,381 @@
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+from robot import COAST, PinMode
+from robot.board import Board, LineBuffer
+from robot.robot import Robot
+from tests.mock_robotd import MockRobotDFactoryMixin
+from tests.mock_wire import MockWireFactoryMixin
+
+
+class BoardPipeliningTest(MockRobotDFactoryMixin, unittest.TestCase):
+    def setUp(self):
+        mock = self.create_mock_robotd()
+        mock.new_powerboard()
+        time.sleep(0.2)
+        self.mock = mock
+        self.robot = Robot(robotd_path=mock.root_dir, wait_for_start_button=False)
+
+    def test_submit_and_flush(self):
+        mock_motor = self.mock.new_motorboard()
+        time.sleep(0.2)
+        board = Board(self.board_path(mock_motor))
+
+        first = board.submit({'m0': 0.5})
+        second = board.submit({'m1': -0.5})
+
+        self.assertFalse(first.done(), "Response should not be read before flush")
+
+        board.flush()
+
+        self.assertEqual(mock_motor.message_queue.get(), {'m0': 0.5})
+        self.assertEqual(mock_motor.message_queue.get(), {'m1': -0.5})
+
+        self.assertEqual(first.result()['m0'], 0.5)
+        self.assertEqual(second.result()['m1'], -0.5)
+
+    def test_send_and_receive_flushes_pending(self):
+        mock_motor = self.mock.new_motorboard()
+        time.sleep(0.2)
+        board = Board(self.board_path(mock_motor))
+
+        pending = board.submit({'m0': 1})
+        status = board._send_and_receive({'m1': 1})
+
+        self.assertTrue(pending.done(), "Pending response should have been read")
+        self.assertEqual(pending.result()['m0'], 1)
+        self.assertEqual(status['m1'], 1)
+
+    def test_flush_without_pending(self):
+        mock_motor = self.mock.new_motorboard()
+        time.sleep(0.2)
+        board = Board(self.board_path(mock_motor))
+
+        board.flush()
+
+        self.assertEqual(board._send_and_receive({})['m0'], 0)
+
+
+class FlushTimeoutTest(MockWireFactoryMixin, unittest.TestCase):
+    def test_slow_response_stays_pending(self):
+        mock_board = self.create_mock_wire_board(status={'m0': 0}, reply_delay=0.3)
+        board = Board(mock_board.socket_path)
+        board.socket.settimeout(0.1)
+
+        future = board.submit({'m0': 1})
+        with self.assertRaises(socket.timeout):
+            board.flush()
+        self.assertFalse(future.done())
+
+        board.socket.settimeout(1)
+        board.flush()
+        self.assertEqual(1, future.result()['m0'])
+
+
+class LineBufferTest(unittest.TestCase):
+    def test_empty(self):
+        buffer = LineBuffer()
+        self.assertIsNone(buffer.next_line())
+        self.assertEqual(0, len(buffer))
+
+    def test_partial_line(self):
+        buffer = LineBuffer()
+        buffer.feed(b'{"a": ')
+        self.assertIsNone(buffer.next_line())
+        buffer.feed(b'1}')
+        self.assertIsNone(buffer.next_line())
+        buffer.feed(b'\n')
+        self.assertEqual('{"a": 1}', buffer.next_line())
+        self.assertEqual(0, len(buffer))
+
+    def test_several_lines_in_one_chunk(self):
+        buffer = LineBuffer()
+        buffer.feed(b'first\nsecond\nthi')
+        self.assertEqual('first', buffer.next_line())
+        self.assertEqual('second', buffer.next_line())
+        self.assertIsNone(buffer.next_line())
+        buffer.feed(b'rd\n')
+        self.assertEqual('third', buffer.next_line())
+        self.assertIsNone(buffer.next_line())
+
+    def test_empty_line(self):
+        buffer = LineBuffer()
+        buffer.feed(b'\nafter\n')
+        self.assertEqual('', buffer.next_line())
+        self.assertEqual('after', buffer.next_line())
+
+    def test_multibyte_characters(self):
+        buffer = LineBuffer()
+        data = '12° left\n'.encode('utf-8')
+        # split in the middle of the multi-byte character
+        buffer.feed(data[:3])
+        self.assertIsNone(buffer.next_line())
+        buffer.feed(data[3:])
+        self.assertEqual('12° left', buffer.next_line())
+
+
+class StatusCacheTest(MockRobotDFactoryMixin, unittest.TestCase):
+    def setUp(self):
+        mock = self.create_mock_robotd()
+        mock.new_powerboard()
+        time.sleep(0.2)
+        self.mock = mock
+        self.robot = Robot(robotd_path=mock.root_dir, wait_for_start_button=False)
+        self.mock.new_motorboard()
+        time.sleep(0.2)
+        self.board = self.robot.motor_board
+
+    def count_sends(self):
+        return mock.patch.object(self.board, '_send', wraps=self.board._send)
+
+    def test_reads_after_write_use_cached_status(self):
+        self.board.m0 = 0.5
+
+        with self.count_sends() as send:
+            self.assertEqual(0.5, self.board.m0)
+            self.assertEqual(COAST, self.board.m1)
+
+        self.assertEqual(0, send.call_count)
+
+    def test_stale_status_is_refreshed_once(self):
+        self.board.status_max_age = 0.1
+        time.sleep(0.2)
+
+        with self.count_sends() as send:
+            self.board.m0
+            self.board.m1
+
+        self.assertEqual(1, send.call_count)
+
+    def test_cache_disabled(self):
+        self.board.status_max_age = 0
+
+        with self.count_sends() as send:
+            self.board.m0
+            self.board.m1
+
+        self.assertEqual(2, send.call_count)
+
+    def test_status_refreshed_by_other_client(self):
+        other = Board(self.board.socket_path)
+        other._send_and_receive({'m0': -1})
+
+        self.board.status_max_age = 0.1
+        time.sleep(0.2)
+
+        self.assertEqual(-1, self.board.m0)
+
+
+class BatchTest(MockRobotDFactoryMixin, unittest.TestCase):
+    def setUp(self):
+        mock = self.create_mock_robotd()
+        mock.new_powerboard()
+        time.sleep(0.2)
+        self.mock = mock
+        self.robot = Robot(robotd_path=mock.root_dir, wait_for_start_button=False)
+
+    def assertNoMoreMessages(self, mock_board):
+        time.sleep(0.2)
+        self.assertTrue(mock_board.message_queue.empty(), "Unexpected messages sent")
+
+    def test_motor_writes_are_merged(self):
+        mock_motor = self.mock.new_motorboard()
+        time.sleep(0.2)
+        board = self.robot.motor_board
+
+        with board.batch():
+            board.m0 = 0.5
+            board.m1 = -0.5
+            self.assertNoMoreMessages(mock_motor)
+
+        self.assertEqual({'m0': 0.5, 'm1': -0.5}, mock_motor.message_queue.get())
+        self.assertNoMoreMessages(mock_motor)
+
+        self.assertEqual(0.5, board.m0)
+        self.assertEqual(-0.5, board.m1)
+
+    def test_repeated_writes_are_kept_in_order(self):
+        mock_motor = self.mock.new_motorboard()
+        time.sleep(0.2)
+        board = self.robot.motor_board
+
+        with board.batch():
+            board.m0 = 1
+            board.m1 = 1
+            board.m0 = -1
+
+        self.assertEqual({'m0': 1, 'm1': 1}, mock_motor.message_queue.get())
+        self.assertEqual({'m0': -1}, mock_motor.message_queue.get())
+        self.assertEqual(-1, board.m0)
+
+    def test_nested_batches(self):
+        mock_motor = self.mock.new_motorboard()
+        time.sleep(0.2)
+        board = self.robot.motor_board
+
+        with board.batch():
+            board.m0 = 1
+            with board.batch():
+                board.m1 = 1
+            self.assertNoMoreMessages(mock_motor)
+
+        self.assertEqual({'m0': 1, 'm1': 1}, mock_motor.message_queue.get())
+
+    def test_exception_discards_writes(self):
+        mock_motor = self.mock.new_motorboard()
+        time.sleep(0.2)
+        board = self.robot.motor_board
+
+        with self.assertRaises(ValueError):
+            with board.batch():
+                board.m0 = 1
+                board.m1 = 2
+
+        self.assertNoMoreMessages(mock_motor)
+
+        board.m0 = 0.5
+        self.assertEqual({'m0': 0.5}, mock_motor.message_queue.get())
+
+    def test_servo_and_pin_writes_are_merged(self):
+        mock_servo = self.mock.new_servoboard()
+        time.sleep(0.2)
+        board = self.robot.servo_board
+
+        with board.batch():
+            board.servos[0].position = 0.5
+            board.servos[3].position = -1
+            board.gpios[4].mode = PinMode.OUTPUT_HIGH
+
+        self.assertEqual(
+            {'servos': {'0': 0.5, '3': -1}, 'pins': {'4': 'H'}},
+            mock_servo.message_queue.get(),
+        )
+        self.assertNoMoreMessages(mock_servo)
+
+    def test_set_positions(self):
+        mock_servo = self.mock.new_servoboard()
+        time.sleep(0.2)
+        board = self.robot.servo_board
+
+        board.set_positions({0: 0.5, 3: -1})
+
+        self.assertEqual(
+            {'servos': {'0': 0.5, '3': -1}},
+            mock_servo.message_queue.get(),
+        )
+        self.assertEqual(0.5, board.servos[0].position)
+        self.assertEqual(-1, board.servos[3].position)
+
+    def test_set_positions_validation(self):
+        mock_servo = self.mock.new_servoboard()
+        time.sleep(0.2)
+        board = self.robot.servo_board
+
+        with self.assertRaises(ValueError):
+            board.set_positions({0: 0.5, 3: -1.5})
+
+        with self.assertRaises(ValueError):
+            board.set_positions({16: 0})
+
+        self.assertNoMoreMessages(mock_servo)
+
+
+class StreamingTest(MockWireFactoryMixin, unittest.TestCase):
+    def setUp(self):
+        self.mock = self.create_mock_wire_board(
+            status={'start-button': False, 'pins': {'4': 'L'}},
+        )
+        self.board = Board(self.mock.socket_path)
+        self.addCleanup(self.board.close)
+
+    def broadcast_later(self, update, delay=0.2):
+        timer = threading.Timer(delay, self.mock.broadcast, args=(update,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+    def test_commands_while_streaming(self):
+        self.board.start_streaming()
+        self.assertTrue(self.board.streaming)
+
+        status = self.board._send_and_receive({'start-led': True})
+        self.assertEqual(True, status['start-led'])
+
+        first = self.board.submit({'m0': 1})
+        second = self.board.submit({'m1': 1})
+        self.board.flush()
+        self.assertEqual(1, first.result()['m0'])
+        self.assertEqual(1, second.result()['m1'])
+
+    def test_broadcasts_are_recorded(self):
+        statuses = []
+        self.board.add_status_callback(statuses.append)
+        self.board.start_streaming()
+
+        self.mock.broadcast({'start-button': True})
+        time.sleep(0.2)
+
+        self.assertTrue(self.board.latest_status['start-button'])
+        self.assertEqual([True], [x['start-button'] for x in statuses])
+
+        # Broadcasts mustn't be mistaken for responses
+        status = self.board._send_and_receive({'start-led': True})
+        self.assertEqual(True, status['start-led'])
+
+    def test_remove_status_callback(self):
+        statuses = []
+        self.board.add_status_callback(statuses.append)
+        self.board.remove_status_callback(statuses.append)
+        self.board.start_streaming()
+
+        self.mock.broadcast({'start-button': True})
+        time.sleep(0.2)
+
+        self.assertEqual([], statuses)
+
+    def test_wait_for_status_wakes_on_broadcast(self):
+        self.board.start_streaming()
+        self.broadcast_later({'pins': {'4': 'H'}})
+
+        with mock.patch.object(self.board, '_send', wraps=self.board._send) as send:
+            status = self.board.wait_for_status(
+                lambda x: x['pins']['4'] == 'H',
+                timeout=2,
+            )
+
+        self.assertEqual('H', status['pins']['4'])
+        self.assertLess(
+            send.call_count,
+            0.2 / Board.STATUS_POLL_INTERVAL_SECS,
+            "Should only poll when nothing has been pushed",
+        )
+
+    def test_wait_for_status_polls_without_streaming(self):
+        self.broadcast_later({'start-button': True})
+
+        status = self.board.wait_for_status(
+            lambda x: x['start-button'],
+            timeout=2,
+        )
+
+        self.assertTrue(status['start-button'])
+
+    def test_wait_for_status_timeout(self):
+        for streaming in (False, True):
+            if streaming:
+                self.board.start_streaming()
+
+            start = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                self.board.wait_for_status(lambda x: x['start-button'], timeout=0.3)
+            self.assertLess(time.monotonic() - start, 1)
+
+    def test_stop_streaming(self):
+        self.board.start_streaming()
+        self.board.stop_streaming()
+        self.assertFalse(self.board.streaming)
+
+        status = self.board._send_and_receive({'start-led': False})
+        self.assertEqual(False, status['start-led'])
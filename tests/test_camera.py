@@ -1,12 +1,16 @@
 import os
+import socket
+import tempfile
 import time
 import unittest
 
-from robot.camera import ResultList
-from robot.markers import CartCoord, PolarCoord, SphericalCoord
+from robot.camera import Camera, CameraGroup, ResultList
+from robot.game_specific import COLUMN_N, COLUMN_S, TOKEN, WALL
+from robot.markers import CartCoord, Marker, PolarCoord, SphericalCoord
 from robot.robot import Robot
 from sb_vision.camera import FileCamera
 from tests.mock_robotd import MockRobotDFactoryMixin
+from tests.mock_wire import MockWireBoard
 
 IMAGE_ROOT = os.path.dirname(os.path.realpath(__file__)) + "/test_data/"
 IMAGE_WITH_NO_MARKER = IMAGE_ROOT + 'photo_empty.jpg'
@@ -15,6 +19,25 @@ IMAGE_WITH_MARKER = IMAGE_ROOT + 'photo_1.jpg'
 CAMERA_SEES_NO_MARKER = FileCamera(IMAGE_WITH_NO_MARKER, 'c270')
 CAMERA_SEES_MARKER = FileCamera(IMAGE_WITH_MARKER, 'c270')
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def make_marker_data(marker_id, distance, bearing=0.2):
+    return {
+        'id': marker_id,
+        'pixel_corners': [[1, 2], [3, 2], [3, 4], [1, 4]],
+        'pixel_centre': [2, 3],
+        'cartesian': [0.5, 0.1, distance],
+        'spherical': [0.1, bearing, distance],
+    }
+
+
+def make_marker(marker_id, distance):
+    return Marker(make_marker_data(marker_id, distance))
+
 
 class CameraTest(MockRobotDFactoryMixin, unittest.TestCase):
     """
@@ -86,6 +109,137 @@ class CameraTest(MockRobotDFactoryMixin, unittest.TestCase):
             "Invalid polar coordinates",
         )
 
+    def test_stream(self):
+        self.camera = self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        camera = self.robot.cameras[0]
+
+        stream = camera.stream()
+        for _ in range(3):
+            tokens = next(stream)
+            self.assertEqual([9], [x.id for x in tokens])
+
+        # The image being processed in advance doesn't get in the way
+        stream.close()
+        self.assertFalse(camera._pending)
+        self.assertEqual([9], [x.id for x in camera.see()])
+
+    def test_see_waits_for_streamed_image(self):
+        self.camera = self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        camera = self.robot.cameras[0]
+
+        stream = camera.stream()
+        next(stream)
+        # The stream has requested the next image, which see has to wait for
+        # before its own
+        self.assertEqual([9], [x.id for x in camera.see()])
+        self.assertFalse(camera._pending)
+
+    def test_latest(self):
+        self.camera = self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        camera = self.robot.cameras[0]
+
+        self.assertIsNone(camera.latest())
+
+        camera.start_capturing()
+        self.addCleanup(camera.stop_capturing)
+        self.assertTrue(camera.capturing)
+
+        deadline = time.monotonic() + 5
+        while camera.latest() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        start_time = time.monotonic()
+        capture = camera.latest(max_age=5)
+        self.assertLess(time.monotonic() - start_time, 0.01)
+        self.assertEqual([9], [x.id for x in capture.markers])
+
+        # The camera can still be used while capturing
+        self.assertEqual([9], [x.id for x in camera.see()])
+
+    def test_latest_max_age(self):
+        self.camera = self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        camera = self.robot.cameras[0]
+
+        camera.start_capturing()
+        deadline = time.monotonic() + 5
+        while camera.latest() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        camera.stop_capturing()
+        self.assertFalse(camera.capturing)
+
+        time.sleep(0.2)
+        self.assertIsNone(camera.latest(max_age=0.1))
+        self.assertIsNotNone(camera.latest())
+
+    def test_capture_survives_errors(self):
+        self.camera = self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        failures = []
+
+        class FlakyCamera(Camera):
+            CAPTURE_RETRY_SECS = 0.01
+
+            def see(self, *args, **kwargs):
+                if not failures:
+                    failures.append(self)
+                    raise RuntimeError("Unexpected failure")
+                return super().see(*args, **kwargs)
+
+        camera = FlakyCamera(self.robot.cameras[0].socket_path)
+        self.addCleanup(camera.close)
+
+        with self.assertLogs('robot.camera', 'WARNING'):
+            camera.start_capturing()
+            deadline = time.monotonic() + 5
+            while camera.latest() is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertTrue(camera.capturing)
+        self.assertEqual([9], [x.id for x in camera.latest().markers])
+        # The capturing connection is the same type of camera
+        self.assertIsInstance(failures[0], FlakyCamera)
+        self.assertIsNot(camera, failures[0])
+
+    def test_see_all(self):
+        self.mock.new_camera(CAMERA_SEES_NO_MARKER, 'ABC')
+        self.mock.new_camera(CAMERA_SEES_MARKER, 'DEF')
+        time.sleep(0.4)
+
+        markers = self.robot.see_all()
+
+        self.assertEqual([9], [x.id for x in markers])
+        self.assertEqual('DEF', markers[0].camera)
+
+    def test_see_all_merges_markers(self):
+        self.mock.new_camera(CAMERA_SEES_MARKER, 'ABC')
+        self.mock.new_camera(CAMERA_SEES_MARKER, 'DEF')
+        time.sleep(0.4)
+
+        group = CameraGroup(self.robot.cameras)
+        each = group.see_each()
+
+        self.assertEqual({'ABC', 'DEF'}, set(each))
+        self.assertEqual('ABC', each['ABC'][0].camera)
+        self.assertEqual([9], [x.id for x in group.see()])
+
+    def test_see_limit(self):
+        self.camera = self.mock.new_camera(CAMERA_SEES_MARKER)
+        time.sleep(0.2)
+        camera = self.robot.cameras[0]
+
+        self.assertEqual([9], [x.id for x in camera.see(limit=1, sort='bearing')])
+        self.assertEqual([], camera.see(limit=0))
+
+        with self.assertRaises(ValueError):
+            camera.see(sort='size')
+        for limit in (-1, 1.5, '3', True):
+            with self.assertRaises(ValueError):
+                camera.see(limit=limit)
+
     def test_unique_error(self):
         self.camera = self.mock.new_camera(CAMERA_SEES_NO_MARKER)
         time.sleep(0.2)
@@ -213,3 +367,174 @@ class ResultListTest(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             rl["spam"]
+
+
+class SeeToResultsTest(unittest.TestCase):
+    def setUp(self):
+        self.data = {'markers': [
+            make_marker_data(1, distance=2, bearing=0.1),
+            make_marker_data(2, distance=0.5, bearing=-0.3),
+            make_marker_data(3, distance=3, bearing=-0.05),
+            make_marker_data(4, distance=1, bearing=0.2),
+        ]}
+
+    def assertIds(self, expected, markers):
+        self.assertIsInstance(markers, ResultList)
+        self.assertEqual(expected, [x.id for x in markers])
+
+    def test_sorted_by_distance(self):
+        self.assertIds([2, 4, 1, 3], Camera._see_to_results(self.data))
+
+    def test_sorted_by_bearing(self):
+        self.assertIds(
+            [3, 1, 4, 2],
+            Camera._see_to_results(self.data, sort='bearing'),
+        )
+
+    def test_unsorted(self):
+        self.assertIds([1, 2, 3, 4], Camera._see_to_results(self.data, sort=False))
+
+    def test_limit(self):
+        self.assertIds([2, 4], Camera._see_to_results(self.data, limit=2))
+        self.assertIds(
+            [3],
+            Camera._see_to_results(self.data, limit=1, sort='bearing'),
+        )
+        self.assertIds(
+            [1, 2, 3],
+            Camera._see_to_results(self.data, limit=3, sort=False),
+        )
+        self.assertIds(
+            [2, 4, 1, 3],
+            Camera._see_to_results(self.data, limit=10),
+        )
+
+
+class ResultListLookupTest(unittest.TestCase):
+    def setUp(self):
+        self.rl = ResultList([
+            make_marker(45, 0.5),
+            make_marker(3, 1),
+            make_marker(50, 1.5),
+            make_marker(45, 2),
+            make_marker(29, 3),
+        ])
+
+    def assertIds(self, expected, markers):
+        self.assertIsInstance(markers, ResultList)
+        self.assertEqual(expected, [x.id for x in markers])
+
+    def test_by_id(self):
+        self.assertIds([3], self.rl.by_id(3))
+        self.assertEqual([0.5, 2], [x.distance_metres for x in self.rl.by_id(45)])
+        self.assertIds([], self.rl.by_id(12))
+
+    def test_of(self):
+        self.assertIds([3], self.rl.of(WALL))
+        self.assertIds([29], self.rl.of(COLUMN_N))
+        self.assertIds([45, 50, 45], self.rl.of(TOKEN))
+        self.assertIds([], self.rl.of(COLUMN_S))
+
+    def test_of_name(self):
+        self.assertIds([3], self.rl.of('WALL'))
+        self.assertIds([29], self.rl.of('COLUMN_N'))
+        self.assertIds([29], self.rl.of('COLUMN'))
+        self.assertIds([45, 50, 45], self.rl.of('TOKEN'))
+        self.assertIds([], self.rl.of('COLUMN_S'))
+        with self.assertRaises(KeyError):
+            self.rl.of('BALL')
+
+    def test_of_unknown_id(self):
+        rl = ResultList([make_marker(-1, 1), make_marker(3, 1), make_marker(1000, 1)])
+        self.assertIds([3], rl.of('WALL'))
+
+    def test_tokens(self):
+        self.assertIds([45, 50, 45], self.rl.tokens())
+        self.assertIds([45, 45], self.rl.tokens(0))
+        self.assertIds([50], self.rl.tokens(1))
+        self.assertIds([], self.rl.tokens(3))
+        self.assertIds([], self.rl.tokens(7))
+
+    def test_lookups_after_changes(self):
+        self.rl.by_id(3)
+        self.rl.sort(key=lambda x: -x.distance_metres)
+        self.assertEqual([0.5, 2], sorted(x.distance_metres for x in self.rl.by_id(45)))
+        self.assertIds([29], self.rl.of(COLUMN_N))
+
+        self.rl.pop()
+        self.assertIds([3], self.rl.by_id(3))
+        self.assertEqual(1, len(self.rl.by_id(45)))
+
+        self.rl.remove(self.rl.by_id(3)[0])
+        self.rl.insert(0, make_marker(50, 0.1))
+        self.rl += [make_marker(46, 5)]
+        self.rl[1] = make_marker(4, 1)
+        self.assertIds([50, 50], self.rl.tokens(1))
+        self.assertIds([4], self.rl.of(WALL))
+        self.assertIds([45, 46], self.rl.tokens(0))
+
+        del self.rl[:]
+        self.assertIds([], self.rl.tokens())
+
+    def test_empty(self):
+        self.assertIds([], ResultList([]).by_id(3))
+        self.assertIds([], ResultList([]).tokens(0))
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class ResultListArrayTest(unittest.TestCase):
+    def test_as_array(self):
+        rl = ResultList([make_marker(3, 0.5), make_marker(47, 2)])
+
+        array = rl.as_array()
+
+        self.assertEqual([3, 47], list(array['id']))
+        self.assertEqual([0.5, 2], list(array['spherical'][:, 2]))
+        self.assertEqual([0.5, 0.1, 2], list(array['cartesian'][1]))
+        self.assertEqual([2, 3], list(array['pixel_centre'][0]))
+        self.assertEqual((2, 4, 2), array['pixel_corners'].shape)
+        self.assertIs(array, rl.as_array())
+
+    def test_empty_as_array(self):
+        self.assertEqual(0, len(ResultList([]).as_array()))
+
+
+class CameraGroupFailureTest(unittest.TestCase):
+    def setUp(self):
+        root_dir = tempfile.TemporaryDirectory(prefix="robot-api-test-")
+        self.addCleanup(root_dir.cleanup)
+        self.root_dir = root_dir.name
+
+    def create_camera(self, serial, **kwargs):
+        board = MockWireBoard(
+            os.path.join(self.root_dir, serial),
+            status={'markers': []},
+            **kwargs,
+        )
+        self.addCleanup(board.stop)
+        camera = Camera(board.socket_path)
+        self.addCleanup(camera.close)
+        return camera
+
+    def test_slow_camera_is_left_out(self):
+        group = CameraGroup([
+            self.create_camera('FAST'),
+            self.create_camera('SLOW', reply_delay=1),
+        ])
+        group.SEE_TIMEOUT_SECS = 0.3
+
+        start_time = time.monotonic()
+        with self.assertLogs('robot.camera', 'WARNING'):
+            each = group.see_each()
+
+        # Bounded by the group's timeout, not the cameras' socket timeouts
+        self.assertLess(time.monotonic() - start_time, 0.8)
+        self.assertEqual({'FAST': []}, each)
+
+    def test_every_camera_failing(self):
+        group = CameraGroup([self.create_camera('SLOW', reply_delay=1)])
+        group.SEE_TIMEOUT_SECS = 0.3
+
+        with self.assertLogs('robot.camera', 'WARNING'):
+            with self.assertRaises(socket.timeout):
+                group.see()
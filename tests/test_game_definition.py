@@ -0,0 +1,134 @@
+import json
+import tempfile
+import unittest
+
+from robot import game_specific
+from robot.game_definition import GameDefinition, game_definition, load_game
+
+
+def make_definition(**changes):
+    data = {
+        'name': 'Test',
+        'game_duration_seconds': 60,
+        'default_marker_size': [0.2, 0.2],
+        'categories': [
+            {'name': 'WALL', 'first_id': 0, 'count': 4},
+            {
+                'name': 'BOX',
+                'first_id': 6,
+                'count': 4,
+                'size': [0.1, 0.1],
+                'faces': ['front', 'back', 'front', 'back'],
+                'positions': [[0, 1], [0, 1.5], [2, 1], [2, 1.5]],
+            },
+        ],
+        'groups': {'FIXED': ['WALL']},
+    }
+    data.update(changes)
+    return data
+
+
+class GameDefinitionTest(unittest.TestCase):
+    def test_lookups(self):
+        game = GameDefinition(make_definition())
+
+        self.assertEqual(10, game.marker_count)
+        self.assertEqual('WALL', game.category(3))
+        self.assertEqual('BOX', game.category(6))
+        self.assertIsNone(game.category(4))
+        self.assertIsNone(game.category(100))
+        self.assertIsNone(game.category(-1))
+
+        self.assertEqual((0.2, 0.2), game.size(0))
+        self.assertEqual((0.1, 0.1), game.size(9))
+        self.assertEqual((0.2, 0.2), game.size(100))
+
+        self.assertEqual('front', game.face(6))
+        self.assertEqual('back', game.face(7))
+        self.assertEqual('front', game.face(8))
+        self.assertIsNone(game.face(0))
+
+    def test_positions(self):
+        game = GameDefinition(make_definition())
+
+        self.assertEqual((2, 1.5), game.position(9))
+        self.assertIsNone(game.position(0))
+        self.assertIsNone(game.position(100))
+        self.assertEqual(
+            {6: (0, 1), 7: (0, 1.5), 8: (2, 1), 9: (2, 1.5)},
+            game.marker_positions(),
+        )
+
+    def test_category_indices(self):
+        game = GameDefinition(make_definition())
+
+        self.assertEqual({1}, game.category_indices('BOX'))
+        self.assertEqual({0}, game.category_indices('FIXED'))
+        self.assertEqual(1, game.categories[7])
+        with self.assertRaises(KeyError):
+            game.category_indices('TOKEN')
+
+    def test_ids(self):
+        game = GameDefinition(make_definition())
+
+        self.assertEqual({6, 7, 8, 9}, game.ids('BOX'))
+        self.assertEqual({0, 1, 2, 3}, game.ids('FIXED'))
+        self.assertEqual({7, 9}, game.facing('back'))
+        self.assertEqual(frozenset(), game.facing('top'))
+        with self.assertRaises(KeyError):
+            game.ids('TOKEN')
+
+    def test_overlapping_categories(self):
+        categories = [
+            {'name': 'WALL', 'first_id': 0, 'count': 4},
+            {'name': 'TOKEN', 'first_id': 3, 'count': 4},
+        ]
+        with self.assertRaises(ValueError):
+            GameDefinition(make_definition(categories=categories))
+
+    def test_face_for_each_marker(self):
+        categories = [
+            {'name': 'BOX', 'first_id': 0, 'count': 4, 'faces': ['front', 'back']},
+        ]
+        with self.assertRaises(ValueError):
+            GameDefinition(make_definition(categories=categories))
+
+    def test_position_for_each_marker(self):
+        categories = [
+            {'name': 'WALL', 'first_id': 0, 'count': 2, 'positions': [[0, 1]]},
+        ]
+        with self.assertRaises(ValueError):
+            GameDefinition(make_definition(categories=categories))
+
+    def test_unknown_group_member(self):
+        with self.assertRaises(ValueError):
+            GameDefinition(make_definition(groups={'ALL': ['WALL', 'TOKEN']}))
+
+    def test_load(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+            json.dump(make_definition(), file)
+            file.flush()
+
+            game = load_game(file.name)
+
+        self.assertEqual('Test', game.name)
+        self.assertEqual(60, game.game_duration_seconds)
+
+    def test_cached(self):
+        self.assertIs(game_definition(), game_definition())
+
+
+class GameSpecificTest(unittest.TestCase):
+    def test_matches_definition(self):
+        self.assertEqual(set(range(0, 28)), game_specific.WALL)
+        self.assertEqual(set(range(28, 44)), game_specific.COLUMN)
+        self.assertEqual(set(range(44, 64)), game_specific.TOKEN)
+        self.assertEqual(set(range(49, 54)), game_specific.TOKEN_ZONE_1)
+        self.assertEqual(set(range(29, 44, 4)), game_specific.COLUMN_FACING_E)
+        self.assertEqual(34, game_specific.COLUMN_E_FACING_S)
+        self.assertEqual(120, game_specific.GAME_DURATION_SECONDS)
+        self.assertEqual((0.1, 0.1), game_specific.MARKER_SIZES[50])
+        self.assertEqual((0.25, 0.25), game_specific.MARKER_SIZES[3])
+        self.assertEqual(64, len(game_specific.MARKER_SIZES))
+        # The arena layout hasn't been checked against the rules yet
+        self.assertEqual({}, game_specific.MARKER_POSITIONS)
@@ -0,0 +1,188 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from robot.board import Board
+from robot.instrumentation import (
+    CommandEvent,
+    Instrumentation,
+    JsonLinesSink,
+    LatencyHistogram,
+    RingBufferSink,
+    command_name,
+)
+from robot.motor import MotorBoard
+from robot.reconnect import ReconnectPolicy
+from tests.mock_wire import MockWireFactoryMixin
+
+
+class CommandNameTest(unittest.TestCase):
+    def test_status(self):
+        self.assertEqual('status', command_name({}))
+
+    def test_keys_are_sorted(self):
+        self.assertEqual('m0,m1', command_name({'m1': 0, 'm0': 0}))
+
+    def test_direct_command(self):
+        self.assertEqual('command:ping', command_name({'command': ('ping', 1)}))
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(0, histogram.count)
+        self.assertEqual(0, histogram.mean_seconds)
+        self.assertEqual(0, histogram.percentile(50))
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.add(0.001)
+        for _ in range(10):
+            histogram.add(0.1)
+
+        self.assertEqual(100, histogram.count)
+        self.assertAlmostEqual(0.0109, histogram.mean_seconds)
+        # Accurate to within a factor of two
+        self.assertLessEqual(0.001, histogram.percentile(50))
+        self.assertGreater(0.002, histogram.percentile(50))
+        self.assertEqual(0.1, histogram.percentile(99))
+
+    def test_larger_than_all_buckets(self):
+        histogram = LatencyHistogram()
+        histogram.add(1000)
+        self.assertEqual(1000, histogram.percentile(50))
+
+    def test_merge(self):
+        first = LatencyHistogram()
+        first.add(0.001)
+        second = LatencyHistogram()
+        second.add(0.1)
+
+        first.merge(second)
+
+        self.assertEqual(2, first.count)
+        self.assertEqual(0.001, first.min_seconds)
+        self.assertEqual(0.1, first.max_seconds)
+
+
+class InstrumentationTest(MockWireFactoryMixin, unittest.TestCase):
+    def setUp(self):
+        self.mock = self.create_mock_wire_board(status={'m0': 0, 'm1': 0})
+        self.recent = RingBufferSink(10)
+        self.instrumentation = Instrumentation(sinks=[self.recent])
+
+        self.board = MotorBoard(
+            self.mock.socket_path,
+            instrumentation=self.instrumentation,
+        )
+        self.addCleanup(self.board.close)
+        self.serial = self.board.serial
+
+    def test_commands_are_recorded(self):
+        self.board.m0 = 0.5
+        self.board.m1 = 0.5
+        self.board.m1 = -0.5
+
+        events = self.recent.events()
+        self.assertEqual(['m0', 'm1', 'm1'], [x.command for x in events])
+        for event in events:
+            self.assertEqual('MotorBoard', event.board)
+            self.assertEqual(self.serial, event.serial)
+            self.assertGreater(event.seconds, 0)
+            self.assertGreater(event.bytes_sent, 0)
+            self.assertGreater(event.bytes_received, 0)
+            self.assertIsNone(event.error)
+
+        self.assertEqual(2, self.instrumentation.histogram(command='m1').count)
+        self.assertEqual(3, self.instrumentation.histogram(board='MotorBoard').count)
+        self.assertEqual(0, self.instrumentation.histogram(board='Camera').count)
+
+        stats = self.instrumentation.stats()[('MotorBoard', self.serial, 'm1')]
+        self.assertEqual(2, stats.latency.count)
+
+    def test_ring_buffer_keeps_latest(self):
+        for _ in range(15):
+            self.board._send_and_receive({})
+        self.assertEqual(10, len(self.recent))
+
+    def test_pipelined_commands_recorded_together(self):
+        self.board.submit({'m0': 0.5})
+        self.board.submit({'m1': 0.5})
+        self.board.flush()
+
+        self.assertEqual(['flush'], [x.command for x in self.recent.events()])
+
+    def test_errors_are_recorded(self):
+        self.board.reconnect_policy = ReconnectPolicy(backoffs=())
+        self.mock.stop()
+
+        with self.assertRaises(ConnectionError):
+            self.board._send_and_receive({})
+
+        self.assertIsNotNone(self.recent.events()[-1].error)
+        stats = self.instrumentation.stats()[('MotorBoard', self.serial, 'status')]
+        self.assertEqual(1, stats.errors)
+
+    def test_failing_sink_is_ignored(self):
+        def failing_sink(event):
+            raise ValueError("Oops")
+
+        self.instrumentation.sinks.append(failing_sink)
+
+        with self.assertLogs('robot.instrumentation'):
+            self.board.m0 = 0.5
+
+        self.assertEqual(1, len(self.recent))
+
+    def test_callback_sink(self):
+        events = []
+        self.instrumentation.sinks.append(events.append)
+
+        self.board.m0 = 0.5
+
+        self.assertEqual(self.recent.events(), events)
+
+    def test_not_recorded_by_default(self):
+        board = Board(self.mock.socket_path)
+        self.addCleanup(board.close)
+        self.assertIsNone(board.instrumentation)
+        board._send_and_receive({})
+
+
+EVENT = CommandEvent(
+    timestamp=1.5,
+    board='MotorBoard',
+    serial='ABC',
+    command='m0',
+    seconds=0.001,
+    bytes_sent=10,
+    bytes_received=20,
+    retries=0,
+    reconnects=0,
+    error=None,
+)
+
+
+class JsonLinesSinkTest(unittest.TestCase):
+    def test_file_object(self):
+        file = io.StringIO()
+        JsonLinesSink(file)(EVENT)
+
+        self.assertEqual(EVENT._asdict(), json.loads(file.getvalue()))
+
+    def test_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.jsonl')
+            sink = JsonLinesSink(path)
+            sink(EVENT)
+            sink(EVENT)
+            sink.close()
+
+            with open(path) as file:
+                lines = [json.loads(x) for x in file]
+
+        self.assertEqual(2, len(lines))
+        self.assertEqual('m0', lines[0]['command'])
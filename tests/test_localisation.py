@@ -0,0 +1,103 @@
+import math
+import unittest
+
+from robot.localisation import locate
+from robot.markers import Marker
+
+# A made up arena: markers on each wall of a 6m square, and one column
+POSITIONS = {
+    0: (-1.5, 3),
+    1: (-0.5, 3),
+    2: (0.5, 3),
+    3: (1.5, 3),
+    4: (3, 1),
+    5: (3, -1),
+    6: (-3, 1),
+    7: (-3, -1),
+    8: (-1, -3),
+    9: (0, -3),
+    10: (1, -3),
+    11: (2, -3),
+    20: (0, 1.8),
+}
+
+
+def seen_from(x, y, heading, marker_ids, offset=(0, 0)):
+    """Build the markers seen by a robot at a pose."""
+    markers = []
+    for marker_id in marker_ids:
+        marker_x, marker_y = POSITIONS.get(marker_id, (0, 0))
+        dx = marker_x - x
+        dy = marker_y - y
+        forwards = dx * math.cos(heading) + dy * math.sin(heading)
+        left = dy * math.cos(heading) - dx * math.sin(heading)
+        markers.append(Marker({
+            'id': marker_id,
+            'cartesian': [-left + offset[0], 0.3, forwards + offset[1]],
+        }))
+    return markers
+
+
+class LocateTest(unittest.TestCase):
+    def assertPose(self, expected, pose):
+        self.assertAlmostEqual(expected[0], pose.x)
+        self.assertAlmostEqual(expected[1], pose.y)
+        self.assertAlmostEqual(expected[2], pose.heading_radians)
+
+    def test_facing_north(self):
+        pose = locate(seen_from(1, -2, math.pi / 2, [0, 1, 2, 3]), POSITIONS)
+
+        self.assertPose((1, -2, math.pi / 2), pose)
+        self.assertAlmostEqual(90, pose.heading_degrees)
+        self.assertAlmostEqual(0, pose.error_metres)
+        self.assertEqual(4, pose.markers)
+
+    def test_two_walls(self):
+        pose = locate(seen_from(-1.5, 0.5, -0.5, [4, 5, 9, 10]), POSITIONS)
+
+        self.assertPose((-1.5, 0.5, -0.5), pose)
+
+    def test_column(self):
+        pose = locate(seen_from(0, 0, math.pi / 2, [20, 2, 4]), POSITIONS)
+
+        self.assertPose((0, 0, math.pi / 2), pose)
+
+    def test_ignores_unknown_markers(self):
+        pose = locate(seen_from(1, 1, 0.3, [4, 5, 50, 51, 52]), POSITIONS)
+
+        self.assertPose((1, 1, 0.3), pose)
+        self.assertEqual(2, pose.markers)
+
+    def test_too_few_markers(self):
+        self.assertIsNone(locate([], POSITIONS))
+        self.assertIsNone(locate(seen_from(0, 0, 0, [4]), POSITIONS))
+        self.assertIsNone(locate(seen_from(0, 0, 0, [4, 50]), POSITIONS))
+
+    def test_offset(self):
+        # Every marker seen 10cm further away than it really is
+        markers = seen_from(0, 0, 0, [4, 5, 8, 11], offset=(0, 0.1))
+
+        pose = locate(markers, POSITIONS)
+
+        self.assertPose((-0.1, 0, 0), pose)
+        self.assertAlmostEqual(0, pose.error_metres)
+
+    def test_error(self):
+        markers = seen_from(0, 0, 0, [4, 5, 8, 11])
+        # Marker 9 is behind and to the right, not straight ahead
+        markers.append(Marker({'id': 9, 'cartesian': [0, 0, 3]}))
+
+        pose = locate(markers, POSITIONS)
+
+        self.assertGreater(pose.error_metres, 0.1)
+
+    def test_other_positions(self):
+        positions = {1: (0, 1), 2: (1, 0)}
+        markers = [
+            Marker({'id': 1, 'cartesian': [0, 0, 1]}),
+            Marker({'id': 2, 'cartesian': [1, 0, 0]}),
+        ]
+
+        pose = locate(markers, positions)
+
+        self.assertPose((0, 0, math.pi / 2), pose)
@@ -53,3 +53,28 @@ class MarkerTest(unittest.TestCase):
             str(Marker(data)),
             "<Marker 13: 12° right, 0.12m away>",
         )
+
+    def test_fields_parsed_once(self):
+        marker = Marker({
+            'id': 13,
+            'pixel_corners': [[1, 2], [3, 4]],
+            'cartesian': [0.1, 0.2, 0.3],
+            'spherical': [0, 0.2, 0.12],
+        })
+
+        self.assertIs(marker.spherical, marker.spherical)
+        self.assertIs(marker.cartesian, marker.cartesian)
+        self.assertEqual(0.12, marker.distance_metres)
+
+    def test_pixel_corners_copied(self):
+        marker = Marker({'id': 13, 'pixel_corners': [[1, 2], [3, 4]]})
+
+        marker.pixel_corners.append((5, 6))
+
+        self.assertEqual([(1, 2), (3, 4)], marker.pixel_corners)
+
+    def test_distance_without_spherical_parsed(self):
+        marker = Marker({'id': 13, 'spherical': [0, 0.2, 0.12]})
+
+        self.assertEqual(0.12, marker.distance_metres)
+        self.assertEqual(0.12, marker.spherical.distance_metres)
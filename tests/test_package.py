@@ -0,0 +1,45 @@
+import subprocess
+import sys
+import unittest
+
+import robot
+from robot.robot import Robot
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_import_is_lazy(self):
+        modules = subprocess.check_output([
+            sys.executable,
+            '-c',
+            'import sys, robot; print(" ".join(sys.modules))',
+        ]).decode().split()
+
+        self.assertIn('robot', modules)
+        self.assertNotIn('robot.robot', modules)
+        self.assertNotIn('robot.camera', modules)
+
+    def test_attributes(self):
+        self.assertIs(Robot, robot.Robot)
+        self.assertEqual(set(range(0, 28)), robot.WALL)
+        self.assertIn('Robot', dir(robot))
+
+    def test_all(self):
+        for name in robot.__all__:
+            self.assertTrue(hasattr(robot, name), name)
+
+    def test_submodules(self):
+        output = subprocess.check_output([
+            sys.executable,
+            '-c',
+            'import robot; print(robot.camera.Camera.__name__, '
+            'robot.board.Board.__name__, robot.servo.PinMode.__name__, '
+            'robot.markers.Marker.__name__, len(robot.game_specific.WALL))',
+        ]).decode().split()
+
+        self.assertEqual(['Camera', 'Board', 'PinMode', 'Marker', '28'], output)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            robot.NOT_A_THING
+        with self.assertRaises(AttributeError):
+            robot.not_a_module
@@ -1,7 +1,9 @@
+import threading
 import time
 import unittest
 from unittest import mock
 
+from robot.board import Board
 from robot.power import PowerBoard, PowerOutput
 from robot.robot import Robot
 from tests.mock_robotd import MockRobotDFactoryMixin
@@ -64,6 +66,56 @@ class PowerBoardTest(MockRobotDFactoryMixin, unittest.TestCase):
         # Check that our callable was called
         mock_callable.assert_called_once_with()
 
+    def test_wait_start_does_not_busy_loop(self):
+        button = Board(self.board_path(self.power_board))
+        button._send_and_receive({'start-button': False})
+        board = PowerBoard(self.board_path(self.power_board))
+
+        timer = threading.Timer(
+            0.5,
+            button._send_and_receive,
+            args=({'start-button': True},),
+        )
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        board.wait_start()
+
+        stats = board.last_wait_start_stats
+        self.assertGreaterEqual(stats.wall_seconds, 0.4)
+        # At most one status request per poll interval and one LED toggle
+        # per blink, rather than as many requests as the loop can manage
+        polls = stats.wall_seconds / board.STATUS_POLL_INTERVAL_SECS
+        blinks = stats.wall_seconds / board.START_LED_BLINK_SECS
+        max_messages = polls + blinks + 5
+        self.assertLessEqual(stats.messages_sent, max_messages)
+        self.assertLess(stats.cpu_seconds, stats.wall_seconds / 2)
+        self.assertFalse(board.streaming)
+
+    def test_wait_start_timeout(self):
+        mock_callable = mock.Mock()
+        board = PowerBoard(
+            self.board_path(self.power_board),
+            on_start_signal=mock_callable,
+        )
+        board._send_and_receive({'start-button': False})
+        self.power_board.clear_queue()
+
+        with self.assertRaises(TimeoutError):
+            board.wait_start(timeout=0.3)
+
+        self.assertGreaterEqual(board.last_wait_start_stats.wall_seconds, 0.3)
+        mock_callable.assert_not_called()
+
+        messages = []
+        while not self.power_board.message_queue.empty():
+            messages.append(self.power_board.message_queue.get())
+        self.assertEqual(
+            {'start-led': False},
+            messages[-1],
+            "Start LED should be off after wait_start times out",
+        )
+
     def test_insert_power(self):
         # TODO: Make this generic for all boards, instead of duplicated logic
         self.mock.new_powerboard('ABC')
@@ -0,0 +1,143 @@
+import errno
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+from robot.board import Board
+from robot.reconnect import CircuitState, ReconnectPolicy
+from tests.mock_wire import MockWireBoard
+
+
+class ReconnectPolicyTest(unittest.TestCase):
+    def test_delays_without_jitter(self):
+        policy = ReconnectPolicy((0.1, 0.5))
+        self.assertEqual([0.1, 0.5], list(policy.delays()))
+
+    def test_delays_with_jitter(self):
+        policy = ReconnectPolicy((1, 2, 3) * 10, jitter=0.5)
+        delays = list(policy.delays())
+
+        for backoff, delay in zip(policy.backoffs, delays):
+            self.assertGreaterEqual(delay, backoff * 0.5)
+            self.assertLessEqual(delay, backoff * 1.5)
+
+        self.assertNotEqual(list(policy.backoffs), delays)
+
+    def test_invalid_jitter(self):
+        with self.assertRaises(ValueError):
+            ReconnectPolicy(jitter=2)
+
+    def test_should_reconnect(self):
+        policy = ReconnectPolicy()
+        self.assertTrue(policy.should_reconnect(BrokenPipeError()))
+        self.assertTrue(policy.should_reconnect(socket.timeout()))
+        self.assertTrue(policy.should_reconnect(OSError(errno.EBADF, 'Bad fd')))
+        self.assertFalse(policy.should_reconnect(OSError(errno.EACCES, 'Denied')))
+
+
+class BoardReconnectTest(unittest.TestCase):
+    def setUp(self):
+        root_dir = tempfile.TemporaryDirectory(prefix="robot-api-test-")
+        self.addCleanup(root_dir.cleanup)
+        self.socket_path = os.path.join(root_dir.name, 'MOTOR')
+        self.start_mock()
+
+    def start_mock(self):
+        self.mock = MockWireBoard(self.socket_path, status={'m0': 0})
+        self.addCleanup(self.mock.stop)
+
+    def stop_mock(self):
+        """Stop the mock, leaving a socket which refuses connections."""
+        self.mock.stop()
+        blocker = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        blocker.bind(self.socket_path)
+        self.addCleanup(blocker.close)
+        self.blocker = blocker
+
+    def restart_mock(self):
+        self.blocker.close()
+        os.unlink(self.socket_path)
+        self.start_mock()
+
+    def create_board(self, **kwargs):
+        board = Board(self.socket_path, reconnect_policy=ReconnectPolicy(**kwargs))
+        board.status_max_age = 0
+        self.addCleanup(board.close)
+        return board
+
+    def test_reconnects_after_failure(self):
+        board = self.create_board(backoffs=(0.01, 0.01))
+        board.socket.shutdown(socket.SHUT_RDWR)
+
+        self.assertEqual(0, board._send_and_receive({})['m0'])
+        self.assertEqual(1, board.reconnect_stats.failures)
+        self.assertEqual(1, board.reconnect_stats.reconnects)
+        self.assertGreater(board.reconnect_stats.seconds, 0)
+
+    def test_deadline_limits_attempts(self):
+        board = self.create_board(backoffs=(0.05,) * 10, deadline=0.12)
+        self.stop_mock()
+
+        start_time = time.monotonic()
+        with self.assertRaises(ConnectionError):
+            board._send_and_receive({})
+
+        self.assertLess(time.monotonic() - start_time, 0.2)
+        self.assertEqual(2, board.reconnect_stats.attempts)
+
+    def test_circuit_opens_and_closes(self):
+        board = self.create_board(
+            backoffs=(0.01, 0.01),
+            failure_threshold=1,
+            open_secs=0.3,
+        )
+        self.stop_mock()
+
+        with self.assertRaises(ConnectionError):
+            board._send_and_receive({})
+        self.assertEqual(CircuitState.OPEN, board.circuit_state)
+
+        # Fails immediately while the circuit is open
+        start_time = time.monotonic()
+        with self.assertRaises(ConnectionError):
+            board._send_and_receive({})
+        self.assertLess(time.monotonic() - start_time, 0.05)
+        self.assertEqual(1, board.reconnect_stats.rejected)
+
+        self.restart_mock()
+        time.sleep(0.3)
+
+        self.assertEqual(0, board._send_and_receive({})['m0'])
+        self.assertEqual(CircuitState.CLOSED, board.circuit_state)
+
+    def test_background_reconnect(self):
+        board = self.create_board(backoffs=(0.05,) * 20, background=True)
+        self.stop_mock()
+
+        start_time = time.monotonic()
+        with self.assertRaises(ConnectionError):
+            board._send_and_receive({})
+        with self.assertRaises(ConnectionError):
+            board._send_and_receive({})
+        self.assertLess(time.monotonic() - start_time, 0.05)
+
+        self.restart_mock()
+        time.sleep(0.2)
+
+        self.assertEqual(0, board._send_and_receive({})['m0'])
+        self.assertEqual(1, board.reconnect_stats.reconnects)
+        self.assertEqual(1, board.reconnect_stats.rejected)
+
+    def test_last_status_used_while_unavailable(self):
+        board = self.create_board(
+            backoffs=(0.05,) * 20,
+            background=True,
+            use_last_status=True,
+        )
+        self.stop_mock()
+
+        status = board._get_board_status()
+        self.assertIs(board.latest_status, status)
+        self.assertEqual(0, status['m0'])
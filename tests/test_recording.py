@@ -0,0 +1,153 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from robot.motor import MotorBoard
+from robot.recording import FrameKind, Recorder, ReplayServer, read_recording
+from robot.wire import JSON, MSGPACK, msgpack
+from tests.mock_wire import MockWireBoard
+
+
+class RecordingFormatTest(unittest.TestCase):
+    def test_round_trip(self):
+        file = io.BytesIO()
+        recorder = Recorder(file)
+        recorder.write(FrameKind.CONNECT)
+        recorder.write(FrameKind.RECEIVED, b'{}\n')
+        recorder.write(FrameKind.SENT, b'{"m0": 1}\n')
+        recorder.close()
+
+        file.seek(0)
+        frames = list(read_recording(file))
+
+        self.assertEqual(
+            [
+                (FrameKind.CONNECT, b''),
+                (FrameKind.RECEIVED, b'{}\n'),
+                (FrameKind.SENT, b'{"m0": 1}\n'),
+            ],
+            [(x.kind, x.data) for x in frames],
+        )
+        timestamps = [x.timestamp for x in frames]
+        self.assertEqual(sorted(timestamps), timestamps)
+
+    def test_not_a_recording(self):
+        with self.assertRaises(ValueError):
+            list(read_recording(io.BytesIO(b'{}\n')))
+
+    def test_truncated(self):
+        file = io.BytesIO()
+        recorder = Recorder(file)
+        recorder.write(FrameKind.RECEIVED, b'{}\n')
+
+        with self.assertRaises(ValueError):
+            list(read_recording(io.BytesIO(file.getvalue()[:-1])))
+
+
+class RecordReplayTest(unittest.TestCase):
+    def setUp(self):
+        root_dir = tempfile.TemporaryDirectory(prefix="robot-api-test-")
+        self.addCleanup(root_dir.cleanup)
+        self.root_dir = root_dir.name
+        self.recording = os.path.join(self.root_dir, 'motor.rec.gz')
+
+    def record(self, **kwargs):
+        mock = MockWireBoard(
+            os.path.join(self.root_dir, 'MOTOR'),
+            status={'m0': 0, 'm1': 0},
+            **kwargs,
+        )
+        self.addCleanup(mock.stop)
+
+        board = MotorBoard(mock.socket_path)
+        board.status_max_age = 0
+        board.start_recording(self.recording)
+        board.m0 = 0.5
+        self.assertEqual(0.5, board.m0)
+        board.stop_recording()
+        board.close()
+
+    def replay(self, **kwargs):
+        server = ReplayServer(
+            self.recording,
+            os.path.join(self.root_dir, 'REPLAY'),
+            **kwargs,
+        )
+        self.addCleanup(server.stop)
+        return server
+
+    def test_recording_closes_old_connection(self):
+        mock = MockWireBoard(
+            os.path.join(self.root_dir, 'MOTOR'),
+            status={'m0': 0, 'm1': 0},
+        )
+        self.addCleanup(mock.stop)
+
+        board = MotorBoard(mock.socket_path)
+        self.addCleanup(board.close)
+        board.status_max_age = 0
+        board.start_streaming()
+        old_socket = board.socket
+
+        board.start_recording(self.recording)
+
+        self.assertEqual(-1, old_socket.fileno())
+        self.assertIsNot(old_socket, board.socket)
+        self.assertTrue(board.streaming)
+        board.m0 = 0.5
+        self.assertEqual(0.5, board.m0)
+        board.stop_recording()
+
+    def test_replay(self):
+        self.record()
+        server = self.replay()
+
+        board = MotorBoard(server.socket_path)
+        board.status_max_age = 0
+        board.m0 = 0.5
+        self.assertEqual(0.5, board.m0)
+
+    def test_recording_starts_with_connection(self):
+        self.record()
+
+        kinds = [x.kind for x in read_recording(self.recording)]
+        self.assertEqual(
+            [
+                FrameKind.CONNECT,
+                FrameKind.RECEIVED,
+                FrameKind.SENT,
+                FrameKind.RECEIVED,
+                FrameKind.SENT,
+                FrameKind.RECEIVED,
+            ],
+            kinds,
+        )
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_replay_with_codec_switch(self):
+        self.record(codecs=(JSON, MSGPACK))
+        server = self.replay()
+
+        board = MotorBoard(server.socket_path)
+        self.assertEqual(MSGPACK, board.codec.name)
+        board.status_max_age = 0
+        board.m0 = 0.5
+        self.assertEqual(0.5, board.m0)
+
+    def test_replay_timing(self):
+        self.record(greeting_delay=0.2)
+
+        server = self.replay(speed=1)
+        start_time = time.monotonic()
+        MotorBoard(server.socket_path)
+        self.assertGreater(time.monotonic() - start_time, 0.15)
+
+    def test_replay_as_fast_as_possible(self):
+        self.record(greeting_delay=0.2)
+
+        server = self.replay()
+        start_time = time.monotonic()
+        MotorBoard(server.socket_path)
+        self.assertLess(time.monotonic() - start_time, 0.1)
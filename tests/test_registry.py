@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from robot.registry import BoardRegistry
+
+
+class RegistryTestMixin:
+    USE_INOTIFY = True
+
+    def setUp(self):
+        root_dir = tempfile.TemporaryDirectory(prefix="robot-api-test-")
+        self.addCleanup(root_dir.cleanup)
+        self.root = Path(root_dir.name)
+
+        self.registry = BoardRegistry(self.root, use_inotify=self.USE_INOTIFY)
+        self.addCleanup(self.registry.close)
+
+    def wait_for_change(self, directory_name, timeout=1):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.registry.take_changed(directory_name):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_initially_changed(self):
+        self.assertTrue(self.registry.take_changed('motor'))
+        self.assertFalse(self.registry.take_changed('motor'))
+
+    def test_new_directory(self):
+        self.registry.take_changed('motor')
+
+        (self.root / 'motor').mkdir()
+        (self.root / 'motor' / 'ABC').touch()
+
+        self.assertTrue(self.wait_for_change('motor'))
+        self.assertEqual(
+            {self.root / 'motor' / 'ABC'},
+            self.registry.board_paths('motor'),
+        )
+
+    def test_board_added_and_removed(self):
+        (self.root / 'motor').mkdir()
+        (self.root / 'servo').mkdir()
+        # Let a polling watcher see the new directories
+        time.sleep(BoardRegistry.POLL_INTERVAL_SECS * 2)
+        self.registry.take_changed('motor')
+        self.registry.take_changed('servo')
+
+        (self.root / 'motor' / 'ABC').touch()
+        self.assertTrue(self.wait_for_change('motor'))
+        self.assertFalse(self.registry.take_changed('servo'))
+
+        os.unlink(str(self.root / 'motor' / 'ABC'))
+        self.assertTrue(self.wait_for_change('motor'))
+        self.assertEqual(set(), self.registry.board_paths('motor'))
+
+    def test_root_recreated(self):
+        self.registry.take_changed('motor')
+
+        shutil.rmtree(str(self.root))
+        (self.root / 'motor').mkdir(parents=True)
+        (self.root / 'motor' / 'X').touch()
+
+        self.assertTrue(self.wait_for_change('motor'))
+        self.assertEqual(
+            {self.root / 'motor' / 'X'},
+            self.registry.board_paths('motor'),
+        )
+
+        # Changes after the root has come back are still seen
+        time.sleep(BoardRegistry.POLL_INTERVAL_SECS * 2)
+        self.registry.take_changed('motor')
+        (self.root / 'motor' / 'Y').touch()
+        self.assertTrue(self.wait_for_change('motor'))
+
+    def test_refresh(self):
+        self.registry.take_changed('motor')
+        self.registry.take_changed('servo')
+
+        self.registry.refresh('motor')
+        self.assertTrue(self.registry.take_changed('motor'))
+        self.assertFalse(self.registry.take_changed('servo'))
+
+        self.registry.refresh()
+        self.assertTrue(self.registry.take_changed('motor'))
+        self.assertTrue(self.registry.take_changed('servo'))
+
+
+class InotifyRegistryTest(RegistryTestMixin, unittest.TestCase):
+    USE_INOTIFY = True
+
+
+class PollingRegistryTest(RegistryTestMixin, unittest.TestCase):
+    USE_INOTIFY = False
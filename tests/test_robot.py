@@ -1,11 +1,16 @@
+import errno
+import os
+import tempfile
 import time
 import unittest
+from pathlib import Path
 from unittest import mock
 
 from robot import game_specific
 from robot.board import Board
 from robot.robot import Robot
 from tests.mock_robotd import MockRobotDFactoryMixin
+from tests.mock_wire import MockWireBoard
 
 
 class RobotTest(MockRobotDFactoryMixin, unittest.TestCase):
@@ -66,3 +71,144 @@ class RobotTest(MockRobotDFactoryMixin, unittest.TestCase):
             mock_kill_after_delay.assert_called_once_with(
                 game_specific.GAME_DURATION_SECONDS,
             )
+
+
+class BoardDiscoveryTest(unittest.TestCase):
+    GREETING_DELAY = 0.5
+
+    def create_board(self, directory_name, name, **kwargs):
+        directory = os.path.join(self.root_dir, directory_name)
+        os.makedirs(directory, exist_ok=True)
+        board = MockWireBoard(os.path.join(directory, name), **kwargs)
+        self.addCleanup(board.stop)
+        return board
+
+    def setUp(self):
+        root_dir = tempfile.TemporaryDirectory(prefix="robot-api-test-")
+        self.addCleanup(root_dir.cleanup)
+        self.root_dir = root_dir.name
+
+        self.create_board('power', 'PWR', status={'start-button': True})
+        self.robot = Robot(robotd_path=self.root_dir, wait_for_start_button=False)
+        self.addCleanup(self.robot.close)
+
+    def test_new_boards_connect_in_parallel(self):
+        for index in range(4):
+            self.create_board(
+                'motor',
+                'MOTOR{}'.format(index),
+                status={'m0': 0, 'm1': 0},
+                greeting_delay=self.GREETING_DELAY,
+            )
+
+        start_time = time.monotonic()
+        boards = self.robot.motor_boards
+        elapsed = time.monotonic() - start_time
+
+        self.assertEqual(4, len(boards))
+        self.assertLess(elapsed, 2 * self.GREETING_DELAY)
+        self.assertAlmostEqual(elapsed, self.robot.connect_times['motor'], places=1)
+        self.assertIn('power', self.robot.connect_times)
+
+    def test_slow_board_is_skipped(self):
+        self.create_board(
+            'motor',
+            'SLOW',
+            status={'m0': 0, 'm1': 0},
+            greeting_delay=self.GREETING_DELAY,
+        )
+        self.create_board('motor', 'FAST', status={'m0': 0, 'm1': 0})
+
+        with mock.patch.object(Board, 'SEND_TIMEOUT_SECS', self.GREETING_DELAY / 5):
+            boards = self.robot.motor_boards
+
+        self.assertEqual(['FAST'], [board.serial for board in boards])
+
+    def test_unusable_board_is_skipped(self):
+        self.create_board('motor', 'GOOD', status={'m0': 0, 'm1': 0})
+        self.create_board('motor', 'DENIED', status={'m0': 0, 'm1': 0})
+        original_connect = Board._connect
+
+        def connect(board):
+            if board.serial == 'DENIED':
+                raise PermissionError(errno.EACCES, "Permission denied")
+            original_connect(board)
+
+        with mock.patch.object(Board, '_connect', connect):
+            boards = self.robot.motor_boards
+
+        self.assertEqual(['GOOD'], [board.serial for board in boards])
+
+    def test_failed_connection_closes_other_boards(self):
+        self.create_board('motor', 'GOOD', status={'m0': 0, 'm1': 0})
+        self.create_board('motor', 'BAD', status={'m0': 0, 'm1': 0})
+        original_connect = Board._connect
+        connected = []
+
+        def connect(board):
+            if board.serial == 'BAD':
+                raise RuntimeError("Unexpected failure")
+            original_connect(board)
+            connected.append(board)
+
+        with mock.patch.object(Board, '_connect', connect):
+            with self.assertRaises(RuntimeError):
+                self.robot.motor_boards
+
+        self.assertEqual(['GOOD'], [board.serial for board in connected])
+        self.assertEqual(-1, connected[0].socket.fileno())
+        self.assertEqual([], self.robot.known_motor_boards)
+
+    def test_unchanged_boards_are_not_looked_for(self):
+        self.create_board('motor', 'MOTOR', status={'m0': 0, 'm1': 0})
+        time.sleep(0.2)
+
+        boards = self.robot.motor_boards
+        with mock.patch.object(Path, 'glob') as mock_glob:
+            self.assertIs(boards, self.robot.motor_boards)
+            self.robot.motor_board.m0 = 0.5
+            mock_glob.assert_not_called()
+
+    def test_added_board_is_found(self):
+        self.assertEqual(0, len(self.robot.motor_boards))
+
+        self.create_board('motor', 'MOTOR', status={'m0': 0, 'm1': 0})
+        time.sleep(0.2)
+
+        self.assertEqual(['MOTOR'], [x.serial for x in self.robot.motor_boards])
+
+    def test_unplugged_board_is_lost(self):
+        mock_board = self.create_board('motor', 'MOTOR', status={'m0': 0, 'm1': 0})
+        time.sleep(0.2)
+        board = self.robot.motor_board
+
+        mock_board.stop()
+        time.sleep(0.2)
+
+        self.assertEqual(0, len(self.robot.motor_boards))
+        self.assertTrue(board.lost)
+
+        start_time = time.monotonic()
+        with self.assertRaises(ConnectionError):
+            board.m0 = 1
+        self.assertLess(time.monotonic() - start_time, 0.1)
+
+        self.create_board('motor', 'MOTOR', status={'m0': 0, 'm1': 0})
+        time.sleep(0.2)
+
+        self.assertIs(board, self.robot.motor_board)
+        self.assertFalse(board.lost)
+        board.m0 = 1
+
+    def test_lost_board_fails_fast_without_registry(self):
+        mock_board = self.create_board('motor', 'MOTOR', status={'m0': 0, 'm1': 0})
+        time.sleep(0.2)
+        board = Board(mock_board.socket_path)
+
+        mock_board.stop()
+
+        start_time = time.monotonic()
+        with self.assertRaises(ConnectionError):
+            board._send_and_receive({})
+        self.assertLess(time.monotonic() - start_time, 0.5)
+        self.assertTrue(board.lost)
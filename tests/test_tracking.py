@@ -0,0 +1,89 @@
+import unittest
+
+from robot.markers import Marker
+from robot.tracking import Tracker
+
+
+def make_marker(marker_id, x, z):
+    return Marker({'id': marker_id, 'cartesian': [x, 0, z]})
+
+
+class TrackerTest(unittest.TestCase):
+    def test_first_sighting(self):
+        tracker = Tracker()
+
+        tracker.update([make_marker(3, 0.5, 2)], timestamp=10)
+
+        track = tracker.get(3)
+        self.assertEqual((0.5, 0, 2), track.position)
+        self.assertEqual((0, 0, 0), track.velocity)
+        self.assertEqual(10, track.last_seen)
+        self.assertEqual(1, track.sightings)
+        self.assertIsNone(tracker.get(4))
+
+    def test_converges_on_constant_velocity(self):
+        tracker = Tracker()
+
+        # Approaching at 0.5m/s, seen 10 times a second
+        for frame in range(100):
+            timestamp = frame / 10
+            tracker.update([make_marker(3, 0, 5 - 0.5 * timestamp)], timestamp)
+
+        track = tracker.get(3)
+        self.assertAlmostEqual(-0.5, track.velocity.z, places=3)
+        self.assertAlmostEqual(0.05, track.position.z, places=3)
+        self.assertEqual(100, track.sightings)
+
+    def test_smooths_noise(self):
+        tracker = Tracker(alpha=0.2, beta=0.01)
+
+        for frame in range(50):
+            noise = 0.1 if frame % 2 else -0.1
+            tracker.update([make_marker(3, noise, 2)], timestamp=frame / 10)
+
+        self.assertLess(abs(tracker.get(3).position.x), 0.05)
+
+    def test_predict(self):
+        tracker = Tracker(alpha=1, beta=1)
+        tracker.update([make_marker(3, 0, 2)], timestamp=0)
+        tracker.update([make_marker(3, 0, 1.5)], timestamp=1)
+
+        predicted = tracker.predict(3, timestamp=1.5)
+
+        self.assertAlmostEqual(1.25, predicted.z)
+        self.assertIsNone(tracker.predict(4, timestamp=1.5))
+
+    def test_forgets_old_markers(self):
+        tracker = Tracker(forget_after=1)
+        tracker.update([make_marker(3, 0, 2), make_marker(4, 0, 3)], timestamp=0)
+        tracker.update([make_marker(4, 0, 3)], timestamp=0.5)
+
+        tracker.update([make_marker(4, 0, 3)], timestamp=1.5)
+
+        self.assertIsNone(tracker.get(3))
+        self.assertEqual([4], [x.id for x in tracker.tracks()])
+
+    def test_ignores_older_images(self):
+        tracker = Tracker()
+        tracker.update([make_marker(3, 0, 2)], timestamp=1)
+        track = tracker.get(3)
+
+        tracker.update([make_marker(3, 0, 1)], timestamp=0.5)
+
+        self.assertIs(track, tracker.get(3))
+
+    def test_tracks_not_changed_by_update(self):
+        tracker = Tracker()
+        tracker.update([make_marker(3, 0, 2)], timestamp=0)
+        track = tracker.get(3)
+
+        tracker.update([make_marker(3, 0, 1)], timestamp=1)
+
+        self.assertEqual((0, 0, 2), track.position)
+        self.assertNotEqual(track.position, tracker.get(3).position)
+
+    def test_invalid_gains(self):
+        with self.assertRaises(ValueError):
+            Tracker(alpha=0)
+        with self.assertRaises(ValueError):
+            Tracker(beta=2)
@@ -0,0 +1,212 @@
+import json
+import time
+import unittest
+
+from robot.board import Board
+from robot.wire import (
+    JSON,
+    MSGPACK,
+    JsonCodec,
+    LineBuffer,
+    MsgpackCodec,
+    OrjsonCodec,
+    available_codecs,
+    choose_codec,
+    msgpack,
+    orjson,
+)
+from tests.mock_wire import MockWireFactoryMixin
+
+SEE_RESPONSE = {
+    'status': 'finished',
+    'markers': [
+        {
+            'id': x % 64,
+            'certainty': 0,
+            'size': [0.25, 0.25],
+            'pixel_corners': [[100.5, 200.5], [150.5, 200.5], [150.5, 250.5]],
+            'pixel_centre': [125.5, 225.5],
+            'cartesian': [0.1 * x, 0.1, 1.5],
+            'spherical': [0.1, 0.01 * x, 1.5],
+            'legacy_polar': [0.1, 0.01 * x, 1.5],
+        }
+        for x in range(200)
+    ],
+}
+
+
+def cpu_time_per_message(codec, message, count=50):
+    buffer = LineBuffer()
+    start = time.process_time()
+    for _ in range(count):
+        buffer.feed(codec.encode(message))
+        codec.decode(buffer)
+    return (time.process_time() - start) / count
+
+
+class LineBufferReadTest(unittest.TestCase):
+    def test_peek_and_read(self):
+        buffer = LineBuffer()
+        buffer.feed(b'abc')
+        self.assertIsNone(buffer.peek(4))
+        self.assertIsNone(buffer.read(4))
+        buffer.feed(b'd\nef')
+        self.assertEqual(b'abcd', buffer.peek(4))
+        self.assertEqual(b'abcd', buffer.read(4))
+        self.assertEqual('', buffer.next_line())
+        self.assertEqual(b'ef', buffer.read(2))
+        self.assertEqual(0, len(buffer))
+
+    def test_consume(self):
+        buffer = LineBuffer()
+        buffer.feed(b'abc')
+        self.assertIsNone(buffer.consume(4, bytes))
+        buffer.feed(b'def')
+        self.assertEqual(b'bcd', buffer.consume(4, bytes, start=1))
+        self.assertEqual(b'ef', buffer.read(2))
+
+    def test_read_after_scanning_for_line(self):
+        buffer = LineBuffer()
+        buffer.feed(b'abcdef')
+        self.assertIsNone(buffer.next_line())
+        buffer.read(4)
+        buffer.feed(b'\n')
+        self.assertEqual('ef', buffer.next_line())
+
+
+class CodecTestMixin:
+    def test_round_trip(self):
+        codec = self.codec()
+        buffer = LineBuffer()
+        buffer.feed(codec.encode(SEE_RESPONSE))
+        self.assertEqual(SEE_RESPONSE, codec.decode(buffer))
+        self.assertEqual(0, len(buffer))
+
+    def test_keys_become_strings(self):
+        codec = self.codec()
+        buffer = LineBuffer()
+        buffer.feed(codec.encode({'servos': {3: 0.5}}))
+        self.assertEqual({'servos': {'3': 0.5}}, codec.decode(buffer))
+
+    def test_partial_frames(self):
+        codec = self.codec()
+        buffer = LineBuffer()
+        data = codec.encode({'m0': 1}) + codec.encode({'m1': -1})
+
+        messages = []
+        for x in range(len(data)):
+            buffer.feed(data[x:x + 1])
+            message = codec.decode(buffer)
+            if message is not None:
+                messages.append(message)
+
+        self.assertEqual([{'m0': 1}, {'m1': -1}], messages)
+
+
+class JsonCodecTest(CodecTestMixin, unittest.TestCase):
+    codec = JsonCodec
+
+    def test_wire_format(self):
+        self.assertEqual(b'{"m0": 1}\n', JsonCodec().encode({'m0': 1}))
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class OrjsonCodecTest(CodecTestMixin, unittest.TestCase):
+    codec = OrjsonCodec
+
+    def test_wire_compatible_with_json(self):
+        message = {'servos': {3: 0.5}, 'see': True, 'command': ('a', 1)}
+        self.assertEqual(
+            json.loads(JsonCodec().encode(message).decode('utf-8')),
+            json.loads(OrjsonCodec().encode(message).decode('utf-8')),
+        )
+
+    def test_decodes_non_finite_numbers(self):
+        buffer = LineBuffer()
+        buffer.feed(b'{"distance": NaN, "max": Infinity, "min": -Infinity}\n')
+        message = OrjsonCodec().decode(buffer)
+        self.assertNotEqual(message['distance'], message['distance'])
+        self.assertEqual(float('inf'), message['max'])
+        self.assertEqual(float('-inf'), message['min'])
+
+    def test_invalid_json_still_raises(self):
+        buffer = LineBuffer()
+        buffer.feed(b'{"status": \n')
+        with self.assertRaises(ValueError):
+            OrjsonCodec().decode(buffer)
+
+    def test_uses_less_cpu_than_json(self):
+        self.assertLess(
+            cpu_time_per_message(OrjsonCodec(), SEE_RESPONSE),
+            cpu_time_per_message(JsonCodec(), SEE_RESPONSE),
+        )
+
+
+@unittest.skipIf(msgpack is None, "msgpack is not installed")
+class MsgpackCodecTest(CodecTestMixin, unittest.TestCase):
+    codec = MsgpackCodec
+
+    def test_uses_less_cpu_than_json(self):
+        self.assertLess(
+            cpu_time_per_message(MsgpackCodec(), SEE_RESPONSE),
+            cpu_time_per_message(JsonCodec(), SEE_RESPONSE),
+        )
+
+
+class ChooseCodecTest(unittest.TestCase):
+    def test_nothing_offered(self):
+        self.assertEqual(JSON, choose_codec((MSGPACK, JSON), ()))
+
+    def test_unknown_codec_offered(self):
+        self.assertEqual(JSON, choose_codec((MSGPACK, JSON), ('bson',)))
+
+    def test_not_preferred(self):
+        self.assertEqual(JSON, choose_codec((JSON,), (MSGPACK, JSON)))
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_preferred(self):
+        self.assertEqual(MSGPACK, choose_codec((MSGPACK, JSON), (JSON, MSGPACK)))
+
+
+class BoardCodecNegotiationTest(MockWireFactoryMixin, unittest.TestCase):
+    def test_no_codecs_offered(self):
+        mock = self.create_mock_wire_board(codecs=(), status={'m0': 0})
+        board = Board(mock.socket_path)
+        self.addCleanup(board.close)
+
+        self.assertEqual(JSON, board.codec.name)
+        self.assertEqual([], mock.codecs_used)
+        self.assertEqual(1, board._send_and_receive({'m0': 1})['m0'])
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_switch_to_msgpack(self):
+        mock = self.create_mock_wire_board(
+            codecs=(JSON, MSGPACK),
+            status={'servos': {}},
+        )
+        board = Board(mock.socket_path)
+        self.addCleanup(board.close)
+
+        self.assertEqual(MSGPACK, board.codec.name)
+        self.assertEqual([MSGPACK], mock.codecs_used)
+
+        status = board._send_and_receive({'servos': {3: 0.5}})
+        self.assertEqual({'servos': {'3': 0.5}}, mock.message_queue.get())
+        self.assertEqual({'3': 0.5}, status['servos'])
+
+    def test_codec_preference(self):
+        mock = self.create_mock_wire_board(codecs=(JSON, MSGPACK))
+
+        class JsonOnlyBoard(Board):
+            CODEC_PREFERENCE = (JSON,)
+
+        board = JsonOnlyBoard(mock.socket_path)
+        self.addCleanup(board.close)
+
+        self.assertEqual(JSON, board.codec.name)
+        self.assertEqual([], mock.codecs_used)
+
+    def test_available_codecs(self):
+        codecs = available_codecs()
+        self.assertIn(JSON, codecs)
+        self.assertEqual(msgpack is not None, MSGPACK in codecs)